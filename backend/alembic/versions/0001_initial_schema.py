@@ -0,0 +1,129 @@
+"""initial schema
+
+init_db.py의 Base.metadata.create_all이 만들던 기존 스키마 그대로
+(create_all로 만든 DB는 이 리비전으로 stamp 후 upgrade, init_db.py가 자동 처리)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16 22:42:11.100385
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('patients',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('birth_date', sa.Date(), nullable=False),
+    sa.Column('gender', sa.Enum('MALE', 'FEMALE', 'OTHER', name='gender'), nullable=False),
+    sa.Column('phone', sa.Text(), nullable=True),
+    sa.Column('ssn', sa.Text(), nullable=True),
+    sa.Column('address', sa.Text(), nullable=True),
+    sa.Column('blood_type', sa.String(length=10), nullable=True),
+    sa.Column('allergies', sa.Text(), nullable=True),
+    sa.Column('medical_history', sa.Text(), nullable=True),
+    sa.Column('patient_number', sa.String(length=50), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_patients_id', 'patients', ['id'], unique=False)
+    op.create_index('ix_patients_name', 'patients', ['name'], unique=False)
+    op.create_index('ix_patients_patient_number', 'patients', ['patient_number'], unique=True)
+
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('username', sa.String(length=100), nullable=False),
+    sa.Column('hashed_password', sa.String(length=255), nullable=False),
+    sa.Column('full_name', sa.String(length=100), nullable=True),
+    sa.Column('role', sa.Enum('ADMIN', 'DOCTOR', 'NURSE', name='userrole'), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('is_superuser', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('last_login', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.create_index('ix_users_id', 'users', ['id'], unique=False)
+    op.create_index('ix_users_username', 'users', ['username'], unique=True)
+
+    op.create_table('visits',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('patient_id', sa.Integer(), nullable=False),
+    sa.Column('doctor_id', sa.Integer(), nullable=False),
+    sa.Column('visit_date', sa.DateTime(), nullable=False),
+    sa.Column('chief_complaint', sa.Text(), nullable=True),
+    sa.Column('diagnosis_summary', sa.Text(), nullable=True),
+    sa.Column('treatment_plan', sa.Text(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['doctor_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['patient_id'], ['patients.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_visits_id', 'visits', ['id'], unique=False)
+
+    op.create_table('diagnoses',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('visit_id', sa.Integer(), nullable=False),
+    sa.Column('prediction', sa.String(length=50), nullable=False),
+    sa.Column('prediction_kr', sa.String(length=50), nullable=True),
+    sa.Column('confidence', sa.Float(), nullable=False),
+    sa.Column('probabilities', sa.JSON(), nullable=True),
+    sa.Column('probabilities_kr', sa.JSON(), nullable=True),
+    sa.Column('raw_logits', sa.JSON(), nullable=True),
+    sa.Column('tumor_ratio', sa.Float(), nullable=True),
+    sa.Column('stroma_ratio', sa.Float(), nullable=True),
+    sa.Column('normal_ratio', sa.Float(), nullable=True),
+    sa.Column('immune_ratio', sa.Float(), nullable=True),
+    sa.Column('background_ratio', sa.Float(), nullable=True),
+    sa.Column('image_path', sa.String(length=500), nullable=True),
+    sa.Column('image_size', sa.JSON(), nullable=True),
+    sa.Column('processing_time', sa.Float(), nullable=True),
+    sa.Column('model_version', sa.String(length=50), nullable=True),
+    sa.Column('model_type', sa.String(length=100), nullable=True),
+    sa.Column('device', sa.String(length=20), nullable=True),
+    sa.Column('is_reviewed', sa.Integer(), nullable=True),
+    sa.Column('reviewed_by', sa.Integer(), nullable=True),
+    sa.Column('review_notes', sa.Text(), nullable=True),
+    sa.Column('final_diagnosis', sa.String(length=50), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['reviewed_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['visit_id'], ['visits.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_diagnoses_id', 'diagnoses', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_diagnoses_id', table_name='diagnoses')
+    op.drop_table('diagnoses')
+
+    op.drop_index('ix_visits_id', table_name='visits')
+    op.drop_table('visits')
+
+    op.drop_index('ix_users_username', table_name='users')
+    op.drop_index('ix_users_id', table_name='users')
+    op.drop_index('ix_users_email', table_name='users')
+    op.drop_table('users')
+
+    op.drop_index('ix_patients_patient_number', table_name='patients')
+    op.drop_index('ix_patients_name', table_name='patients')
+    op.drop_index('ix_patients_id', table_name='patients')
+    op.drop_table('patients')
@@ -0,0 +1,44 @@
+"""list query indexes
+
+visits.py / diagnoses.py 목록 API의 필터와 키셋 정렬에 맞춘 복합 인덱스
+- 정렬 (visit_date DESC, id DESC) / (created_at DESC, id DESC): 필터가 없을 때 인덱스 순서대로 읽고 LIMIT에서 멈춤
+- 등치 필터(patient_id, doctor_id, status, is_reviewed, prediction)를 앞에 둬서 필터 + 정렬을 한 인덱스로
+- date_from/date_to는 visit_date 범위 조건이라 ix_visits_visit_date_id 사용
+- diagnoses.visit_id: 진료 상세의 selectinload(IN), 진단 목록의 JOIN
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 22:42:38.135194
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_visits_visit_date_id', 'visits', ['visit_date', 'id']),
+    ('ix_visits_patient_id_visit_date', 'visits', ['patient_id', 'visit_date', 'id']),
+    ('ix_visits_doctor_id_visit_date', 'visits', ['doctor_id', 'visit_date', 'id']),
+    ('ix_visits_status_visit_date', 'visits', ['status', 'visit_date', 'id']),
+    ('ix_diagnoses_created_at_id', 'diagnoses', ['created_at', 'id']),
+    ('ix_diagnoses_visit_id', 'diagnoses', ['visit_id']),
+    ('ix_diagnoses_is_reviewed_created_at', 'diagnoses', ['is_reviewed', 'created_at', 'id']),
+    ('ix_diagnoses_prediction_created_at', 'diagnoses', ['prediction', 'created_at', 'id']),
+    ('ix_diagnoses_reviewed_by', 'diagnoses', ['reviewed_by']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,41 @@
+"""diagnosis daily stats
+
+대시보드 통계용 진단 일별 집계 테이블 (app.models.diagnosis_stats)
+기존 진단은 이 마이그레이션 후 python backfill_stats.py로 채움
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16 23:05:12.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('diagnosis_daily_stats',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('prediction', sa.String(length=50), nullable=False),
+    sa.Column('doctor_id', sa.Integer(), nullable=False),
+    sa.Column('is_reviewed', sa.Integer(), nullable=False),
+    sa.Column('prediction_kr', sa.String(length=50), nullable=True),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('confidence_sum', sa.Float(), nullable=False),
+    sa.Column('tumor_ratio_sum', sa.Float(), nullable=False),
+    sa.Column('tumor_ratio_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'prediction', 'doctor_id', 'is_reviewed')
+    )
+    op.create_index('ix_diagnosis_daily_stats_doctor_id_day', 'diagnosis_daily_stats', ['doctor_id', 'day'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_diagnosis_daily_stats_doctor_id_day', table_name='diagnosis_daily_stats')
+    op.drop_table('diagnosis_daily_stats')
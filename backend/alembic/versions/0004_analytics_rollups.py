@@ -0,0 +1,48 @@
+"""analytics rollups
+
+통계 API(/analytics)용 집계 확장
+- visit_daily_stats: (진료일, 의사, 상태)별 진료 건수 (app.models.visit_stats)
+- diagnosis_daily_stats: tumor_ratio 구간별 건수 컬럼 추가
+기존 데이터는 이 마이그레이션 후 python backfill_stats.py로 채움
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16 23:40:27.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TUMOR_RATIO_BIN_COLUMNS = [f'tumor_ratio_bin_{i}' for i in range(10)]
+
+
+def upgrade() -> None:
+    op.create_table('visit_daily_stats',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('doctor_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'doctor_id', 'status')
+    )
+    op.create_index('ix_visit_daily_stats_doctor_id_day', 'visit_daily_stats', ['doctor_id', 'day'], unique=False)
+
+    with op.batch_alter_table('diagnosis_daily_stats') as batch_op:
+        for name in TUMOR_RATIO_BIN_COLUMNS:
+            batch_op.add_column(sa.Column(name, sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('diagnosis_daily_stats') as batch_op:
+        for name in reversed(TUMOR_RATIO_BIN_COLUMNS):
+            batch_op.drop_column(name)
+
+    op.drop_index('ix_visit_daily_stats_doctor_id_day', table_name='visit_daily_stats')
+    op.drop_table('visit_daily_stats')
@@ -4,7 +4,7 @@ API v1 Router
 """
 
 from fastapi import APIRouter
-from app.api.api_v1.endpoints import auth, ai, clinical, visits, patients, diagnoses, users
+from app.api.api_v1.endpoints import auth, ai, analytics, clinical, visits, patients, diagnoses, users
 
 api_router = APIRouter()
 
@@ -28,3 +28,6 @@ api_router.include_router(visits.router, prefix="/visits", tags=["visits"])
 
 # 진단 결과 관리
 api_router.include_router(diagnoses.router, prefix="/diagnoses", tags=["diagnoses"])
+
+# 통계 (진료/진단 추이, 의사별 업무량)
+api_router.include_router(analytics.router, prefix="/analytics", tags=["analytics"])
@@ -1,38 +1,97 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from app.services.ai_service import ai_service
-from app.schemas.ai import PredictionResponse
-import tempfile
-import os
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from starlette.datastructures import FormData
+from app.services.admission import admission, admit_inference
+from app.services.batching import inference_batcher
+from app.services.ingestion import (
+    ImageRejected,
+    form_file,
+    multipart_body,
+    probe_image,
+    read_upload,
+    upload_form,
+)
+from app.services.model_state import model_state, require_model
+from app.services.profiling import present_timings, stage_profiler, wants_timings
+from app.services.result_cache import result_cache
+from app.schemas.ai import InferenceMode, InferencePriority, PredictionResponse
 
 router = APIRouter()
 
-@router.post("/predict", response_model=PredictionResponse)
-async def predict_image(file: UploadFile = File(...)):
-    """이미지 업로드 및 AI 예측"""
-    if not file.content_type.startswith("image/"):
+@router.post(
+    "/predict",
+    response_model=PredictionResponse,
+    response_model_exclude_none=True,
+    dependencies=[Depends(require_model), Depends(admit_inference)],
+    openapi_extra=multipart_body({"file": {"type": "string", "format": "binary"}}, ["file"]),
+)
+async def predict_image(
+    request: Request,
+    form: FormData = Depends(upload_form),  # 모델 준비/승인 제어를 통과한 뒤에 본문을 읽음
+    mode: InferenceMode = Query(InferenceMode.CLASSIFY, description="classify / segment / full"),
+    tiled: bool = Query(False, description="고해상도 이미지를 512 타일로 나눠 원본 해상도로 추론"),
+    priority: InferencePriority = Query(InferencePriority.ROUTINE, description="routine / batch (urgent는 routine으로 처리)"),
+):
+    """
+    이미지 업로드 및 AI 예측
+
+    - file: multipart/form-data 이미지 파일
+    - classify (기본값): 분류 결과만 반환, UNet 디코더 생략
+    - segment: 세그멘테이션 결과만 반환
+    - full: 분류 + 세그멘테이션
+    - tiled: 원본 해상도 타일 추론 (세그멘테이션 통계는 원본 픽셀 기준)
+    - 같은 이미지를 다시 올리면 캐시된 결과 반환 (model_info.cache)
+    - 모델 로드가 끝나기 전에는 503 (Retry-After)
+    - 동시 처리 한도를 넘으면 429 (대기열 가득 참) / 503 (대기 시간 초과), Retry-After 포함
+      (두 경우 모두 업로드 본문을 읽기 전에 응답)
+    - priority=batch: 대량 요청은 진료 요청이 빈 자리를 채우는 용도로만 처리
+      (인증 없는 엔드포인트라 urgent는 받지 않음, 클라이언트 IP별 공정 큐)
+    - X-Debug-Timings 헤더가 있으면 단계별 소요 시간(ms)을 timings로 반환 (캐시 적중이면 원래 추론의 값)
+    """
+    file = form_file(form, "file")
+    if not (file.content_type or "").startswith("image/"):
         raise HTTPException(status_code=400, detail="이미지 파일만 업로드 가능합니다.")
     
-    # 임시 파일로 저장
-    with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as tmp:
-        content = await file.read()
-        tmp.write(content)
-        tmp_path = tmp.name
-    
+    # 메모리에서 바로 처리 (임시 파일 없음)
+    content = await read_upload(file)
     try:
-        result = ai_service.predict(tmp_path)
-        if "error" in result:
-            raise HTTPException(status_code=500, detail=result["message"])
-        return result
-    finally:
-        os.unlink(tmp_path)
+        probe_image(content)
+    except ImageRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    if priority == InferencePriority.URGENT:
+        priority = InferencePriority.ROUTINE
+    client = f"ip:{request.client.host}" if request.client else None
+    result = await admission.guard(request, result_cache.get_or_compute(
+        content, mode.value, tiled,
+        lambda: inference_batcher.submit(
+            content, mode.value, tiled, priority.value, user=client, profile=wants_timings(request.headers),
+        ),
+    ))
+    if "error" in result:
+        raise HTTPException(status_code=500, detail=result["message"])
+    return present_timings(result, wants_timings(request.headers))
 
 @router.get("/model-info")
-def get_model_info():
+def get_model_info(ai_service=Depends(require_model)):
     """모델 정보 조회"""
     return {
         "model_type": "ResNet50",
         "classes": ai_service.CLASS_NAMES,
         "classes_kr": ai_service.CLASS_NAMES_KR,
         "device": str(ai_service.device),
-        "model_loaded": ai_service.model is not None
+        "model_loaded": ai_service.model is not None,
+        "checkpoint": ai_service.load_report.to_dict() if ai_service.load_report else None,
+    }
+
+@router.get("/stats")
+def get_inference_stats():
+    """승인 제어/추론 큐/배치/결과 캐시/단계별 지연 통계 조회 (동시 처리 한도, 배칭 윈도우, 캐시 크기 튜닝용)"""
+    ai_service = model_state.service
+    return {
+        "admission": admission.get_stats(),
+        "batching": inference_batcher.get_stats(),
+        "result_cache": result_cache.get_stats(),
+        "stages": stage_profiler.get_stats(),
+        "model": model_state.get_stats(),
+        "worker_pool": ai_service.worker_pool.get_stats() if ai_service and ai_service.worker_pool else None,
     }
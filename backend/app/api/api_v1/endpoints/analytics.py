@@ -0,0 +1,122 @@
+"""
+통계 API (진료/진단 추이, 의사별 업무량)
+일별 롤업 테이블만 읽으므로 누적 데이터가 많아도 조회 비용은 기간 길이에 비례
+ANALYTICS_DATABASE_URL을 지정하면 복제본에서 조회
+"""
+
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import get_analytics_db
+from app.core.security import get_current_active_user
+from app.models.user import User
+from app.schemas.analytics import Bucket
+from app.services import analytics
+
+router = APIRouter()
+
+
+class DateRange:
+    """통계 API 공통 기간 파라미터 (Depends(DateRange)), 기본은 오늘(UTC)까지 최근 ANALYTICS_DEFAULT_DAYS일"""
+
+    def __init__(
+        self,
+        since: Optional[date] = Query(None, description="시작 날짜 (YYYY-MM-DD, 포함)"),
+        until: Optional[date] = Query(None, description="종료 날짜 (YYYY-MM-DD, 포함, 기본: 오늘)"),
+    ):
+        until = until or datetime.utcnow().date()
+        since = since or until - timedelta(days=settings.ANALYTICS_DEFAULT_DAYS - 1)
+        if since > until:
+            raise HTTPException(status_code=400, detail="since는 until보다 늦을 수 없습니다.")
+        if (until - since).days + 1 > settings.ANALYTICS_MAX_DAYS:
+            raise HTTPException(status_code=400, detail=f"조회 기간은 최대 {settings.ANALYTICS_MAX_DAYS}일입니다.")
+        self.since = since
+        self.until = until
+
+
+@router.get("/visits", response_model=List[dict])
+def get_visit_trend(
+    period: DateRange = Depends(),
+    bucket: Bucket = Query(Bucket.DAY, description="집계 단위 (day, week, month)"),
+    doctor_id: Optional[int] = Query(None, description="담당 의사로 필터링"),
+    db: Session = Depends(get_analytics_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    구간별 진료 건수 추이
+
+    - 상태별(PENDING/COMPLETED/CANCELLED) 건수 포함
+    - 건수가 없는 구간도 0으로 포함
+    """
+
+    return analytics.visit_trend(db, period.since, period.until, bucket, doctor_id)
+
+
+@router.get("/visits/by-doctor", response_model=List[dict])
+def get_visits_by_doctor(
+    period: DateRange = Depends(),
+    db: Session = Depends(get_analytics_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    의사별 진료 건수 (상태별, 많은 순)
+    """
+
+    return analytics.visits_by_doctor(db, period.since, period.until)
+
+
+@router.get("/diagnoses", response_model=List[dict])
+def get_diagnosis_trend(
+    period: DateRange = Depends(),
+    bucket: Bucket = Query(Bucket.DAY, description="집계 단위 (day, week, month)"),
+    doctor_id: Optional[int] = Query(None, description="진료 담당 의사로 필터링"),
+    prediction: Optional[str] = Query(None, description="진단 결과로 필터링 (STDI, STNT, STIN, STMX)"),
+    db: Session = Depends(get_analytics_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    구간별 진단 건수 추이
+
+    - 전체/분류별 건수와 평균 신뢰도
+    - 진단일은 진단 생성 시각(UTC) 기준
+    """
+
+    return analytics.diagnosis_trend(db, period.since, period.until, bucket, doctor_id, prediction)
+
+
+@router.get("/diagnoses/tumor-ratio")
+def get_tumor_ratio_distribution(
+    period: DateRange = Depends(),
+    doctor_id: Optional[int] = Query(None, description="진료 담당 의사로 필터링"),
+    prediction: Optional[str] = Query(None, description="진단 결과로 필터링"),
+    db: Session = Depends(get_analytics_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    종양 비율(tumor_ratio) 분포
+
+    - 0.1 간격 구간별 진단 수 (bin_edges 기준, 1.0은 마지막 구간)와 평균
+    - 전체 및 분류별, tumor_ratio가 없는 진단(classify 모드)은 제외
+    """
+
+    return analytics.tumor_ratio_distribution(db, period.since, period.until, doctor_id, prediction)
+
+
+@router.get("/review-backlog", response_model=List[dict])
+def get_review_backlog(
+    since: Optional[date] = Query(None, description="이 날짜 이후 진단만 (기본: 전체 기간)"),
+    until: Optional[date] = Query(None, description="이 날짜까지의 진단만 (포함)"),
+    db: Session = Depends(get_analytics_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    의사별 미검토 진단 수 (진료 담당 의사 기준, 많은 순)
+
+    - 가장 오래된 미검토 진단일 포함
+    """
+
+    return analytics.review_backlog(db, since, until)
@@ -3,38 +3,71 @@
 환자 진료 → AI 진단 → 결과 저장을 한 번에 처리
 """
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
+from starlette.datastructures import FormData
 from typing import Optional
 from datetime import datetime
-import tempfile
-import os
 import base64
+import json
+import logging
+import time
 from io import BytesIO
 from PIL import Image
 
+from app.core import tracing
 from app.core.database import get_db
 from app.core.security import get_current_active_user
 from app.models.user import User
 from app.models.patient import Patient
 from app.models.visit import Visit
 from app.models.diagnosis import Diagnosis
-from app.services.ai_service import ai_service
+from app.schemas.ai import ClinicalDiagnosisForm, InferenceMode, InferencePriority
+from app.services.admission import admission, admit_by_priority
+from app.services.batching import inference_batcher
+from app.services.dashboard_stats import diagnosis_summary, visit_status_counts
+from app.services.ingestion import (
+    ImageRejected,
+    form_fields,
+    form_file,
+    multipart_body,
+    probe_image,
+    read_upload,
+    upload_form,
+)
+from app.services.model_state import require_model
+from app.services.profiling import stage_profiler, wants_timings
+from app.services.result_cache import result_cache
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
-@router.post("/diagnose")
+@router.post(
+    "/diagnose",
+    dependencies=[Depends(require_model)],
+    openapi_extra=multipart_body(
+        {
+            **ClinicalDiagnosisForm.model_json_schema(mode="serialization")["properties"],
+            # enum은 $defs 참조 대신 인라인으로
+            "mode": {"type": "string", "enum": [m.value for m in InferenceMode], "default": InferenceMode.FULL.value,
+                     "description": "full / classify (세그멘테이션 생략)"},
+            "image": {"type": "string", "format": "binary", "description": "현미경 이미지"},
+        },
+        ["patient_id", "chief_complaint", "image"],
+    ),
+)
 async def create_clinical_diagnosis(
-    patient_id: int = Form(..., description="환자 ID"),
-    chief_complaint: str = Form(..., description="주 증상"),
-    image: UploadFile = File(..., description="현미경 이미지"),
+    request: Request,
     # notes: Optional[str] = Form(None, description="의사 소견"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_active_user),
+    priority: InferencePriority = Depends(admit_by_priority),
+    form: FormData = Depends(upload_form),  # 인증/모델 준비/승인 제어를 통과한 뒤에 본문을 읽음
 ):
     """
-    통합 진료 워크플로우
+    통합 진료 워크플로우 (multipart/form-data: patient_id, chief_complaint, image, mode, tiled)
     
     1. 환자 정보 확인
     2. 진료 기록 생성
@@ -43,11 +76,14 @@ async def create_clinical_diagnosis(
     5. 세그멘테이션 이미지 반환
     
     - 인증 필요 (의사 권한)
+    - 동시 처리 한도를 넘으면 429 / 503 (Retry-After, 업로드 본문을 읽기 전에 응답)
+    - priority (쿼리): urgent (예약 슬롯, 배칭 대기 없음) / routine / batch, 같은 등급은 의사별로 번갈아 처리
+    - X-Debug-Timings 헤더가 있으면 단계별 소요 시간(ms, DB 저장 포함)을 timings로 반환
     """
-    print(f"patient_id: {patient_id}")
-    print(f"chief_complaint: {chief_complaint}")
-    print(f"image: {image}")
-    print(f"current_user: {current_user}")
+    fields = form_fields(form, ClinicalDiagnosisForm)
+    image = form_file(form, "image")
+    patient_id, chief_complaint, mode, tiled = fields.patient_id, fields.chief_complaint, fields.mode, fields.tiled
+    logger.debug(f"Clinical diagnosis: patient_id={patient_id}, user={current_user.id}, image={image.filename}")
     # 1. 권한 체크 (의사만 가능)
     if current_user.role.value not in ["ADMIN", "DOCTOR"]:
         raise HTTPException(status_code=403, detail="의사 권한이 필요합니다.")
@@ -58,22 +94,31 @@ async def create_clinical_diagnosis(
         raise HTTPException(status_code=404, detail="환자를 찾을 수 없습니다.")
     
     # 3. 이미지 유효성 검사
-    if not image.content_type.startswith("image/"):
+    if not (image.content_type or "").startswith("image/"):
         raise HTTPException(status_code=400, detail="이미지 파일만 업로드 가능합니다.")
+    if mode == InferenceMode.SEGMENT:
+        raise HTTPException(status_code=400, detail="진료 기록에는 분류 결과가 필요합니다. (full 또는 classify)")
     
-    # 4. 임시 파일로 저장
-    with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(image.filename)[1]) as tmp:
-        content = await image.read()
-        tmp.write(content)
-        tmp_path = tmp.name
-    
+    # 4. 업로드를 메모리로 읽고 헤더 검증 (임시 파일 없음)
+    content = await read_upload(image)
     try:
-        # 5. AI 진단 수행
-        result = ai_service.predict(tmp_path)
-        if "error" in result:
-            raise HTTPException(status_code=500, detail=result.get("message", "AI 진단 실패"))
-        
-        # 6. 진료 기록 생성
+        probe_image(content)
+    except ImageRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    
+    # 5. AI 진단 수행 (같은 이미지 재전송이면 캐시된 결과 사용)
+    result = await admission.guard(request, result_cache.get_or_compute(
+        content, mode.value, tiled,
+        lambda: inference_batcher.submit(
+            content, mode.value, tiled, priority.value, user=current_user.id, profile=wants_timings(request.headers),
+        ),
+    ))
+    if "error" in result:
+        raise HTTPException(status_code=500, detail=result.get("message", "AI 진단 실패"))
+    
+    # 6. 진료 기록 생성
+    with tracing.span("clinical.persist"):
+        persist_start = time.perf_counter()
         visit = Visit(
             patient_id=patient_id,
             doctor_id=current_user.id,
@@ -84,10 +129,9 @@ async def create_clinical_diagnosis(
         )
         db.add(visit)
         db.flush()  # visit.id 생성을 위해
-        
-        import json
 
-        # 7. 진단 결과 저장
+        # 7. 진단 결과 저장 (classify 모드면 세그멘테이션 비율은 비워둠)
+        seg_ratios = result["segmentation"]["stats"]["ratios"] if "segmentation" in result else {}
         diagnosis = Diagnosis(
             visit_id=visit.id,
             prediction=result["prediction"],
@@ -96,60 +140,63 @@ async def create_clinical_diagnosis(
             probabilities=json.dumps(result["probabilities"]),
             probabilities_kr=json.dumps(result["probabilities_kr"]),
             raw_logits=json.dumps(result.get("raw_logits")),
-            
+        
             # MTL 세그멘테이션 정보 - ["stats"] 추가
-            tumor_ratio=result["segmentation"]["stats"]["ratios"]["tumor"],
-            stroma_ratio=result["segmentation"]["stats"]["ratios"]["stroma"],
-            normal_ratio=result["segmentation"]["stats"]["ratios"]["normal"],
-            immune_ratio=result["segmentation"]["stats"]["ratios"]["immune"],
-            background_ratio=result["segmentation"]["stats"]["ratios"]["background"],
-            
+            tumor_ratio=seg_ratios.get("tumor"),
+            stroma_ratio=seg_ratios.get("stroma"),
+            normal_ratio=seg_ratios.get("normal"),
+            immune_ratio=seg_ratios.get("immune"),
+            background_ratio=seg_ratios.get("background"),
+        
             model_type=result["model_info"]["model_type"],
             processing_time=result["processing_time"],
-            device=result["model_info"]["device"],
+            # 어떤 정밀도로 나온 결과인지 감사할 수 있게 장치/버전에 함께 기록 (예: cpu/bf16)
+            device=f'{result["model_info"]["device"]}/{result["model_info"].get("precision", "fp32")}'[:20],
+            model_version=(result["model_info"].get("model_version") or "")[:50] or None,
             is_reviewed=0
         )
         db.add(diagnosis)
         db.commit()
         db.refresh(visit)
         db.refresh(diagnosis)
-        
-        # 8. 응답 구성
-        response = {
-            "visit": {
-                "id": visit.id,
-                "visit_date": visit.visit_date.isoformat(),
-                "patient_name": patient.name,
-                "patient_number": patient.patient_number,
-                "chief_complaint": chief_complaint,
-                "status": visit.status
-            },
-            "diagnosis": {
-                "id": diagnosis.id,
-                "prediction": result["prediction"],
-                "prediction_kr": result["prediction_kr"],
-                "confidence": result["confidence"],
-                # "probabilities_kr": result["probabilities_kr"],
-                "probabilities_kr": (
-                    json.loads(result["probabilities_kr"]) 
-                    if isinstance(result["probabilities_kr"], str) 
-                    else result["probabilities_kr"]
-                ),
-            },
-            "segmentation": {
-                "image_base64": result["segmentation"]["image_base64"],
-                "ratios": result["segmentation"]["stats"]["ratios"],
-                "class_colors": result["segmentation"]["class_colors"]
-            },
-            "processing_time": result["processing_time"]
-        }
-        
-        return response
-        
-    finally:
-        # 9. 임시 파일 삭제
-        if os.path.exists(tmp_path):
-            os.unlink(tmp_path)
+    persist_ms = round((time.perf_counter() - persist_start) * 1000.0, 3)
+    stage_profiler.record({"persist": persist_ms})
+    
+    # 8. 응답 구성
+    response = {
+        "visit": {
+            "id": visit.id,
+            "visit_date": visit.visit_date.isoformat(),
+            "patient_name": patient.name,
+            "patient_number": patient.patient_number,
+            "chief_complaint": chief_complaint,
+            "status": visit.status
+        },
+        "diagnosis": {
+            "id": diagnosis.id,
+            "prediction": result["prediction"],
+            "prediction_kr": result["prediction_kr"],
+            "confidence": result["confidence"],
+            # "probabilities_kr": result["probabilities_kr"],
+            "probabilities_kr": (
+                json.loads(result["probabilities_kr"]) 
+                if isinstance(result["probabilities_kr"], str) 
+                else result["probabilities_kr"]
+            ),
+        },
+        "segmentation": {
+            "image_base64": result["segmentation"]["image_base64"],
+            "image_format": result["segmentation"]["image_format"],
+            "media_type": result["segmentation"]["media_type"],
+            "ratios": result["segmentation"]["stats"]["ratios"],
+            "class_colors": result["segmentation"]["class_colors"]
+        } if "segmentation" in result else None,
+        "processing_time": result["processing_time"]
+    }
+    if wants_timings(request.headers):
+        response["timings"] = {**result.get("timings", {}), "persist": persist_ms}
+    
+    return response
 
 
 @router.get("/stats")
@@ -165,29 +212,19 @@ def get_clinical_stats(
     - 최근 진료 내역
     """
     
-    # 전체 진료 건수
-    total_visits = db.query(Visit).count()
-    
-    # 완료된 진료 건수
-    completed_visits = db.query(Visit).filter(Visit.status == "COMPLETED").count()
-    
-    # 대기 중인 진료 건수
-    pending_visits = db.query(Visit).filter(Visit.status == "PENDING").count()
+    # 진료 상태별 건수 (GROUP BY 한 번)
+    visits = visit_status_counts(db)
     
     # 전체 환자 수
     total_patients = db.query(Patient).count()
     
-    # 암 유형별 통계
-    diagnoses = db.query(Diagnosis).all()
-    cancer_stats = {}
-    for diag in diagnoses:
-        cancer_type = diag.prediction_kr
-        cancer_stats[cancer_type] = cancer_stats.get(cancer_type, 0) + 1
+    # 암 유형별 통계 (일별 집계 테이블)
+    cancer_stats = diagnosis_summary(db)["distribution"]
     
     return {
-        "total_visits": total_visits,
-        "completed_visits": completed_visits,
-        "pending_visits": pending_visits,
+        "total_visits": visits["total"],
+        "completed_visits": visits["completed"],
+        "pending_visits": visits["pending"],
         "total_patients": total_patients,
         "cancer_type_distribution": cancer_stats
     }
@@ -2,25 +2,36 @@
 진단 결과 관리 API (리뷰 시스템 포함)
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.orm import Session, joinedload, load_only
 from typing import List, Optional
 
 from app.core.database import get_db
+from app.core.pagination import PageParams, paginate
 from app.core.security import get_current_active_user
 from app.schemas.diagnosis import Diagnosis, DiagnosisCreate
 from app.models.diagnosis import Diagnosis as DiagnosisModel
 from app.models.visit import Visit
 from app.models.user import User
 from app.models.patient import Patient
+from app.services.dashboard_stats import diagnosis_summary
 
 router = APIRouter()
 
+# 목록 응답에 쓰는 컬럼만 읽음 (probabilities/raw_logits 같은 JSON 컬럼 제외)
+_DIAGNOSIS_LIST_COLUMNS = (
+    DiagnosisModel.id, DiagnosisModel.visit_id, DiagnosisModel.prediction, DiagnosisModel.prediction_kr,
+    DiagnosisModel.confidence, DiagnosisModel.probabilities_kr, DiagnosisModel.tumor_ratio,
+    DiagnosisModel.stroma_ratio, DiagnosisModel.normal_ratio, DiagnosisModel.is_reviewed,
+    DiagnosisModel.reviewed_by, DiagnosisModel.created_at,
+)
+
 
 @router.get("/", response_model=List[dict])
 def get_diagnoses(
-    skip: int = 0,
-    limit: int = 100,
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
     is_reviewed: Optional[int] = Query(None, description="리뷰 상태 (0: 미검토, 1: 검토완료)"),
     prediction: Optional[str] = Query(None, description="진단 결과로 필터링"),
     db: Session = Depends(get_db),
@@ -30,10 +41,18 @@ def get_diagnoses(
     진단 결과 목록 조회
     
     - 리뷰 상태 및 진단 결과로 필터링 가능
+    - 최신순, 다음 페이지는 X-Next-Cursor 헤더의 cursor로 조회
     - 인증 필요
     """
     
-    query = db.query(DiagnosisModel)
+    # 진료 → 환자를 JOIN으로 함께 읽어 페이지 크기와 무관하게 쿼리 1번
+    query = db.query(DiagnosisModel).options(
+        load_only(*_DIAGNOSIS_LIST_COLUMNS),
+        joinedload(DiagnosisModel.visit)
+        .load_only(Visit.id, Visit.patient_id)
+        .joinedload(Visit.patient)
+        .load_only(Patient.id, Patient.name, Patient.patient_number),
+    )
     
     if is_reviewed is not None:
         query = query.filter(DiagnosisModel.is_reviewed == is_reviewed)
@@ -41,18 +60,17 @@ def get_diagnoses(
     if prediction:
         query = query.filter(DiagnosisModel.prediction == prediction)
     
-    # 최신순 정렬
-    query = query.order_by(DiagnosisModel.created_at.desc())
-    
-    diagnoses = query.offset(skip).limit(limit).all()
+    # 최신순 (created_at, id) 키셋
+    filtered = is_reviewed is not None or bool(prediction)
+    diagnoses = paginate(
+        query, (DiagnosisModel.created_at, DiagnosisModel.id), page, request, response,
+        estimate_table=None if filtered else DiagnosisModel.__tablename__,
+    )
     
     # 진료 및 환자 정보 포함
     result = []
     for diag in diagnoses:
-        visit = db.query(Visit).filter(Visit.id == diag.visit_id).first()
-        patient = None
-        if visit:
-            patient = db.query(Patient).filter(Patient.id == visit.patient_id).first()
+        patient = diag.visit.patient if diag.visit else None
         
         result.append({
             "id": diag.id,
@@ -69,7 +87,7 @@ def get_diagnoses(
             "stroma_ratio": diag.stroma_ratio,
             "normal_ratio": diag.normal_ratio,
             "is_reviewed": diag.is_reviewed,
-            "reviewed_by_id": diag.reviewed_by_id,
+            "reviewed_by_id": diag.reviewed_by,
             "created_at": diag.created_at.isoformat() if diag.created_at else None
         })
     
@@ -115,24 +133,24 @@ def get_diagnosis(
     - 진료 및 환자 정보 포함
     """
     
-    diagnosis = db.query(DiagnosisModel).filter(DiagnosisModel.id == diagnosis_id).first()
+    # 진료/환자/담당 의사/리뷰어를 JOIN으로 한 번에 읽음
+    diagnosis = (
+        db.query(DiagnosisModel)
+        .options(
+            joinedload(DiagnosisModel.visit).joinedload(Visit.patient),
+            joinedload(DiagnosisModel.visit).joinedload(Visit.doctor),
+            joinedload(DiagnosisModel.reviewer),
+        )
+        .filter(DiagnosisModel.id == diagnosis_id)
+        .first()
+    )
     if not diagnosis:
         raise HTTPException(status_code=404, detail="진단 결과를 찾을 수 없습니다.")
     
-    # 진료 정보
-    visit = db.query(Visit).filter(Visit.id == diagnosis.visit_id).first()
-    
-    # 환자 정보
-    patient = None
-    doctor = None
-    if visit:
-        patient = db.query(Patient).filter(Patient.id == visit.patient_id).first()
-        doctor = db.query(User).filter(User.id == visit.doctor_id).first()
-    
-    # 리뷰한 의사 정보
-    reviewer = None
-    if diagnosis.reviewed_by_id:
-        reviewer = db.query(User).filter(User.id == diagnosis.reviewed_by_id).first()
+    visit = diagnosis.visit
+    patient = visit.patient if visit else None
+    doctor = visit.doctor if visit else None
+    reviewer = diagnosis.reviewer
     
     return {
         "id": diagnosis.id,
@@ -160,6 +178,7 @@ def get_diagnosis(
         "model_type": diagnosis.model_type,
         "processing_time": diagnosis.processing_time,
         "device": diagnosis.device,
+        "model_version": diagnosis.model_version,
         "is_reviewed": diagnosis.is_reviewed,
         "reviewed_by": {
             "id": reviewer.id,
@@ -191,7 +210,7 @@ def review_diagnosis(
         raise HTTPException(status_code=404, detail="진단 결과를 찾을 수 없습니다.")
     
     diagnosis.is_reviewed = 1 if approved else 0
-    diagnosis.reviewed_by_id = current_user.id
+    diagnosis.reviewed_by = current_user.id
     
     db.commit()
     db.refresh(diagnosis)
@@ -238,22 +257,13 @@ def get_diagnosis_stats(
     
     - 전체/리뷰완료/미검토 건수
     - 암 유형별 분포
+    - 일별 집계 테이블(diagnosis_daily_stats)에서 조회
     """
     
-    total = db.query(DiagnosisModel).count()
-    reviewed = db.query(DiagnosisModel).filter(DiagnosisModel.is_reviewed == 1).count()
-    unreviewed = db.query(DiagnosisModel).filter(DiagnosisModel.is_reviewed == 0).count()
-    
-    # 암 유형별 통계
-    diagnoses = db.query(DiagnosisModel).all()
-    cancer_distribution = {}
-    for diag in diagnoses:
-        cancer_type = diag.prediction_kr
-        cancer_distribution[cancer_type] = cancer_distribution.get(cancer_type, 0) + 1
-    
+    summary = diagnosis_summary(db)
     return {
-        "total": total,
-        "reviewed": reviewed,
-        "unreviewed": unreviewed,
-        "cancer_distribution": cancer_distribution
+        "total": summary["total"],
+        "reviewed": summary["reviewed"],
+        "unreviewed": summary["unreviewed"],
+        "cancer_distribution": summary["distribution"]
     }
@@ -1,17 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from typing import List
 
 from app.core.database import get_db
+from app.core.pagination import PageParams, paginate
 from app.schemas.patient import Patient, PatientCreate, PatientUpdate
 from app.models.patient import Patient as PatientModel
 
 router = APIRouter()
 
 @router.get("/", response_model=List[Patient])
-def get_patients(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    patients = db.query(PatientModel).offset(skip).limit(limit).all()
-    return patients
+def get_patients(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
+    db: Session = Depends(get_db),
+):
+    # 등록 순 (id 키셋), 다음 페이지는 X-Next-Cursor 헤더
+    return paginate(
+        db.query(PatientModel), (PatientModel.id,), page, request, response,
+        descending=False, estimate_table=PatientModel.__tablename__,
+    )
 
 @router.post("/", response_model=Patient)
 def create_patient(patient: PatientCreate, db: Session = Depends(get_db)):
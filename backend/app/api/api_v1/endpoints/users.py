@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from typing import List
 
 from app.core.database import get_db
+from app.core.pagination import PageParams, paginate
 from app.core.security import get_current_active_user, get_password_hash
 from app.schemas.user import User, UserCreate, UserUpdate
 from app.models.user import User as UserModel
@@ -12,8 +13,9 @@ router = APIRouter()
 
 @router.get("/", response_model=List[User])
 def get_users(
-    skip: int = 0,
-    limit: int = 100,
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)  # 인증 필요
 ):
@@ -21,9 +23,12 @@ def get_users(
     사용자 목록 조회
     
     - 인증 필요 (Bearer Token)
+    - 다음 페이지는 X-Next-Cursor 헤더의 cursor로 조회
     """
-    users = db.query(UserModel).offset(skip).limit(limit).all()
-    return users
+    return paginate(
+        db.query(UserModel), (UserModel.id,), page, request, response,
+        descending=False, estimate_table=UserModel.__tablename__,
+    )
 
 
 @router.post("/", response_model=User)
@@ -3,26 +3,35 @@
 환자별, 의사별, 날짜별 필터링 지원
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.orm import Session, joinedload, load_only, selectinload
 from typing import List, Optional
 from datetime import datetime, date
 
 from app.core.database import get_db
+from app.core.pagination import PageParams, paginate
 from app.core.security import get_current_active_user
 from app.schemas.visit import Visit, VisitCreate, VisitUpdate
 from app.models.visit import Visit as VisitModel
 from app.models.patient import Patient
 from app.models.user import User
-from app.models.diagnosis import Diagnosis
+from app.services.analytics import visits_by_doctor
+from app.services.dashboard_stats import visit_status_counts
 
 router = APIRouter()
 
+# 목록 응답에 쓰는 컬럼만 읽음 (treatment_plan/notes 같은 Text 컬럼 제외)
+_VISIT_LIST_COLUMNS = (
+    VisitModel.id, VisitModel.patient_id, VisitModel.doctor_id, VisitModel.visit_date,
+    VisitModel.chief_complaint, VisitModel.diagnosis_summary, VisitModel.status, VisitModel.created_at,
+)
+
 
 @router.get("/", response_model=List[dict])
 def get_visits(
-    skip: int = 0,
-    limit: int = 100,
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
     patient_id: Optional[int] = Query(None, description="환자 ID로 필터링"),
     doctor_id: Optional[int] = Query(None, description="의사 ID로 필터링"),
     status: Optional[str] = Query(None, description="상태로 필터링 (PENDING/COMPLETED)"),
@@ -35,11 +44,16 @@ def get_visits(
     진료 기록 목록 조회 (고급 필터링)
     
     - 환자별, 의사별, 상태별, 날짜별 필터링 가능
+    - 최신순, 다음 페이지는 X-Next-Cursor 헤더의 cursor로 조회
     - 인증 필요
     """
     
-    # 기본 쿼리
-    query = db.query(VisitModel)
+    # 환자/의사를 JOIN으로 함께 읽어 페이지 크기와 무관하게 쿼리 1번
+    query = db.query(VisitModel).options(
+        load_only(*_VISIT_LIST_COLUMNS),
+        joinedload(VisitModel.patient).load_only(Patient.id, Patient.name, Patient.patient_number),
+        joinedload(VisitModel.doctor).load_only(User.id, User.full_name, User.username),
+    )
     
     # 필터링 적용
     if patient_id:
@@ -57,16 +71,18 @@ def get_visits(
     if date_to:
         query = query.filter(VisitModel.visit_date <= date_to)
     
-    # 최신순 정렬
-    query = query.order_by(VisitModel.visit_date.desc())
-    
-    visits = query.offset(skip).limit(limit).all()
+    # 최신순 (visit_date, id) 키셋
+    filtered = any(v is not None for v in (patient_id, doctor_id, status, date_from, date_to))
+    visits = paginate(
+        query, (VisitModel.visit_date, VisitModel.id), page, request, response,
+        estimate_table=None if filtered else VisitModel.__tablename__,
+    )
     
     # 환자 및 의사 정보 포함
     result = []
     for visit in visits:
-        patient = db.query(Patient).filter(Patient.id == visit.patient_id).first()
-        doctor = db.query(User).filter(User.id == visit.doctor_id).first()
+        patient = visit.patient
+        doctor = visit.doctor
         
         result.append({
             "id": visit.id,
@@ -132,18 +148,23 @@ def get_visit(
     - 인증 필요
     """
     
-    visit = db.query(VisitModel).filter(VisitModel.id == visit_id).first()
+    # 환자/의사는 JOIN, 진단 결과는 IN 쿼리 1번 (총 2번)
+    visit = (
+        db.query(VisitModel)
+        .options(
+            joinedload(VisitModel.patient),
+            joinedload(VisitModel.doctor),
+            selectinload(VisitModel.diagnoses),
+        )
+        .filter(VisitModel.id == visit_id)
+        .first()
+    )
     if not visit:
         raise HTTPException(status_code=404, detail="진료 기록을 찾을 수 없습니다.")
     
-    # 환자 정보
-    patient = db.query(Patient).filter(Patient.id == visit.patient_id).first()
-    
-    # 의사 정보
-    doctor = db.query(User).filter(User.id == visit.doctor_id).first()
-    
-    # 진단 결과
-    diagnosis = db.query(Diagnosis).filter(Diagnosis.visit_id == visit.id).first()
+    patient = visit.patient
+    doctor = visit.doctor
+    diagnosis = visit.diagnoses[0] if visit.diagnoses else None
     
     return {
         "id": visit.id,
@@ -250,15 +271,10 @@ def get_visit_stats(
     진료 통계 요약
     
     - 전체/완료/대기 건수
-    - 의사별 진료 건수
+    - 의사별 진료 건수 (진료 일별 집계 테이블, 기간별 추이는 /analytics)
     """
     
-    total = db.query(VisitModel).count()
-    completed = db.query(VisitModel).filter(VisitModel.status == "COMPLETED").count()
-    pending = db.query(VisitModel).filter(VisitModel.status == "PENDING").count()
-    
     return {
-        "total": total,
-        "completed": completed,
-        "pending": pending
+        **visit_status_counts(db),
+        "by_doctor": visits_by_doctor(db)
     }
@@ -2,20 +2,55 @@
 Database configuration
 """
 
-from sqlalchemy import create_engine
+import time
+
+from sqlalchemy import create_engine, exc
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 from app.core.config import settings
+from app.core import query_profiler, tracing
+from app.core.metrics import db_pool_timeouts, db_pool_wait
+
+
+class TimedQueuePool(QueuePool):
+    """체크아웃 대기 시간/타임아웃을 /metrics에 기록하는 QueuePool"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            db_pool_timeouts.inc()
+            raise
+        finally:
+            db_pool_wait.observe(time.perf_counter() - start)
+
+
+def _create_engine(url: str):
+    # sqlite 등 QueuePool을 쓰지 않는 드라이버는 기본 풀 유지
+    created = create_engine(
+        url,
+        pool_pre_ping=True,
+        pool_recycle=3600,
+        echo=settings.DEBUG,
+        **({} if url.startswith("sqlite") else {"poolclass": TimedQueuePool}),
+    )
+    if settings.DB_QUERY_PROFILING:
+        query_profiler.install(created)
+    if tracing.enabled():
+        tracing.install(created)
+    return created
+
 
 # SQLAlchemy engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_recycle=3600,
-    echo=settings.DEBUG
-)
+engine = _create_engine(settings.DATABASE_URL)
+
+# 통계 API용 엔진 (ANALYTICS_DATABASE_URL로 복제본을 지정하면 운영 primary 부하와 분리)
+analytics_engine = _create_engine(settings.ANALYTICS_DATABASE_URL) if settings.ANALYTICS_DATABASE_URL else engine
 
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AnalyticsSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=analytics_engine)
 
 # Base import (모든 모델이 이것을 상속)
 from app.models.base import Base
@@ -30,3 +65,14 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_analytics_db():
+    """
+    Dependency for 통계 API (읽기 전용)
+    """
+    db = AnalyticsSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
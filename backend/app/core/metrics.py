@@ -0,0 +1,219 @@
+"""
+Prometheus 텍스트 형식 메트릭 (GET /metrics)
+외부 라이브러리 없이 요청 경로에서는 카운터/히스토그램만 올리고, 나머지 값은 수집 시점에 각 통계 객체에서 읽음
+
+- HTTP: 라우트 템플릿별 지연 히스토그램, 상태 코드별 요청 수, 처리 중 요청 수 (MetricsMiddleware)
+- DB 풀: 체크아웃/오버플로 수, 체크아웃 대기 시간 히스토그램, 대기 타임아웃 수 (app.core.database)
+- SQL: 문장 실행 시간 히스토그램 (app.core.query_profiler)
+- 값은 프로세스별 (uvicorn --workers N이면 워커마다 따로 수집됨)
+"""
+
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricWriter:
+    """메트릭 패밀리를 Prometheus 텍스트 형식(0.0.4)으로 이어 붙임"""
+
+    def __init__(self):
+        self.lines: List[str] = []
+
+    def family(self, name: str, kind: str, help_text: str, samples: Iterable[Tuple[str, Dict, float]]):
+        """samples: (이름 접미사, 라벨, 값), 카운터는 _total 접미사까지 붙인 이름으로 선언 (0.0.4 형식)"""
+        declared = f"{name}_total" if kind == "counter" else name
+        self.lines.append(f"# HELP {declared} {help_text}")
+        self.lines.append(f"# TYPE {declared} {kind}")
+        for suffix, labels, value in samples:
+            if value is None:
+                continue
+            label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+            self.lines.append(f"{name}{suffix}{{{label_text}}} {_format_value(value)}" if label_text
+                              else f"{name}{suffix} {_format_value(value)}")
+
+    def gauge(self, name: str, help_text: str, value: float, **labels):
+        self.family(name, "gauge", help_text, [("", labels, value)])
+
+    def counter(self, name: str, help_text: str, value: float, **labels):
+        self.family(name, "counter", help_text, [("_total", labels, value)])
+
+    def text(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def histogram_samples(
+    labels: Dict, buckets: Sequence[float], counts: Sequence[int], total: float
+) -> List[Tuple[str, Dict, float]]:
+    """버킷별 개수(마지막은 +Inf 초과분) → 누적 _bucket, _sum, _count 샘플"""
+    samples = []
+    cumulative = 0
+    for bound, count in zip(list(buckets) + [float("inf")], counts):
+        cumulative += count
+        samples.append(("_bucket", {**labels, "le": _format_value(float(bound))}, cumulative))
+    samples.append(("_sum", labels, total))
+    samples.append(("_count", labels, cumulative))
+    return samples
+
+
+class Histogram:
+    """
+    라벨별 고정 버킷 히스토그램
+
+    observe는 bisect 한 번 + 카운터 증가 (잠금은 새 라벨 조합을 만들 때만,
+    스레드끼리 동시에 올리면 드물게 한 건이 빠질 수 있지만 요청 경로 비용을 우선)
+    """
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._series: Dict[Labels, list] = {}  # 라벨 → [버킷별 개수..., 합계]
+
+    def observe(self, value: float, *labels: str):
+        series = self._series.get(labels)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(labels, [0] * (len(self.buckets) + 1) + [0.0])
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def collect(self, writer: MetricWriter):
+        samples = []
+        for labels, series in list(self._series.items()):
+            samples.extend(histogram_samples(
+                dict(zip(self.labelnames, labels)), self.buckets, series[:-1], series[-1]
+            ))
+        writer.family(self.name, "histogram", self.help, samples)
+
+
+class Counter:
+    """라벨별 누적 카운터"""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def collect(self, writer: MetricWriter):
+        writer.family(self.name, "counter", self.help, [
+            ("_total", dict(zip(self.labelnames, labels)), value) for labels, value in list(self._values.items())
+        ])
+
+
+# HTTP
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route")
+)
+http_requests = Counter("http_requests", "HTTP requests by route template and status", ("method", "route", "status"))
+http_in_flight = 0
+
+# DB 커넥션 풀 (app.core.database.TimedQueuePool이 기록)
+db_pool_wait = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled DB connection", buckets=POOL_WAIT_BUCKETS
+)
+db_pool_timeouts = Counter("db_pool_checkout_timeouts", "DB pool checkouts that timed out")
+db_query_duration = Histogram(
+    "db_query_duration_seconds", "SQL statement execution time", buckets=POOL_WAIT_BUCKETS
+)
+
+
+_route_templates: Optional[Dict[Callable, str]] = None
+
+
+def route_template(scope) -> str:
+    """
+    라우팅이 끝난 scope의 라우트 템플릿 (/api/v1/patients/{patient_id} 같은 형태, 카디널리티 고정)
+    어떤 라우트에도 맞지 않은 요청(404 등)은 "unmatched"
+    """
+    global _route_templates
+    route = scope.get("route")
+    if route is not None and hasattr(route, "path"):
+        return route.path
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return "unmatched"
+    if _route_templates is None:
+        _route_templates = {
+            route.endpoint: route.path
+            for route in getattr(scope.get("app"), "routes", [])
+            if hasattr(route, "endpoint") and hasattr(route, "path")
+        }
+    return _route_templates.get(endpoint, "unmatched")
+
+
+class MetricsMiddleware:
+    """라우트 템플릿별 지연/요청 수 (순수 ASGI 미들웨어, 응답 본문까지 보낸 시점 기준)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        global http_in_flight
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_in_flight -= 1
+            route = route_template(scope)
+            http_request_duration.observe(time.perf_counter() - start, scope["method"], route)
+            http_requests.inc(scope["method"], route, str(status))
+
+
+def collect_db_pool(writer: MetricWriter, engine):
+    """SQLAlchemy QueuePool 상태 (다른 풀 클래스면 가능한 값만)"""
+    pool = engine.pool
+    for name, attr, help_text in (
+        ("db_pool_size", "size", "Configured DB pool size"),
+        ("db_pool_checked_out", "checkedout", "DB connections currently checked out"),
+        ("db_pool_checked_in", "checkedin", "Idle DB connections in the pool"),
+        ("db_pool_overflow", "overflow", "DB connections opened beyond pool_size (negative: unused capacity)"),
+    ):
+        getter = getattr(pool, attr, None)
+        if getter is not None:
+            writer.gauge(name, help_text, getter())
+    db_pool_wait.collect(writer)
+    db_pool_timeouts.collect(writer)
+    db_query_duration.collect(writer)
+
+
+def collect_http(writer: MetricWriter):
+    writer.gauge("http_requests_in_flight", "HTTP requests currently being processed", http_in_flight)
+    http_request_duration.collect(writer)
+    http_requests.collect(writer)
@@ -0,0 +1,142 @@
+"""
+키셋(커서) 페이지네이션
+OFFSET 대신 (정렬 키, id) 기준 WHERE 조건으로 다음 페이지를 찾으므로 깊은 페이지도 첫 페이지와 같은 비용
+
+- 목록 응답 본문은 기존처럼 배열 그대로, 다음 페이지 정보는 응답 헤더로
+  X-Next-Cursor: 다음 요청의 ?cursor= 값 (마지막 페이지면 없음), Link: rel="next"
+  X-Total-Count-Estimate: ?include_total=true이고 필터가 없을 때 DB 통계 기반 대략적인 전체 행 수 (COUNT(*) 아님)
+- 페이지 크기는 PAGE_SIZE_MAX로 제한
+- 커서는 불투명 문자열 (정렬 키/id를 담은 base64 JSON, 형식은 바뀔 수 있음)
+"""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException, Query, Request, Response
+from sqlalchemy import and_, or_, text
+from sqlalchemy.orm import Query as ORMQuery
+
+from app.core.config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_ESTIMATE_HEADER = "X-Total-Count-Estimate"
+EXPOSED_HEADERS = [NEXT_CURSOR_HEADER, TOTAL_ESTIMATE_HEADER, "Link"]
+
+
+class PageParams:
+    """목록 엔드포인트 공통 쿼리 파라미터 (Depends(PageParams))"""
+
+    def __init__(
+        self,
+        limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX, description="페이지 크기"),
+        cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값"),
+        skip: int = Query(0, ge=0, le=settings.PAGE_MAX_OFFSET, deprecated=True,
+                          description="OFFSET 방식 (cursor가 없을 때만 사용, cursor 권장)"),
+        include_total: bool = Query(False, description="대략적인 전체 행 수를 X-Total-Count-Estimate 헤더로"),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.skip = skip
+        self.include_total = include_total
+
+
+def _encode_value(value: Any):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any):
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """잘못된 커서는 400"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = [_decode_value(v) for v in json.loads(raw)]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def _after(columns: Sequence, values: Sequence, descending: bool):
+    """
+    (c1, c2, ...) > (v1, v2, ...) 를 OR/AND로 풀어 씀 (MySQL 행 비교보다 인덱스 범위 스캔을 잘 탐)
+    첫 컬럼 범위 조건(c1 >= v1)을 중복으로 붙여 OR만으로는 시작 위치를 못 찾는 플래너도 인덱스 seek
+    """
+    clauses = []
+    for i, (column, value) in enumerate(zip(columns, values)):
+        step = column < value if descending else column > value
+        clauses.append(and_(*[c == v for c, v in zip(columns[:i], values[:i])], step))
+    if len(columns) == 1:
+        return clauses[0]
+    bound = columns[0] <= values[0] if descending else columns[0] >= values[0]
+    return and_(bound, or_(*clauses))
+
+
+def estimate_rows(db, table: str) -> Optional[int]:
+    """DB 통계 기반 대략적인 행 수 (MySQL information_schema / PostgreSQL pg_class, 그 외 None)"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        statement = text(
+            "SELECT TABLE_ROWS FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table"
+        )
+    elif dialect == "postgresql":
+        statement = text("SELECT reltuples::bigint FROM pg_class WHERE relname = :table")
+    else:
+        return None
+    value = db.execute(statement, {"table": table}).scalar()
+    return max(int(value), 0) if value is not None else None
+
+
+def paginate(
+    query: ORMQuery,
+    order_by: Sequence,
+    page: PageParams,
+    request: Request,
+    response: Response,
+    descending: bool = True,
+    estimate_table: Optional[str] = None,
+) -> list:
+    """
+    order_by: (정렬 키..., id) 컬럼 목록, 마지막은 유일해야 함
+    estimate_table: include_total일 때 행 수를 추정할 테이블 (필터가 걸린 쿼리면 None)
+    """
+    query = query.order_by(*[column.desc() if descending else column.asc() for column in order_by])
+    if page.cursor:
+        query = query.filter(_after(order_by, decode_cursor(page.cursor, len(order_by)), descending))
+    elif page.skip:
+        query = query.offset(page.skip)
+
+    rows = query.limit(page.limit + 1).all()
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        cursor = encode_cursor([getattr(rows[-1], column.key) for column in order_by])
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+        next_url = request.url.remove_query_params("skip").include_query_params(cursor=cursor)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+
+    if page.include_total and estimate_table:
+        estimate = estimate_rows(query.session, estimate_table)
+        if estimate is not None:
+            response.headers[TOTAL_ESTIMATE_HEADER] = str(estimate)
+    return rows
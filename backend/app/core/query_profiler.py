@@ -0,0 +1,145 @@
+"""
+요청 단위 SQL 프로파일러 (SQLAlchemy 엔진 이벤트)
+
+- 요청마다 실행한 문장 수와 시간을 모으고, DB_SLOW_QUERY_MS를 넘는 문장은 파라미터를 가린 채 로그
+- 한 요청 안에서 같은 모양(바인드 파라미터만 다른)의 문장이 DB_N_PLUS_ONE_THRESHOLD번 이상이면 N+1 의심으로 경고
+- DEBUG면 응답 헤더에 X-DB-Query-Count / X-DB-Query-Time-Ms / X-DB-N-Plus-One
+- 테스트용: capture_queries() / assert_max_queries(n) (요청 컨텍스트와 무관하게 그 사이의 모든 문장을 셈)
+
+    def test_visits_query_count(client):
+        with assert_max_queries(4):
+            client.get("/api/v1/visits/")
+"""
+
+import contextlib
+import contextvars
+import logging
+import re
+import time
+from collections import Counter
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.metrics import db_query_duration
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+# IN (%s, %s, ...) / VALUES (?, ?) 처럼 개수만 다른 자리표시자 목록은 같은 모양으로
+_PLACEHOLDER_LIST = re.compile(r"(%s|\?|%\(\w+\)s)(\s*,\s*(%s|\?|%\(\w+\)s))+")
+
+
+def statement_shape(statement: str) -> str:
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    return _PLACEHOLDER_LIST.sub(r"\1, ...", shape)
+
+
+class QueryStats:
+    """한 요청(또는 캡처 구간)에서 실행한 SQL 문장 통계"""
+
+    def __init__(self, keep_statements: bool = False):
+        self.count = 0
+        self.total_time = 0.0
+        self.shapes: Counter = Counter()
+        self.statements: Optional[List[str]] = [] if keep_statements else None
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.total_time += elapsed
+        self.shapes[statement_shape(statement)] += 1
+        if self.statements is not None:
+            self.statements.append(statement)
+
+    def n_plus_one_suspects(self, threshold: Optional[int] = None) -> Dict[str, int]:
+        threshold = threshold or settings.DB_N_PLUS_ONE_THRESHOLD
+        return {shape: count for shape, count in self.shapes.items() if count >= threshold}
+
+
+_current: contextvars.ContextVar[Optional[QueryStats]] = contextvars.ContextVar("query_stats", default=None)
+_captures: List[QueryStats] = []
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    db_query_duration.observe(elapsed)
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    for capture in _captures:
+        capture.record(statement, elapsed)
+    if elapsed * 1000.0 >= settings.DB_SLOW_QUERY_MS:
+        # 파라미터 값(환자 정보 등)은 로그에 남기지 않음
+        count = len(parameters) if isinstance(parameters, (list, tuple, dict)) else 0
+        logger.warning(
+            f"🐢 Slow query {elapsed * 1000.0:.1f} ms: {statement_shape(statement)} "
+            f"[{count} params redacted{', executemany' if executemany else ''}]"
+        )
+
+
+def install(engine):
+    """엔진에 before/after_cursor_execute 리스너 등록"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryProfilerMiddleware:
+    """요청마다 QueryStats를 만들고 끝나면 N+1 의심 문장을 경고 (DEBUG면 응답 헤더도 추가)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current.set(stats)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and settings.DEBUG:
+                headers = list(message.get("headers", []))
+                headers += [
+                    (b"x-db-query-count", str(stats.count).encode()),
+                    (b"x-db-query-time-ms", f"{stats.total_time * 1000.0:.1f}".encode()),
+                    (b"x-db-n-plus-one", str(len(stats.n_plus_one_suspects())).encode()),
+                ]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            for shape, count in stats.n_plus_one_suspects().items():
+                logger.warning(f"⚠️ N+1 suspect on {scope['method']} {scope['path']}: {count}x {shape}")
+
+
+@contextlib.contextmanager
+def capture_queries() -> Iterator[QueryStats]:
+    """구간 안에서 실행된 모든 문장을 모음 (TestClient처럼 다른 스레드에서 실행돼도 잡힘)"""
+    stats = QueryStats(keep_statements=True)
+    _captures.append(stats)
+    try:
+        yield stats
+    finally:
+        _captures.remove(stats)
+
+
+@contextlib.contextmanager
+def assert_max_queries(max_count: int) -> Iterator[QueryStats]:
+    """pytest 헬퍼: 구간 안의 SQL 문장 수가 max_count를 넘으면 AssertionError (실행한 문장 목록 포함)"""
+    with capture_queries() as stats:
+        yield stats
+    if stats.count > max_count:
+        listing = "\n".join(f"  {i + 1}. {statement_shape(s)}" for i, s in enumerate(stats.statements))
+        raise AssertionError(f"Expected at most {max_count} queries, got {stats.count}:\n{listing}")
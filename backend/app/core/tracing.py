@@ -0,0 +1,359 @@
+"""
+분산 트레이싱 (OpenTelemetry 데이터 모델, 외부 라이브러리 없음)
+느린 /clinical/diagnose가 업로드/환자 조회/모델/커밋 중 어디서 시간을 쓰는지 보기 위한 스팬
+
+- HTTP 요청(TracingMiddleware) → SQL 문장(엔진 이벤트) / 결과 캐시 / 배치 큐 / 추론 단계 / 워커 프로세스
+- W3C traceparent 헤더를 이어받고(부모가 샘플링했으면 따름), 워커 프로세스에도 traceparent로 전달
+- 마이크로 배치는 여러 요청이 함께 실행하므로 배치 안의 스팬은 샘플링된 요청마다 하나씩 기록
+- 내보내기: TRACING_EXPORTER=file (JSON Lines, 한 줄에 OTLP 형식 스팬 하나) / otlp (OTLP/HTTP JSON, 로컬 컬렉터)
+- TRACING_SAMPLE_RATE=0이면 미들웨어/리스너를 아예 붙이지 않고, span()은 공유 no-op 객체만 반환
+"""
+
+import contextvars
+import json
+import logging
+import os
+import random
+import threading
+import time
+import urllib.request
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.metrics import route_template
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT = "traceparent"
+_STATUS_ERROR = 2
+
+
+class SpanContext:
+    """다른 프로세스/서비스에서 넘어온 부모 (trace_id, span_id)"""
+
+    __slots__ = ("trace_id", "span_id")
+
+    def __init__(self, trace_id: str, span_id: str):
+        self.trace_id = trace_id
+        self.span_id = span_id
+
+    @classmethod
+    def parse(cls, header: Optional[str]) -> Tuple[Optional["SpanContext"], bool]:
+        """traceparent → (부모, 샘플링 플래그), 형식이 틀리면 (None, False)"""
+        parts = (header or "").strip().split("-")
+        if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+            return None, False
+        try:
+            int(parts[1], 16), int(parts[2], 16)
+            sampled = bool(int(parts[3], 16) & 1)
+        except ValueError:
+            return None, False
+        if parts[1] == "0" * 32 or parts[2] == "0" * 16:
+            return None, False
+        return cls(parts[1], parts[2]), sampled
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+
+class Span(SpanContext):
+    __slots__ = ("name", "parent_id", "kind", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name: str, parent: Optional[SpanContext] = None, kind: int = 1, start_ns: Optional[int] = None):
+        super().__init__(parent.trace_id if parent is not None else os.urandom(16).hex(), os.urandom(8).hex())
+        self.name = name
+        self.parent_id = parent.span_id if parent is not None else None
+        self.kind = kind  # 1: internal, 2: server, 3: client
+        self.start_ns = start_ns if start_ns is not None else time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict = {}
+        self.error: Optional[str] = None
+
+    def end(self, end_ns: Optional[int] = None):
+        self.end_ns = end_ns if end_ns is not None else time.time_ns()
+        exporter.export(self)
+
+    def to_otlp(self) -> Dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in self.attributes.items()],
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        if self.error is not None:
+            span["status"] = {"code": _STATUS_ERROR, "message": self.error}
+        return span
+
+
+def _otlp_value(value) -> Dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+# 현재 스팬들 (보통 하나, 배치 안에서는 샘플링된 요청 수만큼)
+_current: contextvars.ContextVar[Tuple[SpanContext, ...]] = contextvars.ContextVar("trace_spans", default=())
+
+
+class _NoopScope:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set_attribute(self, key: str, value):
+        pass
+
+
+_NOOP = _NoopScope()
+
+
+class _SpanScope:
+    """with 블록 동안 부모마다 자식 스팬 하나씩 열고 현재 스팬으로 둠"""
+
+    def __init__(self, name: str, parents: Sequence[SpanContext], attributes: Dict, kind: int = 1):
+        self.spans = tuple(Span(name, parent, kind) for parent in parents)
+        for span in self.spans:
+            span.attributes.update(attributes)
+        self._token = None
+
+    def set_attribute(self, key: str, value):
+        for span in self.spans:
+            span.attributes[key] = value
+
+    def __enter__(self):
+        self._token = _current.set(self.spans)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current.reset(self._token)
+        for span in self.spans:
+            if exc is not None:
+                span.error = f"{exc_type.__name__}: {exc}"
+            span.end()
+        return False
+
+
+def span(name: str, **attributes):
+    """현재 트레이스 아래 자식 스팬 (샘플링되지 않았으면 아무것도 하지 않는 공유 객체)"""
+    parents = _current.get()
+    if not parents:
+        return _NOOP
+    return _SpanScope(name, parents, attributes)
+
+
+def current() -> Tuple[SpanContext, ...]:
+    return _current.get()
+
+
+def attach(parents: Sequence[SpanContext]):
+    """다른 태스크/스레드에서 이어갈 부모 설정 (contextvars.copy_context().run(attach, ...)용)"""
+    _current.set(tuple(parents))
+
+
+def traceparents() -> List[str]:
+    return [parent.traceparent for parent in _current.get()]
+
+
+def remote(headers: Sequence[str]) -> Tuple[SpanContext, ...]:
+    """워커 프로세스로 넘어온 traceparent 목록 → 부모"""
+    parents = (SpanContext.parse(header)[0] for header in headers)
+    return tuple(parent for parent in parents if parent is not None)
+
+
+def record(name: str, parents: Sequence[SpanContext], start_ns: int, end_ns: int, **attributes):
+    """이미 지난 구간을 스팬으로 기록 (배치 큐 대기 등)"""
+    for parent in parents:
+        item = Span(name, parent, start_ns=start_ns)
+        item.attributes.update(attributes)
+        item.end(end_ns)
+
+
+def should_sample(parent: Optional[SpanContext], parent_sampled: bool) -> bool:
+    if parent is not None:
+        return parent_sampled
+    return random.random() < settings.TRACING_SAMPLE_RATE
+
+
+class SpanExporter:
+    """스팬을 모아 TRACING_EXPORT_INTERVAL_S마다 내보냄 (프로세스마다 백그라운드 스레드 하나, fork 후 재생성)"""
+
+    _init_lock = threading.Lock()
+
+    def __init__(self):
+        self._pid = None
+        self._lock = threading.Lock()
+        self._buffer: List[Span] = []
+        self._wakeup = threading.Event()
+
+    def _ensure_thread(self):
+        if self._pid == os.getpid():
+            return
+        with self._init_lock:
+            if self._pid == os.getpid():
+                return
+            # fork된 워커는 부모의 잠금/버퍼 상태를 물려받으므로 새로 만듦
+            self._lock = threading.Lock()
+            self._buffer = []
+            self._wakeup = threading.Event()
+            threading.Thread(target=self._loop, name="span-exporter", daemon=True).start()
+            self._pid = os.getpid()
+
+    def export(self, span: Span):
+        self._ensure_thread()
+        with self._lock:
+            self._buffer.append(span)
+            if len(self._buffer) >= 512:
+                self._wakeup.set()
+
+    def _loop(self):
+        while True:
+            self._wakeup.wait(settings.TRACING_EXPORT_INTERVAL_S)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            spans, self._buffer = self._buffer, []
+        if not spans:
+            return
+        try:
+            if settings.TRACING_EXPORTER == "otlp":
+                self._post_otlp(spans)
+            else:
+                self._write_file(spans)
+        except Exception as e:
+            logger.warning(f"Failed to export {len(spans)} spans: {e}")
+
+    @staticmethod
+    def _resource() -> Dict:
+        return {"attributes": [
+            {"key": "service.name", "value": {"stringValue": settings.TRACING_SERVICE_NAME}},
+            {"key": "process.pid", "value": {"intValue": str(os.getpid())}},
+        ]}
+
+    def _write_file(self, spans: List[Span]):
+        path = Path(settings.TRACING_FILE)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        resource = settings.TRACING_SERVICE_NAME
+        lines = "".join(
+            json.dumps({"service": resource, "pid": self._pid, **span.to_otlp()}, ensure_ascii=False) + "\n"
+            for span in spans
+        )
+        # 워커 프로세스와 같은 파일에 이어 쓰므로 한 번의 append로 씀
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+    def _post_otlp(self, spans: List[Span]):
+        body = json.dumps({"resourceSpans": [{
+            "resource": self._resource(),
+            "scopeSpans": [{"scope": {"name": "gastric-hospital"}, "spans": [span.to_otlp() for span in spans]}],
+        }]}).encode()
+        request = urllib.request.Request(
+            settings.TRACING_OTLP_ENDPOINT, data=body, headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request, timeout=5) as response:
+            response.read()
+
+
+exporter = SpanExporter()
+
+
+class TracingMiddleware:
+    """HTTP 요청 루트 스팬 (이름은 'METHOD 라우트 템플릿'), 응답 헤더 traceparent로 트레이스 ID 반환"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        header = None
+        for key, value in scope.get("headers", []):
+            if key == b"traceparent":
+                header = value.decode("latin-1")
+                break
+        parent, parent_sampled = SpanContext.parse(header)
+        if not should_sample(parent, parent_sampled):
+            await self.app(scope, receive, send)
+            return
+
+        root = Span(scope["method"], parent, kind=2)
+        root.attributes.update({"http.method": scope["method"], "http.target": scope["path"]})
+        token = _current.set((root,))
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                root.attributes["http.status_code"] = message["status"]
+                if message["status"] >= 500:
+                    root.error = f"HTTP {message['status']}"
+                message = {**message, "headers": [*message.get("headers", []), (b"traceparent", root.traceparent.encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            root.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current.reset(token)
+            route = route_template(scope)
+            root.name = f"{scope['method']} {route}"
+            root.attributes["http.route"] = route
+            root.end()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    parents = _current.get()
+    if parents:
+        spans = []
+        for parent in parents:
+            item = Span("db.query", parent, kind=3)
+            # 파라미터 값은 남기지 않음
+            item.attributes.update({"db.system": conn.dialect.name, "db.statement": statement[:2000]})
+            spans.append(item)
+        conn.info.setdefault("trace_spans", []).append(spans)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stack = conn.info.get("trace_spans")
+    if stack and _current.get():
+        for item in stack.pop():
+            item.attributes["db.rowcount"] = cursor.rowcount
+            item.end()
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    stack = conn.info.get("trace_spans") if conn is not None else None
+    if stack and _current.get():
+        for item in stack.pop():
+            item.error = str(exception_context.original_exception)
+            item.end()
+
+
+def install(engine):
+    """SQL 문장마다 db.query 스팬 (현재 요청이 샘플링됐을 때만)"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def enabled() -> bool:
+    return settings.TRACING_SAMPLE_RATE > 0
@@ -3,20 +3,45 @@ FastAPI Main Application
 위암 분류 병원 관리 시스템 - Phase 2
 """
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
+from app.core.database import engine
+from app.core.metrics import MetricWriter, MetricsMiddleware, collect_db_pool, collect_http
+from app.core.pagination import EXPOSED_HEADERS
+from app.core.query_profiler import QueryProfilerMiddleware
+from app.core import tracing
 from app.api.api_v1.api import api_router
+from app.services.inference_metrics import collect_inference_metrics
+from app.services.ingestion import UploadLimitMiddleware
+from app.services.model_state import DISABLED, model_state
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """모델은 백그라운드에서 로드 (준비 전에도 /health와 CRUD 라우트는 바로 응답), 종료 시 추론 워커 정리"""
+    model_state.start_loading()
+    try:
+        yield
+    finally:
+        model_state.shutdown()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     docs_url=f"{settings.API_V1_STR}/docs",
-    redoc_url=f"{settings.API_V1_STR}/redoc"
+    redoc_url=f"{settings.API_V1_STR}/redoc",
+    lifespan=lifespan,
 )
 
+# 업로드 본문 크기 상한 (폼 파싱 전에 413, CORS 안쪽이라 브라우저도 응답을 읽음)
+app.add_middleware(UploadLimitMiddleware)
+
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -24,8 +49,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=EXPOSED_HEADERS,  # 목록 API 다음 페이지 커서/대략적인 전체 수
 )
 
+# 요청별 SQL 문장 수/시간, N+1 의심 경고
+if settings.DB_QUERY_PROFILING:
+    app.add_middleware(QueryProfilerMiddleware)
+
+# 라우트별 지연/요청 수 (/metrics)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# 요청 루트 스팬 (가장 바깥, 샘플링 비율이 0이면 붙이지 않음)
+if tracing.enabled():
+    app.add_middleware(tracing.TracingMiddleware)
+
 # API 라우터 등록
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -45,3 +83,30 @@ def root():
 def health_check():
     """헬스 체크"""
     return {"status": "ok"}
+
+
+@app.get("/health/live")
+def liveness_check():
+    """라이브니스: 프로세스가 요청을 받을 수 있으면 200 (모델 상태와 무관)"""
+    return {"status": "ok", "model": model_state.status}
+
+
+@app.get("/health/ready")
+def readiness_check(response: Response):
+    """레디니스: 모델 로드가 끝나야 200, 로드 중/실패면 503 (AI_ENABLED=false면 항상 200)"""
+    ready = model_state.ready or model_state.status == DISABLED
+    if not ready:
+        response.status_code = 503
+    return {"status": "ready" if ready else "not_ready", "model": model_state.get_stats()}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus 스크레이프: HTTP 라우트 지연, DB 커넥션 풀, 추론 큐/배치/단계별 지연/결과 캐시"""
+    if not settings.METRICS_ENABLED:
+        return Response(status_code=404)
+    writer = MetricWriter()
+    collect_http(writer)
+    collect_db_pool(writer, engine)
+    collect_inference_metrics(writer)
+    return Response(writer.text(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -8,6 +8,8 @@ from app.models.user import User
 from app.models.patient import Patient
 from app.models.visit import Visit
 from app.models.diagnosis import Diagnosis
+from app.models.diagnosis_stats import DiagnosisDailyStats
+from app.models.visit_stats import VisitDailyStats
 
 # Alembic autogenerate를 위한 export
-__all__ = ["Base", "User", "Patient", "Visit", "Diagnosis"]
+__all__ = ["Base", "User", "Patient", "Visit", "Diagnosis", "DiagnosisDailyStats", "VisitDailyStats"]
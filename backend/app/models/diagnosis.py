@@ -3,7 +3,7 @@ Diagnosis Model (AI 진단 결과)
 Multi-Task Learning 지원: Classification + Segmentation
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, JSON, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -12,6 +12,14 @@ from app.models.base import Base
 
 class Diagnosis(Base):
     __tablename__ = "diagnoses"
+    # 목록 API 필터 + 최신순 키셋 (created_at DESC, id DESC) 정렬, 진료별 진단 조회에 맞춘 인덱스
+    __table_args__ = (
+        Index("ix_diagnoses_created_at_id", "created_at", "id"),
+        Index("ix_diagnoses_visit_id", "visit_id"),
+        Index("ix_diagnoses_is_reviewed_created_at", "is_reviewed", "created_at", "id"),
+        Index("ix_diagnoses_prediction_created_at", "prediction", "created_at", "id"),
+        Index("ix_diagnoses_reviewed_by", "reviewed_by"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     visit_id = Column(Integer, ForeignKey("visits.id", ondelete="CASCADE"), nullable=False)
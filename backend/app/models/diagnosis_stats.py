@@ -0,0 +1,137 @@
+"""
+DiagnosisDailyStats Model (대시보드용 진단 일별 집계)
+(진단일, 분류, 담당 의사, 리뷰 상태)별 건수/합계를 미리 모아둔 롤업 테이블
+
+Diagnosis 행이 ORM으로 추가/수정/삭제될 때 같은 트랜잭션에서 증분 반영 (아래 매퍼 이벤트)
+- 진료 삭제로 cascade되는 진단도 ORM이 하나씩 지우므로 반영됨
+- 진료의 담당 의사가 바뀌면 visit_stats의 Visit 이벤트가 rekey_visit으로 옮김
+- query().delete() 같은 벌크 연산이나 ORM 밖의 SQL은 반영되지 않음 → backfill_stats.py로 재계산
+"""
+
+from sqlalchemy import Column, Integer, String, Float, Date, Index, event, inspect, select
+
+from app.models.base import Base
+from app.models.diagnosis import Diagnosis
+from app.models.rollup import apply_delta as _apply_delta, changed_values, track_old_values
+from app.models.visit import Visit
+
+# tumor_ratio 분포 구간 수 (0.1 간격, 1.0은 마지막 구간에 포함)
+TUMOR_RATIO_BINS = 10
+
+
+class DiagnosisDailyStats(Base):
+    __tablename__ = "diagnosis_daily_stats"
+    __table_args__ = (
+        Index("ix_diagnosis_daily_stats_doctor_id_day", "doctor_id", "day"),
+    )
+
+    # 집계 키 (진단일은 created_at의 UTC 날짜)
+    day = Column(Date, primary_key=True)
+    prediction = Column(String(50), primary_key=True)
+    doctor_id = Column(Integer, primary_key=True)
+    is_reviewed = Column(Integer, primary_key=True)  # 0: 미검토, 1: 검토 완료
+
+    prediction_kr = Column(String(50))  # 표시용 한국어 진단명
+
+    # 집계 값 (평균은 합계 / 건수로 계산)
+    count = Column(Integer, nullable=False, default=0)
+    confidence_sum = Column(Float, nullable=False, default=0.0)
+    tumor_ratio_sum = Column(Float, nullable=False, default=0.0)
+    tumor_ratio_count = Column(Integer, nullable=False, default=0)  # tumor_ratio가 있는 진단 수 (classify 모드 제외)
+
+    # tumor_ratio 구간별 진단 수 (bin_i: i/10 <= tumor_ratio < (i+1)/10)
+    tumor_ratio_bin_0 = Column(Integer, nullable=False, default=0, server_default="0")
+    tumor_ratio_bin_1 = Column(Integer, nullable=False, default=0, server_default="0")
+    tumor_ratio_bin_2 = Column(Integer, nullable=False, default=0, server_default="0")
+    tumor_ratio_bin_3 = Column(Integer, nullable=False, default=0, server_default="0")
+    tumor_ratio_bin_4 = Column(Integer, nullable=False, default=0, server_default="0")
+    tumor_ratio_bin_5 = Column(Integer, nullable=False, default=0, server_default="0")
+    tumor_ratio_bin_6 = Column(Integer, nullable=False, default=0, server_default="0")
+    tumor_ratio_bin_7 = Column(Integer, nullable=False, default=0, server_default="0")
+    tumor_ratio_bin_8 = Column(Integer, nullable=False, default=0, server_default="0")
+    tumor_ratio_bin_9 = Column(Integer, nullable=False, default=0, server_default="0")
+
+    def __repr__(self):
+        return f"<DiagnosisDailyStats(day={self.day}, prediction={self.prediction}, count={self.count})>"
+
+
+KEY_COLUMNS = ("day", "prediction", "doctor_id", "is_reviewed")
+TUMOR_RATIO_BIN_COLUMNS = tuple(f"tumor_ratio_bin_{i}" for i in range(TUMOR_RATIO_BINS))
+SUM_COLUMNS = ("count", "confidence_sum", "tumor_ratio_sum", "tumor_ratio_count") + TUMOR_RATIO_BIN_COLUMNS
+
+# 롤업 키/값에 영향을 주는 Diagnosis 속성 (이 중 하나라도 바뀌면 이전 값 -1, 새 값 +1)
+_TRACKED = ("created_at", "prediction", "prediction_kr", "visit_id", "is_reviewed", "confidence", "tumor_ratio")
+
+
+track_old_values(Diagnosis, _TRACKED)
+
+
+def tumor_ratio_bin(tumor_ratio: float) -> int:
+    """tumor_ratio가 속한 분포 구간 번호 (0 ~ TUMOR_RATIO_BINS - 1, 재계산 SQL과 같은 경계 비교)"""
+    return sum(tumor_ratio >= i / TUMOR_RATIO_BINS for i in range(1, TUMOR_RATIO_BINS))
+
+
+def _doctor_id(connection, target, visit_id):
+    """flush 중에는 lazy load를 하지 않고, 이미 로드된 visit이 있으면 그 값을 씀"""
+    visit = inspect(target).attrs.visit.loaded_value
+    if isinstance(visit, Visit) and visit.id == visit_id:
+        return visit.doctor_id
+    return connection.execute(select(Visit.doctor_id).where(Visit.id == visit_id)).scalar()
+
+
+def _row(values: dict, doctor_id, sign: int) -> dict:
+    tumor_ratio = values["tumor_ratio"]
+    row = {
+        "day": values["created_at"].date(),
+        "prediction": values["prediction"],
+        "doctor_id": doctor_id,
+        "is_reviewed": values["is_reviewed"] or 0,
+        "prediction_kr": values["prediction_kr"],
+        "count": sign,
+        "confidence_sum": sign * (values["confidence"] or 0.0),
+        "tumor_ratio_sum": sign * (tumor_ratio or 0.0),
+        "tumor_ratio_count": sign if tumor_ratio is not None else 0,
+        **{name: 0 for name in TUMOR_RATIO_BIN_COLUMNS},
+    }
+    if tumor_ratio is not None:
+        row[TUMOR_RATIO_BIN_COLUMNS[tumor_ratio_bin(tumor_ratio)]] = sign
+    return row
+
+
+def apply_delta(connection, row: dict):
+    """키가 같은 롤업 행에 row의 값을 더함 (없으면 생성)"""
+    _apply_delta(connection, DiagnosisDailyStats.__table__, row, KEY_COLUMNS, SUM_COLUMNS)
+
+
+def rekey_visit(connection, visit_id, old_doctor_id, new_doctor_id):
+    """진료의 담당 의사가 바뀌면 그 진료의 진단 집계를 새 의사 키로 옮김"""
+    columns = [Diagnosis.__table__.c[name] for name in _TRACKED]
+    for values in connection.execute(select(*columns).where(Diagnosis.visit_id == visit_id)).mappings():
+        apply_delta(connection, _row(values, old_doctor_id, -1))
+        apply_delta(connection, _row(values, new_doctor_id, 1))
+
+
+def _values(target) -> dict:
+    return {name: getattr(target, name) for name in _TRACKED}
+
+
+@event.listens_for(Diagnosis, "after_insert")
+def _after_insert(mapper, connection, target):
+    values = _values(target)
+    apply_delta(connection, _row(values, _doctor_id(connection, target, values["visit_id"]), 1))
+
+
+@event.listens_for(Diagnosis, "after_delete")
+def _after_delete(mapper, connection, target):
+    values = _values(target)
+    apply_delta(connection, _row(values, _doctor_id(connection, target, values["visit_id"]), -1))
+
+
+@event.listens_for(Diagnosis, "after_update")
+def _after_update(mapper, connection, target):
+    changed = changed_values(target, _TRACKED)
+    if changed is None:
+        return
+    old, new = changed
+    apply_delta(connection, _row(old, _doctor_id(connection, target, old["visit_id"]), -1))
+    apply_delta(connection, _row(new, _doctor_id(connection, target, new["visit_id"]), 1))
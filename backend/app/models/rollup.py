@@ -0,0 +1,67 @@
+"""
+롤업(집계) 테이블 공통 헬퍼
+매퍼 이벤트 안에서 (키 컬럼) 행의 합계 컬럼에 증감분을 더함 (diagnosis_stats, visit_stats)
+"""
+
+from typing import Sequence
+
+from sqlalchemy import event, inspect, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+
+def apply_delta(connection, table, row: dict, key_columns: Sequence[str], sum_columns: Sequence[str]):
+    """키가 같은 롤업 행에 row의 합계 값을 더함 (없으면 생성), 나머지 컬럼은 row 값으로 덮어씀"""
+    dialect = connection.dialect.name
+    replace = [name for name in row if name not in key_columns and name not in sum_columns]
+    if dialect == "mysql":
+        stmt = mysql.insert(table).values(**row)
+        stmt = stmt.on_duplicate_key_update(
+            **{name: stmt.inserted[name] for name in replace},
+            **{name: table.c[name] + stmt.inserted[name] for name in sum_columns},
+        )
+    elif dialect in ("sqlite", "postgresql"):
+        insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = insert(table).values(**row)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key_columns),
+            set_={**{name: stmt.excluded[name] for name in replace},
+                  **{name: table.c[name] + stmt.excluded[name] for name in sum_columns}},
+        )
+    else:
+        key = [table.c[name] == row[name] for name in key_columns]
+        result = connection.execute(
+            update(table).where(*key).values(**{name: table.c[name] + row[name] for name in sum_columns})
+        )
+        if result.rowcount:
+            return
+        stmt = table.insert().values(**row)
+    connection.execute(stmt)
+
+
+def _keep_value(target, value, oldvalue, initiator):
+    return value
+
+
+def track_old_values(model, names: Sequence[str]):
+    """
+    만료된 객체에 값을 대입해도 이전 값을 읽어두도록 함 (active_history)
+    after_update에서 이전 집계 키를 알아야 하는 속성에 등록
+    """
+    for name in names:
+        event.listen(getattr(model, name), "set", _keep_value, active_history=True, retval=True)
+
+
+def changed_values(target, names: Sequence[str]):
+    """
+    flush 중인 객체에서 names 중 바뀐 속성이 있으면 (이전 값, 현재 값) dict 쌍, 없으면 None
+    """
+    state = inspect(target)
+    old = {}
+    for name in names:
+        history = state.attrs[name].history
+        if history.deleted:
+            old[name] = history.deleted[0]
+    if not old:
+        return None
+    new = {name: getattr(target, name) for name in names}
+    return {**new, **old}, new
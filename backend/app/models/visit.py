@@ -2,7 +2,7 @@
 Visit Model (진료 기록)
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -11,6 +11,13 @@ from app.models.base import Base
 
 class Visit(Base):
     __tablename__ = "visits"
+    # 목록 API 필터 + 최신순 키셋 (visit_date DESC, id DESC) 정렬에 맞춘 복합 인덱스
+    __table_args__ = (
+        Index("ix_visits_visit_date_id", "visit_date", "id"),
+        Index("ix_visits_patient_id_visit_date", "patient_id", "visit_date", "id"),
+        Index("ix_visits_doctor_id_visit_date", "doctor_id", "visit_date", "id"),
+        Index("ix_visits_status_visit_date", "status", "visit_date", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     patient_id = Column(Integer, ForeignKey("patients.id", ondelete="CASCADE"), nullable=False)
@@ -34,12 +41,12 @@ class Visit(Base):
     patient = relationship("Patient", back_populates="visits")
     doctor = relationship("User", foreign_keys=[doctor_id])
     
-    # ⭐ 수정: lazy='dynamic'으로 변경하여 동적 로딩
+    # 목록/상세 조회에서 selectinload로 미리 읽을 수 있도록 기본 lazy 로딩 (id 순 정렬)
     diagnoses = relationship(
         "Diagnosis",
         back_populates="visit",
         cascade="all, delete-orphan",
-        lazy="dynamic"
+        order_by="Diagnosis.id"
     )
     
     def __repr__(self):
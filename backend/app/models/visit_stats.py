@@ -0,0 +1,85 @@
+"""
+VisitDailyStats Model (진료 일별 집계)
+(진료일, 담당 의사, 상태)별 진료 건수를 미리 모아둔 롤업 테이블 (의사별 진료 건수 / 진료 추이 통계용)
+
+Visit 행이 ORM으로 추가/수정/삭제될 때 같은 트랜잭션에서 증분 반영 (아래 매퍼 이벤트)
+- 환자 삭제로 cascade되는 진료도 ORM이 하나씩 지우므로 반영됨
+- 벌크 연산이나 ORM 밖의 SQL은 반영되지 않음 → backfill_stats.py로 재계산
+"""
+
+from sqlalchemy import Column, Integer, String, Date, Index, event
+
+from app.models.base import Base
+from app.models.diagnosis_stats import rekey_visit
+from app.models.rollup import apply_delta as _apply_delta, changed_values, track_old_values
+from app.models.visit import Visit
+
+# status가 비어 있는 진료를 집계할 때 쓰는 값 (Visit.status 기본값)
+DEFAULT_STATUS = "PENDING"
+
+
+class VisitDailyStats(Base):
+    __tablename__ = "visit_daily_stats"
+    __table_args__ = (
+        Index("ix_visit_daily_stats_doctor_id_day", "doctor_id", "day"),
+    )
+
+    # 집계 키 (진료일은 visit_date의 날짜)
+    day = Column(Date, primary_key=True)
+    doctor_id = Column(Integer, primary_key=True)
+    status = Column(String(50), primary_key=True)  # PENDING, COMPLETED, CANCELLED
+
+    count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<VisitDailyStats(day={self.day}, doctor_id={self.doctor_id}, status={self.status}, count={self.count})>"
+
+
+KEY_COLUMNS = ("day", "doctor_id", "status")
+SUM_COLUMNS = ("count",)
+
+# 롤업 키에 영향을 주는 Visit 속성
+_TRACKED = ("visit_date", "doctor_id", "status")
+
+
+track_old_values(Visit, _TRACKED)
+
+
+def _row(values: dict, sign: int) -> dict:
+    return {
+        "day": values["visit_date"].date(),
+        "doctor_id": values["doctor_id"],
+        "status": values["status"] or DEFAULT_STATUS,
+        "count": sign,
+    }
+
+
+def apply_delta(connection, row: dict):
+    """키가 같은 롤업 행에 row의 건수를 더함 (없으면 생성)"""
+    _apply_delta(connection, VisitDailyStats.__table__, row, KEY_COLUMNS, SUM_COLUMNS)
+
+
+def _values(target) -> dict:
+    return {name: getattr(target, name) for name in _TRACKED}
+
+
+@event.listens_for(Visit, "after_insert")
+def _after_insert(mapper, connection, target):
+    apply_delta(connection, _row(_values(target), 1))
+
+
+@event.listens_for(Visit, "after_delete")
+def _after_delete(mapper, connection, target):
+    apply_delta(connection, _row(_values(target), -1))
+
+
+@event.listens_for(Visit, "after_update")
+def _after_update(mapper, connection, target):
+    changed = changed_values(target, _TRACKED)
+    if changed is None:
+        return
+    old, new = changed
+    apply_delta(connection, _row(old, -1))
+    apply_delta(connection, _row(new, 1))
+    if old["doctor_id"] != new["doctor_id"]:
+        rekey_visit(connection, target.id, old["doctor_id"], new["doctor_id"])
@@ -3,4 +3,4 @@ from app.schemas.token import Token, TokenData
 from app.schemas.patient import Patient, PatientCreate, PatientUpdate
 from app.schemas.visit import Visit, VisitCreate, VisitUpdate
 from app.schemas.diagnosis import Diagnosis, DiagnosisCreate
-from app.schemas.ai import PredictionResponse
+from app.schemas.ai import InferenceMode, PredictionResponse
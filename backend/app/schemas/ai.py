@@ -1,12 +1,36 @@
-from pydantic import BaseModel
-from typing import Dict, List, Optional
+from enum import Enum
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+
+
+class InferenceMode(str, Enum):
+    CLASSIFY = "classify"  # 인코더 + 분류 헤드만 (트리아지, 재확인)
+    SEGMENT = "segment"  # 인코더 + UNet 디코더만
+    FULL = "full"  # 분류 + 세그멘테이션
+
+
+class InferencePriority(str, Enum):
+    URGENT = "urgent"  # 응급/대면 진료 (배칭 대기 없이 바로 실행, 항상 먼저)
+    ROUTINE = "routine"  # 일반 진료 (기본값)
+    BATCH = "batch"  # 대량 업로드, 재분석 (남는 처리량으로 실행)
+
+
+class ClinicalDiagnosisForm(BaseModel):
+    """/clinical/diagnose 폼 필드 (이미지 파일 제외, 본문은 승인 제어 뒤에 파싱)"""
+    patient_id: int = Field(..., description="환자 ID")
+    chief_complaint: str = Field(..., description="주 증상")
+    mode: InferenceMode = Field(InferenceMode.FULL, description="full / classify (세그멘테이션 생략)")
+    tiled: bool = Field(False, description="고해상도 슬라이드 타일 추론")
+
 
 class PredictionResponse(BaseModel):
-    prediction: str
-    prediction_kr: str
-    confidence: float
-    probabilities: Dict[str, float]
-    probabilities_kr: Dict[str, float]
-    raw_logits: List[float]
+    prediction: Optional[str] = None
+    prediction_kr: Optional[str] = None
+    confidence: Optional[float] = None
+    probabilities: Optional[Dict[str, float]] = None
+    probabilities_kr: Optional[Dict[str, float]] = None
+    raw_logits: Optional[List[float]] = None
+    segmentation: Optional[Dict[str, Any]] = None
     processing_time: float
-    model_info: Dict[str, str]
+    model_info: Dict[str, Any]
+    timings: Optional[Dict[str, float]] = None  # 단계별 소요 시간 (ms, X-Debug-Timings 헤더가 있을 때만)
@@ -0,0 +1,11 @@
+"""
+통계 API 스키마
+"""
+
+from enum import Enum
+
+
+class Bucket(str, Enum):
+    DAY = "day"
+    WEEK = "week"  # 월요일 시작
+    MONTH = "month"
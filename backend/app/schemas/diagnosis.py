@@ -21,6 +21,7 @@ class Diagnosis(DiagnosisBase):
     model_type: str
     processing_time: Optional[float] = None
     device: Optional[str] = None
+    model_version: Optional[str] = None
     is_reviewed: int
     reviewed_by_id: Optional[int] = None
     created_at: datetime
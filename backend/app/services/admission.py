@@ -0,0 +1,247 @@
+"""
+AI 엔드포인트 승인 제어 (admission control)
+동시에 처리하는 AI 요청 수를 제한하고, 넘치는 요청은 짧은 대기열에서 기다리게 하거나 바로 거절
+
+- 슬롯: 슬롯을 얻은 뒤에 업로드 본문을 읽고(ingestion.upload_form 의존성) 디코딩 → 추론 → 응답까지 점유
+  (동시 업로드 버퍼/텐서 메모리 상한, 라우트에서 upload_form보다 먼저 선언해야 함)
+- 거절(429/503)되거나 대기 중 연결이 끊긴 요청은 업로드 본문을 읽지 않음
+- 대기열이 가득 차면 429, 대기 시간이 AI_QUEUE_TIMEOUT_S를 넘으면 503 (둘 다 Retry-After)
+- 대기 중이거나 추론을 기다리는 동안 클라이언트 연결이 끊기면 바로 취소
+  (배치 큐에 들어간 항목은 실행 전이면 건너뜀)
+- urgent 요청은 슬롯이 모두 차 있어도 예약 슬롯(AI_URGENT_RESERVED_SLOTS)으로 바로 들어감
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Awaitable, Dict, Optional, TypeVar
+
+from fastapi import HTTPException, Query, Request
+
+from app.core.config import settings
+from app.schemas.ai import InferencePriority
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DISCONNECT_POLL_S = 0.25
+# nginx 관례: 응답 전에 클라이언트가 연결을 끊음
+CLIENT_CLOSED_REQUEST = 499
+
+
+class Overloaded(Exception):
+    """슬롯을 얻지 못함 (429: 대기열 가득 참, 503: 대기 시간 초과)"""
+
+    def __init__(self, status_code: int, message: str, retry_after: int):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class ClientDisconnected(Exception):
+    pass
+
+
+async def _watch_disconnect(request: Request):
+    while not await request.is_disconnected():
+        await asyncio.sleep(DISCONNECT_POLL_S)
+
+
+async def until_disconnected(request: Request, awaitable: Awaitable[T]) -> T:
+    """awaitable을 기다리다가 클라이언트 연결이 끊기면 취소하고 ClientDisconnected"""
+    task = asyncio.ensure_future(awaitable)
+    watcher = asyncio.ensure_future(_watch_disconnect(request))
+    try:
+        await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+    finally:
+        watcher.cancel()
+    if not task.done():
+        task.cancel()
+        raise ClientDisconnected()
+    return task.result()
+
+
+class AdmissionController:
+    """동시 처리 슬롯 + 길이 제한 대기열"""
+
+    def __init__(
+        self,
+        max_concurrent: int = 16,
+        max_queued: int = 32,
+        queue_timeout_s: float = 10.0,
+        urgent_reserved: int = 2,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max(0, max_queued)
+        self.queue_timeout = queue_timeout_s
+        self.urgent_reserved = max(0, urgent_reserved)
+        self._semaphore: Optional[asyncio.Semaphore] = None  # 첫 사용 시 생성 (import 시점에는 이벤트 루프가 없음)
+        self.in_flight = 0
+        self.urgent_in_flight = 0
+        self.queued = 0
+
+        # 튜닝용 카운터
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.cancelled = 0
+        self.max_queued_seen = 0
+        self._hold_ewma = 1.0  # 슬롯 점유 시간 지수 평균 (Retry-After 추정용)
+        self._waits = deque(maxlen=1024)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_concurrent > 0
+
+    def _slots(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(max(1, self.max_concurrent))
+        return self._semaphore
+
+    def retry_after(self) -> int:
+        """대기열이 한 바퀴 도는 데 걸릴 시간 추정 (초)"""
+        rounds = (self.queued + 1) / max(1, self.max_concurrent)
+        return max(1, math.ceil(self._hold_ewma * rounds))
+
+    async def acquire(self, request: Optional[Request] = None, priority: str = "routine") -> bool:
+        """슬롯 획득 (반환값: urgent 예약 슬롯을 썼는지, release에 그대로 넘김)"""
+        if not self.enabled:
+            return False
+        start = time.perf_counter()
+        slots = self._slots()
+        if priority == "urgent" and slots.locked() and self.urgent_in_flight < self.urgent_reserved:
+            self.urgent_in_flight += 1
+            self.in_flight += 1
+            self.admitted += 1
+            self._waits.append(0.0)
+            return True
+        if self.queued >= self.max_queued and slots.locked():
+            self.rejected_queue_full += 1
+            raise Overloaded(429, "AI 요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도하세요.", self.retry_after())
+
+        self.queued += 1
+        self.max_queued_seen = max(self.max_queued_seen, self.queued)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.queue_timeout
+        acquire = asyncio.ensure_future(slots.acquire())
+        try:
+            while not acquire.done():
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    self.rejected_timeout += 1
+                    raise Overloaded(503, "AI 요청 대기 시간이 초과되었습니다.", self.retry_after())
+                await asyncio.wait({acquire}, timeout=min(DISCONNECT_POLL_S, remaining))
+                if not acquire.done() and request is not None and await request.is_disconnected():
+                    self.cancelled += 1
+                    raise ClientDisconnected()
+        except BaseException:
+            # 예외와 동시에 슬롯을 얻었으면 돌려줌
+            if acquire.done() and not acquire.cancelled() and acquire.exception() is None:
+                slots.release()
+            else:
+                acquire.cancel()
+            raise
+        finally:
+            self.queued -= 1
+
+        self.in_flight += 1
+        self.admitted += 1
+        self._waits.append(time.perf_counter() - start)
+        return False
+
+    def release(self, held_seconds: float, reserved: bool = False):
+        if not self.enabled:
+            return
+        self.in_flight -= 1
+        self._hold_ewma = 0.8 * self._hold_ewma + 0.2 * held_seconds
+        if reserved:
+            self.urgent_in_flight -= 1
+        else:
+            self._slots().release()
+
+    async def guard(self, request: Request, awaitable: Awaitable[T]) -> T:
+        """추론 대기 중 클라이언트가 끊기면 취소하고 499"""
+        try:
+            return await until_disconnected(request, awaitable)
+        except ClientDisconnected:
+            self.cancelled += 1
+            raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail="Client disconnected")
+
+    def _wait_percentile(self, q: float) -> float:
+        if not self._waits:
+            return 0.0
+        waits = sorted(self._waits)
+        return waits[min(len(waits) - 1, int(q * len(waits)))] * 1000.0
+
+    def get_stats(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "max_concurrent": self.max_concurrent,
+            "max_queued": self.max_queued,
+            "queue_timeout_s": self.queue_timeout,
+            "in_flight": self.in_flight,
+            "urgent_reserved": self.urgent_reserved,
+            "urgent_in_flight": self.urgent_in_flight,
+            "queued": self.queued,
+            "max_queued_seen": self.max_queued_seen,
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+            "cancelled": self.cancelled,
+            "wait_p50_ms": self._wait_percentile(0.5),
+            "wait_p99_ms": self._wait_percentile(0.99),
+            "avg_hold_s": round(self._hold_ewma, 3),
+        }
+
+
+admission = AdmissionController(
+    max_concurrent=settings.AI_MAX_CONCURRENT_REQUESTS,
+    max_queued=settings.AI_MAX_QUEUED_REQUESTS,
+    queue_timeout_s=settings.AI_QUEUE_TIMEOUT_S,
+    urgent_reserved=settings.AI_URGENT_RESERVED_SLOTS,
+)
+
+
+async def _acquire(request: Request, priority: str) -> bool:
+    """슬롯 획득 (넘치면 429/503, 대기 중 연결이 끊기면 499), 반환값은 release에 넘길 예약 슬롯 여부"""
+    try:
+        return await admission.acquire(request, priority)
+    except Overloaded as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except ClientDisconnected:
+        raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail="Client disconnected")
+
+
+async def admit_inference(request: Request):
+    """
+    AI 라우트 의존성: 슬롯을 얻을 때까지 대기 (넘치면 429/503), 응답 후(에러 응답 포함) 바로 반환
+    본문 파싱(upload_form)보다 먼저 실행되므로 거절된 요청은 업로드를 읽지 않음
+    """
+    reserved = await _acquire(request, "routine")
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        admission.release(time.perf_counter() - start, reserved)
+
+
+async def admit_by_priority(
+    request: Request,
+    priority: InferencePriority = Query(InferencePriority.ROUTINE, description="urgent / routine / batch"),
+):
+    """
+    쿼리의 priority를 반영하는 승인 의존성 (urgent는 예약 슬롯 사용 가능), priority를 그대로 돌려줌
+    폼 필드로 받으면 FastAPI가 의존성보다 먼저 본문을 파싱하므로 쿼리로 받음
+    """
+    reserved = await _acquire(request, priority.value)
+    start = time.perf_counter()
+    try:
+        yield priority
+    finally:
+        admission.release(time.perf_counter() - start, reserved)
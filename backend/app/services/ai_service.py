@@ -167,28 +167,34 @@ segmentation_models_pytorch (smp) 기반
 import torch
 import torch.nn as nn
 import segmentation_models_pytorch as smp
-from torchvision import transforms
 from PIL import Image
 import numpy as np
-import io
-import base64
+import hashlib
 import logging
+import os
 from pathlib import Path
-from typing import Dict, Union
+from typing import Dict, List, Optional, Tuple
 import time
 
 from app.core.config import settings
+from app.services.backends import ModelOutput, create_backend
+from app.services.checkpoint import load_checkpoint, resolve_checkpoint
+from app.services.ingestion import ImageInput, decode_image
+from app.services.preprocessing import Preprocessor, softmax
+from app.services.profiling import StageTimer, sampled_trace, should_profile, stage_profiler
+from app.services.rendering import build_palette, render_segmentation, to_base64
+from app.services.seg_analytics import analyze_segmentation
+from app.services.tiling import TiledInference
 
 logger = logging.getLogger(__name__)
 
-
 class GastricMTLModel(nn.Module):
-    def __init__(self, n_seg_classes=5, n_cls_classes=4):
+    def __init__(self, n_seg_classes=5, n_cls_classes=4, encoder_weights="imagenet"):
         super().__init__()
-        # 공유 인코더 및 세그먼테이션 디코더
+        # 공유 인코더 및 세그먼테이션 디코더 (서빙 시에는 encoder_weights=None: 체크포인트로 덮어씀)
         self.unet = smp.Unet(
             encoder_name="resnet50",
-            encoder_weights="imagenet",
+            encoder_weights=encoder_weights,
             in_channels=3,
             classes=n_seg_classes
         )
@@ -232,6 +238,7 @@ class MTLAIService:
     
     CLASS_NAMES = ["STDI", "STNT", "STIN", "STMX"]
     CLASS_NAMES_KR = ["위샘암종", "위샘종양", "위샘내", "위샘혼합"]
+    MODES = ("classify", "segment", "full")
     SEG_CLASS_NAMES = ["Background", "Tumor", "Stroma", "Normal", "Immune"]
     SEG_CLASS_NAMES_KR = ["배경", "종양", "기질", "정상", "면역세포"]
     SEG_COLORS = {
@@ -240,153 +247,391 @@ class MTLAIService:
     }
     
     def __init__(self, model_path: str = None):
-        self.model_path = Path(model_path or settings.AI_MODEL_PATH)
+        self.model_path = resolve_checkpoint(Path(model_path or settings.AI_MODEL_PATH))
         self.device = torch.device(settings.AI_DEVICE if torch.cuda.is_available() else "cpu")
         self.model = None
-        self.transform = transforms.Compose([
-            transforms.Resize((512, 512)),
-            transforms.ToTensor(),
-            transforms.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225])
-        ])
+        self.model_version = None
+        self.load_report = None
+        self.backend = None
+        self.backend_parity = None
+        self.worker_pool = None
+        self.seg_palette = build_palette(self.SEG_COLORS)
+        self.seg_output_format = settings.AI_SEG_OUTPUT_FORMAT
+        self.tiler = TiledInference(
+            self,
+            tile_size=512,
+            overlap=settings.AI_TILE_OVERLAP,
+            batch_size=settings.AI_TILE_BATCH_SIZE,
+            min_tissue=settings.AI_TILE_MIN_TISSUE,
+            tissue_saturation=settings.AI_TILE_TISSUE_SATURATION,
+            preview_size=settings.AI_TILE_PREVIEW_SIZE,
+        )
+        # 리사이즈는 _resize에서 한 번만 하고 오버레이에서도 재사용
+        self.channels_last = settings.AI_CHANNELS_LAST
+        self.preprocess = Preprocessor(size=512, channels_last=self.channels_last)
+        self.torch_threads = self._configure_threads()
         self._load_model()
     
     def _load_model(self):
-        print("DEBUG: [1/5] _load_model 진입")
+        """사전학습 가중치 없이 모델을 만들고 체크포인트를 그대로 연결"""
         if not self.model_path.exists():
-            print(f"DEBUG: [ERR] 모델 파일 없음: {self.model_path}")
             raise FileNotFoundError(f"Model file not found: {self.model_path}")
         try:
-            print("DEBUG: [2/5] GastricMTLModel 객체 생성 중...")
-            self.model = GastricMTLModel(n_seg_classes=5, n_cls_classes=4)
-
-            print(f"DEBUG: [3/5] 가중치 파일 로드 시작 (장치: {self.device})...")
-            state_dict = torch.load(self.model_path, map_location=self.device, weights_only=False)
-
-            print("DEBUG: [4/5] state_dict 정제 및 주입 중...")
-            # 최종 로드
-            missing_keys, unexpected_keys = self.model.load_state_dict(state_dict, strict=False)
-
-            print(f"⚠️ Missing keys: {len(missing_keys)}")
-            print(f"⚠️ Unexpected keys: {len(unexpected_keys)}")
-
-                
-            print("DEBUG: [5/5] 모델을 디바이스로 이동 및 eval 모드 전환")
+            self.model = GastricMTLModel(n_seg_classes=5, n_cls_classes=4, encoder_weights=None)
+            self.load_report = load_checkpoint(self.model, self.model_path)
             self.model.to(self.device)
+            if self.channels_last:
+                self.model.to(memory_format=torch.channels_last)
             self.model.eval()
-            print("✅✅✅ 모든 로드 과정 완료! ✅✅✅")
-            logger.info(f"✅ MTL Model loaded: {self.model_path}, Device: {self.device}")
+            self.model_version = settings.AI_MODEL_VERSION or self._checkpoint_fingerprint()
+            self.backend, self.backend_parity = create_backend(
+                settings.AI_BACKEND,
+                self.model,
+                self.device,
+                self.channels_last,
+                verify=settings.AI_BACKEND_VERIFY,
+                atol=settings.AI_BACKEND_PARITY_ATOL,
+                **self._backend_options(settings.AI_PRECISION),
+            )
+            logger.info(
+                f"✅ MTL Model loaded: {self.model_path} ({self.load_report.format}, "
+                f"{self.load_report.load_seconds:.2f}s), Device: {self.device}"
+            )
         except Exception as e:
-            print(f"❌❌❌ 로드 중 예외 발생: {str(e)}")
             logger.error(f"❌ Failed to load MTL model: {e}")
             raise
 
-    
-    def predict(self, image_input: Union[str, bytes]) -> Dict:
+    def _backend_options(self, precision: str) -> Dict:
+        return dict(
+            onnx_dir=settings.AI_ONNX_DIR,
+            model_version=self.model_version,
+            num_threads=settings.AI_ONNX_THREADS,
+            calibration_dir=settings.AI_QUANT_CALIBRATION_DIR,
+            calibration_images=settings.AI_QUANT_CALIBRATION_IMAGES,
+            precision=precision,
+        )
+
+    def __getstate__(self) -> Dict:
+        """
+        워커 프로세스(forkserver/spawn)로 넘길 상태
+
+        - 가중치는 share_memory() 후 공유 메모리 핸들로 넘어가 부모와 같은 페이지를 사용
+        - 백엔드(컴파일/ONNX 세션 등)는 직렬화할 수 없으므로 부모가 고른 이름/정밀도만 넘김
+        """
+        state = self.__dict__.copy()
+        backend = state.pop("backend")
+        state["backend_spec"] = (backend.name, backend.precision) if backend is not None else None
+        state["worker_pool"] = None
+        return state
+
+    def __setstate__(self, state: Dict):
+        """워커에서 같은 백엔드를 다시 만듦 (정합성 검사는 부모에서 이미 했으므로 생략)"""
+        spec = state.pop("backend_spec")
+        self.__dict__.update(state)
+        self.backend = None
+        if spec is not None:
+            name, precision = spec
+            self.backend, _ = create_backend(
+                name, self.model, self.device, self.channels_last, verify=False, **self._backend_options(precision)
+            )
+
+    @staticmethod
+    def _configure_threads() -> int:
+        """intra-op 스레드 수: 동시에 도는 배치끼리 코어를 나눠 써서 과다 구독 방지"""
+        concurrent_batches = max(1, settings.AI_WORKER_PROCESSES)
+        threads = settings.AI_TORCH_THREADS or max(1, (os.cpu_count() or 1) // concurrent_batches)
+        torch.set_num_threads(threads)
+        return threads
+
+    @property
+    def precision(self) -> str:
+        return self.backend.precision if self.backend is not None else "fp32"
+
+    @property
+    def output_version(self) -> Optional[str]:
+        """결과를 만든 모델 버전 (fp32가 아니면 정밀도를 붙여 구분: 캐시 키, 진단 기록용)"""
+        if self.model_version is None or self.precision == "fp32":
+            return self.model_version
+        return f"{self.model_version}+{self.precision}"
+
+    def _checkpoint_fingerprint(self) -> str:
+        """AI_MODEL_VERSION이 없을 때 쓰는 체크포인트 식별자 (파일명 + 크기 + 수정 시각)"""
+        stat = self.model_path.stat()
+        digest = hashlib.sha256(f"{stat.st_size}:{stat.st_mtime_ns}".encode()).hexdigest()[:12]
+        return f"{self.model_path.stem}-{digest}"
+
+    @staticmethod
+    def _resize(image: Image.Image) -> Image.Image:
+        return image.resize((512, 512), Image.BILINEAR)
+
+    def _load_image(self, image_input: ImageInput, target_size: Optional[int] = 512) -> Image.Image:
+        """
+        입력을 RGB 이미지로 디코딩
+
+        - bytes는 메모리에서 바로 디코딩 (JPEG는 target_size 근처로 draft 디코딩)
+        - target_size=None이면 원본 해상도 유지 (타일 추론)
+        """
+        if isinstance(image_input, Image.Image):
+            return image_input.convert('RGB')
+        if isinstance(image_input, str):
+            with open(image_input, "rb") as f:
+                image_input = f.read()
+        return decode_image(image_input, target_size)
+
+    def start_worker_pool(self, num_workers: int, num_threads: int = 0):
+        """추론을 공유 가중치 워커 프로세스로 넘김"""
+        from app.services.worker_pool import InferenceWorkerPool
+
+        pool = InferenceWorkerPool(self, num_workers, settings.AI_BATCH_MAX_SIZE, num_threads)
+        pool.start()
+        self.worker_pool = pool
+
+    def shutdown_worker_pool(self):
+        if self.worker_pool is not None:
+            self.worker_pool.shutdown()
+            self.worker_pool = None
+
+    def _forward(
+        self,
+        input_tensor: torch.Tensor,
+        mode: str = "full",
+        timer: Optional[StageTimer] = None,
+        masks: bool = False,
+    ) -> ModelOutput:
+        """
+        워커 풀이 있으면 워커에서, 없으면 현재 프로세스에서 순전파 (timer가 있으면 구간별 시간 기록)
+
+        - masks: 세그멘테이션을 로짓 대신 argmax한 uint8 마스크 (N, H, W)로 반환
+          (워커 풀이면 워커 안에서 argmax해서 로짓을 프로세스 사이로 옮기지 않음)
+        """
+        timer = timer or StageTimer(enabled=False)
+        if self.worker_pool is not None:
+            with timer.stage("forward"):
+                return self.worker_pool.run(input_tensor, mode, masks)
+        return self._run_model(input_tensor, mode, timer, masks)
+
+    def _run_model(
+        self,
+        input_tensor: torch.Tensor,
+        mode: str = "full",
+        timer: Optional[StageTimer] = None,
+        masks: bool = False,
+    ) -> ModelOutput:
+        """
+        설정된 백엔드로 순전파 (배치 단위)
+
+        - classify: 인코더 + 분류 헤드만 실행 (UNet 디코더 생략)
+        - segment: 인코더 + 디코더 + 세그멘테이션 헤드만 실행
+        - full: 둘 다 실행
+        - timer: 구간별 시간/스팬 기록 (워커 프로세스에서 트레이스가 넘어왔을 때)
+        - masks: 세그멘테이션 로짓 대신 argmax한 uint8 마스크 반환
+        """
+        timer = timer or StageTimer(enabled=False)
+        seg_out, cls_out = self.backend.run_profiled(input_tensor, mode, timer)
+        if masks and seg_out is not None:
+            with timer.stage("postprocess"):
+                seg_out = seg_out.argmax(dim=1).to(torch.uint8)
+        return seg_out, cls_out
+
+    def predict(self, image_input: ImageInput, mode: str = "full", profile: Optional[bool] = None) -> Dict:
+        return self.predict_batch([image_input], mode, profile)[0]
+
+    def predict_tiled(self, image_input: ImageInput, mode: str = "full", profile: Optional[bool] = None) -> Dict:
+        """
+        고해상도 이미지 타일 추론
+
+        - 512 타일로 겹쳐 자르고 배경 타일은 건너뜀
+        - 한 변이라도 타일보다 작으면 일반 predict로 처리
+        - profile: 단계별 시간 측정 여부 (None이면 should_profile 샘플링)
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown inference mode: {mode}")
+        profile = should_profile() if profile is None else profile
+        try:
+            timer = StageTimer(self.device, profile)
+            with timer.stage("decode"):
+                image = self._load_image(image_input, target_size=None)
+            if min(image.size) < self.tiler.tile_size:
+                return self.predict(image, mode, profile)
+            result = self.tiler.predict(image, mode, timer)
+            if timer.enabled:
+                result["timings"] = timer.to_ms()
+                stage_profiler.record(result["timings"])
+            return result
+        except Exception as e:
+            logger.error(f"Tiled prediction error: {e}")
+            return {"error": True, "message": str(e)}
+
+    def predict_batch(
+        self, image_inputs: List[ImageInput], mode: str = "full", profile: Optional[bool] = None
+    ) -> List[Dict]:
+        """
+        여러 이미지를 한 번의 순전파로 예측
+
+        - mode: classify / segment / full (필요한 연산만 수행)
+        - profile: 단계별 시간 측정 여부 (None이면 should_profile 샘플링)
+        - 디코딩에 실패한 이미지는 해당 위치에만 에러 결과를 채움
+        - 반환 리스트의 순서는 입력 순서와 동일
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown inference mode: {mode}")
+
         start_time = time.time()
-        print("DEBUG: 1. 전처리 시작")
+        profile = should_profile() if profile is None else profile
+        results: List[Optional[Dict]] = [None] * len(image_inputs)
+        images, arrays, indices, timers = [], [], [], []
+        for idx, image_input in enumerate(image_inputs):
+            timer = StageTimer(enabled=profile)
+            try:
+                with timer.stage("decode"):
+                    image = self._load_image(image_input)
+                    resized = np.asarray(self._resize(image))
+                arrays.append(resized)
+                images.append((image, resized))
+                indices.append(idx)
+                timers.append(timer)
+            except Exception as e:
+                logger.error(f"Prediction error: {e}")
+                results[idx] = {"error": True, "message": str(e)}
+
+        if not arrays:
+            return results
+
         try:
-            print("DEBUG: 2. 모델 입력 직전") # <--- 여기까지 찍히는지 확인
-            if isinstance(image_input, str):
-                image = Image.open(image_input).convert('RGB')
-            else:
-                image = Image.open(io.BytesIO(image_input)).convert('RGB')
-            original_size = image.size
-            input_tensor = self.transform(image).unsqueeze(0).to(self.device)
-            print(f"DEBUG: Input Shape: {input_tensor.shape}") 
-            # 반드시 torch.Size([1, 3, 512, 512]) 여야 합니다. (앞에 1이 필수)
-            print(f"DEBUG: Input Device: {input_tensor.device}")
-            print(f"DEBUG: Model Device: {next(self.model.parameters()).device}")
-            # with torch.no_grad():
-            #     print("DEBUG: 4. no_grad") # <
-            #     seg_out, cls_out = self.model(input_tensor)
-            with torch.no_grad():
-                print("DEBUG: 4. no_grad 진입")
-                
-                # 1단계: 인코더만 실행해보기
-                features = self.model.unet.encoder(input_tensor)
-                print(f"DEBUG: 4-1. 인코더 완료 (특징 맵 개수: {len(features)})")
-                
-                # 2단계: 디코더 실행
-                decoder_output = self.model.unet.decoder(*features)
-                seg_out = self.model.unet.segmentation_head(decoder_output)
-                print("DEBUG: 4-2. 세그멘테이션 완료")
-                
-                # 3단계: 분류기 실행
-                cls_feat = self.model.avgpool(features[-1])
-                cls_feat = torch.flatten(cls_feat, 1)
-                cls_out = self.model.classifier(cls_feat)
-                print("DEBUG: 4-3. 분류 완료")
-                
-            print("DEBUG: 5. cls_out") # <
-            cls_probs = torch.softmax(cls_out, dim=1)[0]
-            cls_pred = torch.argmax(cls_probs).item()
-            confidence = cls_probs[cls_pred].item()
-
-            seg_pred = torch.argmax(seg_out, dim=1)[0].cpu().numpy()
-            seg_stats = self._calculate_segmentation_stats(seg_pred)
-            seg_image_b64 = self._create_segmentation_overlay(image, seg_pred)
+            # 배치 단위 단계 (preprocess, 모델 구간)는 배치의 모든 이미지에 같은 값
+            batch_timer = StageTimer(self.device, profile)
+            with sampled_trace(f"{mode}-b{len(arrays)}", self.device):
+                with batch_timer.stage("preprocess"):
+                    input_tensor = self.preprocess(arrays).to(self.device)
+                seg_out, cls_out = self._forward(input_tensor, mode, batch_timer, masks=True)
+                with batch_timer.stage("postprocess"):
+                    cls_logits, cls_probs, seg_preds = self._outputs_to_numpy(seg_out, cls_out)
 
             processing_time = time.time() - start_time
-            return {
+            for pos, idx in enumerate(indices):
+                image, resized = images[pos]
+                seg_pred = seg_preds[pos] if seg_preds is not None else None
+                results[idx] = self._build_result(
+                    image.size,
+                    seg_pred,
+                    (resized, seg_pred) if seg_pred is not None else None,
+                    cls_probs[pos] if cls_probs is not None else None,
+                    cls_logits[pos] if cls_logits is not None else None,
+                    processing_time, mode=mode, model_info={"batch_size": len(indices)},
+                    timer=timers[pos],
+                )
+                if profile:
+                    timers[pos].merge(batch_timer)
+                    results[idx]["timings"] = timers[pos].to_ms()
+                    stage_profiler.record(results[idx]["timings"])
+        except Exception as e:
+            logger.error(f"Prediction error: {e}")
+            for idx in indices:
+                results[idx] = {"error": True, "message": str(e)}
+        return results
+
+    @staticmethod
+    def _outputs_to_numpy(
+        seg_masks: Optional[torch.Tensor], cls_out: Optional[torch.Tensor]
+    ) -> Tuple[Optional[np.ndarray], Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        모델 출력을 NumPy로 한 번씩만 옮김
+
+        - 분류: 로짓만 옮기고 softmax는 NumPy에서 계산 (4개 값)
+        - 세그멘테이션: _forward(masks=True)에서 이미 uint8 마스크로 줄인 것을 옮김
+        """
+        cls_logits = cls_probs = seg_preds = None
+        if cls_out is not None:
+            cls_logits = cls_out.float().cpu().numpy()
+            cls_probs = softmax(cls_logits)
+        if seg_masks is not None:
+            seg_preds = seg_masks.cpu().numpy()
+        return cls_logits, cls_probs, seg_preds
+
+    def _build_result(
+        self,
+        original_size: Tuple[int, int],
+        seg_pred: Optional[np.ndarray],
+        preview: Optional[Tuple[np.ndarray, np.ndarray]],
+        cls_probs: Optional[np.ndarray],
+        cls_logits: Optional[np.ndarray],
+        processing_time: float,
+        mode: str = "full",
+        model_info: Optional[Dict] = None,
+        timer: Optional[StageTimer] = None,
+    ) -> Dict:
+        """
+        예측 결과 dict 구성
+
+        - seg_pred: 통계를 낼 클래스 마스크
+        - preview: 렌더링에 쓸 (RGB, 마스크) 쌍 (타일 추론은 축소본)
+        - timer: 세그멘테이션 통계(postprocess), 렌더링(overlay) 시간 기록
+        """
+        timer = timer or StageTimer(enabled=False)
+        result = {}
+        if cls_probs is not None:
+            cls_pred = int(np.argmax(cls_probs))
+            result.update({
                 "prediction": self.CLASS_NAMES[cls_pred],
                 "prediction_kr": self.CLASS_NAMES_KR[cls_pred],
-                "confidence": float(confidence),
-                "probabilities": {name: float(prob) for name, prob in zip(self.CLASS_NAMES, cls_probs.cpu().numpy())},
-                "probabilities_kr": {name: float(prob) for name, prob in zip(self.CLASS_NAMES_KR, cls_probs.cpu().numpy())},
-                "raw_logits": cls_out[0].cpu().numpy().tolist(),
-                "segmentation": {"stats": seg_stats, "image_base64": seg_image_b64, "class_colors": self.SEG_COLORS},
-                "processing_time": processing_time,
-                "model_info": {
-                    "model_type": "UNet + ResNet50 (MTL)",
-                    "input_size": [512, 512],
-                    "original_size": list(original_size),
-                    "device": str(self.device),
-                }
+                "confidence": float(cls_probs[cls_pred]),
+                "probabilities": {name: float(prob) for name, prob in zip(self.CLASS_NAMES, cls_probs)},
+                "probabilities_kr": {name: float(prob) for name, prob in zip(self.CLASS_NAMES_KR, cls_probs)},
+                "raw_logits": cls_logits.tolist(),
+            })
+        if seg_pred is not None:
+            with timer.stage("postprocess"):
+                seg_stats = self._calculate_segmentation_stats(seg_pred)
+            preview_image, preview_mask = preview
+            with timer.stage("overlay"):
+                seg_image, media_type = render_segmentation(
+                    preview_image, preview_mask, self.seg_palette, self.seg_output_format
+                )
+                image_base64 = to_base64(seg_image)
+            result["segmentation"] = {
+                "stats": seg_stats,
+                "image_base64": image_base64,
+                "image_format": self.seg_output_format,
+                "media_type": media_type,
+                "class_colors": self.SEG_COLORS,
             }
-        except Exception as e:
-            print(f"Prediction error: {e}")
-            logger.error(f"Prediction error: {e}")
-            return {"error": True, "message": str(e)}
+        result.update({
+            "processing_time": processing_time,
+            "model_info": {
+                "model_type": "UNet + ResNet50 (MTL)",
+                "mode": mode,
+                "input_size": [512, 512],
+                "original_size": list(original_size),
+                "device": str(self.device),
+                "precision": self.precision,
+                "model_version": self.output_version,
+                **(model_info or {}),
+            }
+        })
+        return result
     
     def _calculate_segmentation_stats(self, seg_mask: np.ndarray) -> Dict:
-        total_pixels = seg_mask.size
-        stats = {"ratios": {}, "pixel_counts": {}}
-        for cls_id, cls_name in enumerate(self.SEG_CLASS_NAMES):
-            count = np.sum(seg_mask == cls_id)
-            ratio = count / total_pixels
-            stats["ratios"][cls_name.lower()] = float(ratio)
-            stats["pixel_counts"][cls_name.lower()] = int(count)
-        return stats
-    
-    def _create_segmentation_overlay(self, original_image: Image.Image, seg_mask: np.ndarray) -> str:
-        img_resized = original_image.resize((512, 512))
-        img_np = np.array(img_resized)
-        color_mask = np.zeros((512, 512, 3), dtype=np.uint8)
-        for cls_id, color in self.SEG_COLORS.items():
-            color_mask[seg_mask == cls_id] = color
-        alpha = 0.5
-        overlay = (img_np * (1 - alpha) + color_mask * alpha).astype(np.uint8)
-        overlay_img = Image.fromarray(overlay)
-        buffered = io.BytesIO()
-        overlay_img.save(buffered, format="PNG")
-        return base64.b64encode(buffered.getvalue()).decode()
+        return analyze_segmentation(
+            seg_mask,
+            self.SEG_CLASS_NAMES,
+            tumor_class=self.SEG_CLASS_NAMES.index("Tumor"),
+            min_region_area=settings.AI_MIN_TUMOR_REGION_AREA,
+            max_regions=settings.AI_MAX_TUMOR_REGIONS,
+        )
     
     def get_model_info(self) -> Dict:
         return {
             "model_path": str(self.model_path),
+            "model_version": self.model_version,
             "device": str(self.device),
+            "precision": self.precision,
+            "torch_threads": self.torch_threads,
+            "backend": self.backend.get_info() if self.backend is not None else None,
+            "backend_parity": self.backend_parity,
+            "worker_pool": self.worker_pool.get_stats() if self.worker_pool is not None else None,
             "model_type": "UNet + ResNet50 (MTL)",
             "num_seg_classes": 5,
             "num_cls_classes": 4,
             "classification_classes": self.CLASS_NAMES_KR,
             "segmentation_classes": self.SEG_CLASS_NAMES_KR,
         }
-
-print("!!!!!!!!!!!!!!!! AI SERVICE FILE LOADING START !!!!!!!!!!!!!!!!")
-try:
-    ai_service = MTLAIService()
-    logger.info("✅ MTL AI Service initialized")
-except Exception as e:
-    logger.error(f"❌ Failed to initialize MTL AI Service: {e}")
-    ai_service= None
-
@@ -0,0 +1,203 @@
+"""
+통계 API(/analytics) 조회
+모든 조회는 일별 롤업(visit_daily_stats, diagnosis_daily_stats)만 읽음
+→ 읽는 행 수는 (기간 일수 x 의사 x 분류/상태)로 정해지고 진료/진단 누적 건수와 무관
+주/월 단위는 일별 행을 Python에서 묶음 (DB별 날짜 함수 차이 없이 같은 결과)
+"""
+
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.diagnosis_stats import TUMOR_RATIO_BIN_COLUMNS, TUMOR_RATIO_BINS, DiagnosisDailyStats
+from app.models.user import User
+from app.models.visit_stats import VisitDailyStats
+from app.schemas.analytics import Bucket
+
+
+def bucket_start(day: date, bucket: Bucket) -> date:
+    """day가 속한 구간의 시작일 (week: 월요일, month: 1일)"""
+    if bucket == Bucket.WEEK:
+        return day - timedelta(days=day.weekday())
+    if bucket == Bucket.MONTH:
+        return day.replace(day=1)
+    return day
+
+
+def periods(since: date, until: date, bucket: Bucket) -> List[date]:
+    """[since, until]에 걸친 구간 시작일 목록 (건수가 없는 구간도 0으로 채우기 위함)"""
+    result = []
+    current = bucket_start(since, bucket)
+    while current <= until:
+        result.append(current)
+        if bucket == Bucket.MONTH:
+            current = (current + timedelta(days=32)).replace(day=1)
+        else:
+            current += timedelta(days=7 if bucket == Bucket.WEEK else 1)
+    return result
+
+
+def _average(total: float, count: int) -> Optional[float]:
+    return round(total / count, 4) if count else None
+
+
+def _in_range(query, model, since: Optional[date], until: Optional[date]):
+    if since is not None:
+        query = query.filter(model.day >= since)
+    if until is not None:
+        query = query.filter(model.day <= until)
+    return query
+
+
+def _doctor_names(db: Session, doctor_ids: Iterable[int]) -> Dict[int, str]:
+    ids = set(doctor_ids)
+    if not ids:
+        return {}
+    return dict(db.query(User.id, User.full_name).filter(User.id.in_(ids)).all())
+
+
+def visit_trend(db: Session, since: date, until: date, bucket: Bucket,
+                doctor_id: Optional[int] = None) -> List[Dict]:
+    """구간별 진료 건수 (상태별)"""
+    query = db.query(VisitDailyStats.day, VisitDailyStats.status, func.sum(VisitDailyStats.count))
+    query = _in_range(query, VisitDailyStats, since, until)
+    if doctor_id is not None:
+        query = query.filter(VisitDailyStats.doctor_id == doctor_id)
+
+    series = {start: {"total": 0, "by_status": {}} for start in periods(since, until, bucket)}
+    for day, status, count in query.group_by(VisitDailyStats.day, VisitDailyStats.status).all():
+        count = int(count or 0)
+        if count <= 0:
+            continue
+        entry = series[bucket_start(day, bucket)]
+        entry["total"] += count
+        entry["by_status"][status] = entry["by_status"].get(status, 0) + count
+    return [{"period": start.isoformat(), **entry} for start, entry in series.items()]
+
+
+def visits_by_doctor(db: Session, since: Optional[date] = None, until: Optional[date] = None) -> List[Dict]:
+    """의사별 진료 건수 (상태별, 많은 순)"""
+    query = db.query(VisitDailyStats.doctor_id, VisitDailyStats.status, func.sum(VisitDailyStats.count))
+    query = _in_range(query, VisitDailyStats, since, until)
+
+    doctors: Dict[int, Dict] = {}
+    for doctor_id, status, count in query.group_by(VisitDailyStats.doctor_id, VisitDailyStats.status).all():
+        count = int(count or 0)
+        if count <= 0:
+            continue
+        entry = doctors.setdefault(doctor_id, {"total": 0, "by_status": {}})
+        entry["total"] += count
+        entry["by_status"][status] = count
+
+    names = _doctor_names(db, doctors)
+    return sorted(
+        ({"doctor_id": doctor_id, "doctor_name": names.get(doctor_id), **entry} for doctor_id, entry in doctors.items()),
+        key=lambda entry: (-entry["total"], entry["doctor_id"]),
+    )
+
+
+def diagnosis_trend(db: Session, since: date, until: date, bucket: Bucket,
+                    doctor_id: Optional[int] = None, prediction: Optional[str] = None) -> List[Dict]:
+    """구간별 진단 건수와 평균 신뢰도 (전체, 분류별)"""
+    stats = DiagnosisDailyStats
+    query = db.query(stats.day, stats.prediction, func.max(stats.prediction_kr),
+                     func.sum(stats.count), func.sum(stats.confidence_sum))
+    query = _in_range(query, stats, since, until)
+    if doctor_id is not None:
+        query = query.filter(stats.doctor_id == doctor_id)
+    if prediction is not None:
+        query = query.filter(stats.prediction == prediction)
+
+    series = {start: {} for start in periods(since, until, bucket)}
+    for day, label, label_kr, count, confidence_sum in query.group_by(stats.day, stats.prediction).all():
+        count = int(count or 0)
+        if count <= 0:
+            continue
+        entry = series[bucket_start(day, bucket)].setdefault(
+            label, {"prediction_kr": label_kr, "count": 0, "confidence_sum": 0.0})
+        entry["count"] += count
+        entry["confidence_sum"] += confidence_sum or 0.0
+
+    result = []
+    for start, classes in series.items():
+        total = sum(entry["count"] for entry in classes.values())
+        confidence_sum = sum(entry["confidence_sum"] for entry in classes.values())
+        result.append({
+            "period": start.isoformat(),
+            "total": total,
+            "avg_confidence": _average(confidence_sum, total),
+            "by_class": {
+                label: {
+                    "prediction_kr": entry["prediction_kr"],
+                    "count": entry["count"],
+                    "avg_confidence": _average(entry["confidence_sum"], entry["count"]),
+                }
+                for label, entry in sorted(classes.items())
+            },
+        })
+    return result
+
+
+def _histogram(counts: List[int], ratio_sum: float, ratio_count: int) -> Dict:
+    return {"count": ratio_count, "mean": _average(ratio_sum, ratio_count), "counts": counts}
+
+
+def tumor_ratio_distribution(db: Session, since: date, until: date,
+                             doctor_id: Optional[int] = None, prediction: Optional[str] = None) -> Dict:
+    """tumor_ratio 구간별 진단 수와 평균 (전체, 분류별, classify 모드처럼 tumor_ratio가 없는 진단 제외)"""
+    stats = DiagnosisDailyStats
+    bins = [func.sum(getattr(stats, name)) for name in TUMOR_RATIO_BIN_COLUMNS]
+    query = db.query(stats.prediction, func.sum(stats.tumor_ratio_sum), func.sum(stats.tumor_ratio_count), *bins)
+    query = _in_range(query, stats, since, until)
+    if doctor_id is not None:
+        query = query.filter(stats.doctor_id == doctor_id)
+    if prediction is not None:
+        query = query.filter(stats.prediction == prediction)
+
+    overall_counts = [0] * TUMOR_RATIO_BINS
+    overall_sum = 0.0
+    overall_count = 0
+    by_class = {}
+    for label, ratio_sum, ratio_count, *counts in query.group_by(stats.prediction).all():
+        counts = [int(count or 0) for count in counts]
+        ratio_count = int(ratio_count or 0)
+        if ratio_count <= 0:
+            continue
+        by_class[label] = _histogram(counts, ratio_sum or 0.0, ratio_count)
+        overall_counts = [total + count for total, count in zip(overall_counts, counts)]
+        overall_sum += ratio_sum or 0.0
+        overall_count += ratio_count
+
+    return {
+        "bin_edges": [round(i / TUMOR_RATIO_BINS, 2) for i in range(TUMOR_RATIO_BINS + 1)],
+        "overall": _histogram(overall_counts, overall_sum, overall_count),
+        "by_class": dict(sorted(by_class.items())),
+    }
+
+
+def review_backlog(db: Session, since: Optional[date] = None, until: Optional[date] = None) -> List[Dict]:
+    """
+    의사별(진료 담당 의사) 미검토 진단 수와 가장 오래된 미검토 진단일 (많은 순)
+    기간을 주지 않으면 전체 기간 (롤업 행 수만큼만 읽음)
+    """
+    stats = DiagnosisDailyStats
+    query = (
+        db.query(stats.doctor_id, func.sum(stats.count), func.min(stats.day))
+        .filter(stats.is_reviewed == 0, stats.count > 0)
+    )
+    query = _in_range(query, stats, since, until)
+    rows = query.group_by(stats.doctor_id).all()
+
+    names = _doctor_names(db, (doctor_id for doctor_id, _, _ in rows))
+    backlog = [
+        {
+            "doctor_id": doctor_id,
+            "doctor_name": names.get(doctor_id),
+            "unreviewed": int(count),
+            "oldest_day": oldest.isoformat() if oldest else None,
+        }
+        for doctor_id, count, oldest in rows
+    ]
+    return sorted(backlog, key=lambda entry: (-entry["unreviewed"], entry["doctor_id"]))
@@ -0,0 +1,414 @@
+"""
+MTL 모델 추론 백엔드
+MTLAIService는 모드별 순전파를 backend.run(input, mode)로만 호출
+
+- eager: PyTorch eager (기본값)
+- torchscript: 모드별로 trace → freeze → optimize_for_inference (Conv+BN 접기 포함)
+- compile: 모드별 torch.compile(dynamic=True)
+- onnxruntime: 모드별 ONNX 그래프를 내보내 ONNX Runtime CPU로 실행 (동적 배치, BN 접기)
+- int8: 정적/동적 INT8 양자화 모델을 eager로 실행 (CPU 전용, app.services.quantization)
+
+정밀도(precision): eager/compile은 bf16 autocast 지원 (인코더/디코더만, 분류 헤드와 출력 로짓은 fp32)
+
+모드별로 그래프를 따로 만들어 classify에서는 UNet 디코더가 그래프에 아예 없음
+로드 시 eager와 출력을 비교해 허용 오차를 넘으면 eager로 되돌림 (근사 백엔드는 보고만 함)
+"""
+
+import copy
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import torch
+import torch.nn as nn
+from torch.nn.utils.fusion import fuse_conv_bn_eval, fuse_linear_bn_eval
+
+logger = logging.getLogger(__name__)
+
+ModelOutput = Tuple[Optional[torch.Tensor], Optional[torch.Tensor]]  # (seg_logits, cls_logits)
+
+MODES = ("classify", "segment", "full")
+INPUT_SIZE = 512
+ONNX_OPSET = 17
+
+
+class ModeGraph(nn.Module):
+    """
+    모드별 순전파 그래프
+
+    - classify: 인코더 + 분류 헤드만 (UNet 디코더 생략)
+    - segment: 인코더 + 디코더 + 세그멘테이션 헤드만
+    - full: 둘 다 (seg, cls 순서)
+    - autocast_dtype가 있으면 인코더/디코더만 그 정밀도로 실행하고 출력은 fp32로 되돌림
+    """
+
+    def __init__(self, model: nn.Module, mode: str, autocast_dtype: Optional[torch.dtype] = None):
+        super().__init__()
+        self.model = model
+        self.mode = mode
+        self.autocast_dtype = autocast_dtype
+
+    def forward(self, x: torch.Tensor):
+        outputs = []
+        with torch.autocast(x.device.type, dtype=self.autocast_dtype, enabled=self.autocast_dtype is not None):
+            features = self.model.unet.encoder(x)
+            if self.mode != "classify":
+                decoder_output = self.model.unet.decoder(*features)
+                seg_out = self.model.unet.segmentation_head(decoder_output)
+        if self.mode != "classify":
+            outputs.append(seg_out.float())
+        if self.mode != "segment":
+            cls_feat = self.model.avgpool(features[-1].float())
+            cls_feat = torch.flatten(cls_feat, 1)
+            outputs.append(self.model.classifier(cls_feat))
+        return tuple(outputs)
+
+    def forward_staged(self, x: torch.Tensor, timer) -> tuple:
+        """forward와 같은 연산을 encoder / decoder / classifier 구간별로 시간을 재며 실행 (trace 대상 아님)"""
+        outputs = []
+        with torch.autocast(x.device.type, dtype=self.autocast_dtype, enabled=self.autocast_dtype is not None):
+            with timer.stage("encoder"):
+                features = self.model.unet.encoder(x)
+            if self.mode != "classify":
+                with timer.stage("decoder"):
+                    decoder_output = self.model.unet.decoder(*features)
+                    seg_out = self.model.unet.segmentation_head(decoder_output)
+        if self.mode != "classify":
+            outputs.append(seg_out.float())
+        if self.mode != "segment":
+            with timer.stage("classifier"):
+                cls_feat = self.model.avgpool(features[-1].float())
+                cls_feat = torch.flatten(cls_feat, 1)
+                outputs.append(self.model.classifier(cls_feat))
+        return tuple(outputs)
+
+
+def split_outputs(outputs, mode: str) -> ModelOutput:
+    """ModeGraph 출력 튜플 → (seg_logits, cls_logits)"""
+    if mode == "classify":
+        return None, outputs[0]
+    if mode == "segment":
+        return outputs[0], None
+    return outputs[0], outputs[1]
+
+
+def fold_batchnorm(model: nn.Module) -> nn.Module:
+    """
+    eval 모드 BN을 바로 앞 Conv2d/Linear 가중치에 접은 사본 반환
+
+    ResNet/UNet 블록은 자식 모듈 순서상 conv 바로 뒤에 BN이 오고 그 순서대로 적용됨
+    (conv1→bn1, downsample[0]→[1], Conv2dReLU의 conv→bn, classifier의 Linear→BatchNorm1d)
+    """
+    model = copy.deepcopy(model).eval()
+    for parent in model.modules():
+        children = list(parent.named_children())
+        for (prev_name, prev), (name, child) in zip(children, children[1:]):
+            if isinstance(prev, nn.Conv2d) and isinstance(child, nn.BatchNorm2d):
+                setattr(parent, prev_name, fuse_conv_bn_eval(prev, child))
+                setattr(parent, name, nn.Identity())
+            elif isinstance(prev, nn.Linear) and isinstance(child, nn.BatchNorm1d):
+                setattr(parent, prev_name, fuse_linear_bn_eval(prev, child))
+                setattr(parent, name, nn.Identity())
+    return model
+
+
+def bf16_supported() -> bool:
+    """oneDNN이 이 CPU에서 bfloat16 커널을 쓸 수 있는지"""
+    check = getattr(torch.ops.mkldnn, "_is_mkldnn_bf16_supported", None)
+    return bool(check and torch.backends.mkldnn.is_available() and check())
+
+
+class InferenceBackend:
+    """eager PyTorch 백엔드 (다른 백엔드의 기준)"""
+
+    name = "eager"
+    exact = True  # False면 eager와의 차이를 허용 (양자화 등), 정합성 검사는 보고만 함
+    precisions = ("fp32", "bf16")  # 지원하는 정밀도 (첫 번째가 기본값)
+    staged = True  # ModeGraph를 그대로 실행해서 구간별 시간을 잴 수 있음
+
+    def __init__(
+        self,
+        model: nn.Module,
+        device: torch.device,
+        channels_last: bool = False,
+        precision: str = "fp32",
+        **options,
+    ):
+        if precision not in self.precisions:
+            logger.warning(f"⚠️ {self.name} backend does not support {precision}, using {self.precisions[0]}")
+            precision = self.precisions[0]
+        self.model = model
+        self.device = device
+        self.channels_last = channels_last
+        self.precision = precision
+        if precision == "bf16" and device.type == "cpu" and not bf16_supported():
+            logger.warning("⚠️ CPU has no native bfloat16 support (AVX512-BF16/AMX); bf16 may be slower than fp32")
+        autocast_dtype = torch.bfloat16 if precision == "bf16" else None
+        self.graphs = {mode: ModeGraph(model, mode, autocast_dtype).eval() for mode in MODES}
+
+    def run(self, input_tensor: torch.Tensor, mode: str = "full") -> ModelOutput:
+        with torch.no_grad():
+            return split_outputs(self.graphs[mode](input_tensor), mode)
+
+    def run_profiled(self, input_tensor: torch.Tensor, mode: str, timer) -> ModelOutput:
+        """run과 같은 결과, timer에 구간별 시간 기록 (구간을 나눌 수 없으면 forward 하나로)"""
+        if not timer.enabled or not self.staged:
+            with timer.stage("forward"):
+                return self.run(input_tensor, mode)
+        with torch.no_grad():
+            return split_outputs(self.graphs[mode].forward_staged(input_tensor, timer), mode)
+
+    def example_input(self, batch_size: int = 2) -> torch.Tensor:
+        x = torch.randn(batch_size, 3, INPUT_SIZE, INPUT_SIZE, device=self.device)
+        return x.to(memory_format=torch.channels_last) if self.channels_last else x
+
+    def get_info(self) -> Dict:
+        return {"name": self.name, "precision": self.precision}
+
+
+class TorchScriptBackend(InferenceBackend):
+    """모드별 trace + freeze (Conv+BN 접기, oneDNN 최적화)"""
+
+    name = "torchscript"
+    staged = False
+    precisions = ("fp32",)
+
+    def __init__(self, model: nn.Module, device: torch.device, channels_last: bool = False, **options):
+        super().__init__(model, device, channels_last, **options)
+        example = self.example_input()
+        with torch.no_grad():
+            self.scripted = {
+                mode: torch.jit.optimize_for_inference(torch.jit.freeze(torch.jit.trace(graph, example)))
+                for mode, graph in self.graphs.items()
+            }
+
+    def run(self, input_tensor: torch.Tensor, mode: str = "full") -> ModelOutput:
+        with torch.no_grad():
+            return split_outputs(self.scripted[mode](input_tensor), mode)
+
+
+class CompileBackend(InferenceBackend):
+    """모드별 torch.compile (배치 크기가 바뀌어도 재컴파일하지 않도록 dynamic=True)"""
+
+    name = "compile"
+    staged = False
+
+    def __init__(self, model: nn.Module, device: torch.device, channels_last: bool = False, **options):
+        super().__init__(model, device, channels_last, **options)
+        self.compiled = {mode: torch.compile(graph, dynamic=True) for mode, graph in self.graphs.items()}
+
+    def run(self, input_tensor: torch.Tensor, mode: str = "full") -> ModelOutput:
+        with torch.no_grad():
+            return split_outputs(self.compiled[mode](input_tensor), mode)
+
+
+def export_onnx(model: nn.Module, path: Path, mode: str = "full", channels_last: bool = False) -> Path:
+    """
+    GastricMTLModel → ONNX (모드별 그래프)
+
+    - BN은 내보내기 전에 Conv/Linear로 접음
+    - 배치 축은 동적, 입력은 NCHW (channels_last는 내보내는 동안의 메모리 형식에만 적용)
+    """
+    graph = ModeGraph(fold_batchnorm(model).cpu(), mode).eval()
+    example = torch.randn(2, 3, INPUT_SIZE, INPUT_SIZE)
+    if channels_last:
+        graph = graph.to(memory_format=torch.channels_last)
+        example = example.to(memory_format=torch.channels_last)
+    output_names = {"classify": ["cls_logits"], "segment": ["seg_logits"]}.get(mode, ["seg_logits", "cls_logits"])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with torch.no_grad():
+        torch.onnx.export(
+            graph,
+            (example,),
+            str(tmp_path),
+            input_names=["input"],
+            output_names=output_names,
+            dynamic_axes={name: {0: "batch"} for name in ["input", *output_names]},
+            opset_version=ONNX_OPSET,
+            do_constant_folding=True,
+        )
+    os.replace(tmp_path, path)
+    return path
+
+
+class OnnxRuntimeBackend(InferenceBackend):
+    """
+    ONNX Runtime CPU 백엔드
+
+    - 내보낸 그래프는 onnx_dir/<model_version>-<mode>.onnx에 캐시 (버전이 같으면 재사용)
+    - 세션은 프로세스별로 생성 (fork한 워커가 부모의 스레드 풀을 물려받지 않도록)
+    """
+
+    name = "onnxruntime"
+    staged = False
+    precisions = ("fp32",)
+
+    def __init__(
+        self,
+        model: nn.Module,
+        device: torch.device,
+        channels_last: bool = False,
+        onnx_dir: str = "onnx_cache",
+        model_version: str = "model",
+        num_threads: int = 0,
+        **options,
+    ):
+        super().__init__(model, device, channels_last, **options)
+        if device.type != "cpu":
+            raise RuntimeError("onnxruntime backend is CPU-only")
+        import onnxruntime  # noqa: F401  (설치 여부를 로드 시점에 확인)
+
+        self.num_threads = num_threads
+        self.paths = {}
+        for mode in MODES:
+            path = Path(onnx_dir) / f"{model_version}-{mode}.onnx"
+            if not path.exists():
+                logger.info(f"Exporting ONNX graph: {path}")
+                export_onnx(model, path, mode, channels_last)
+            self.paths[mode] = path
+        self._sessions: Dict[str, object] = {}
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _session(self, mode: str):
+        with self._lock:
+            if self._pid != os.getpid():
+                self._sessions = {}
+                self._pid = os.getpid()
+            session = self._sessions.get(mode)
+            if session is None:
+                import onnxruntime as ort
+
+                options = ort.SessionOptions()
+                options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+                if self.num_threads:
+                    options.intra_op_num_threads = self.num_threads
+                session = ort.InferenceSession(
+                    str(self.paths[mode]), options, providers=["CPUExecutionProvider"]
+                )
+                self._sessions[mode] = session
+            return session
+
+    def run(self, input_tensor: torch.Tensor, mode: str = "full") -> ModelOutput:
+        inputs = {"input": input_tensor.contiguous().numpy()}
+        outputs = self._session(mode).run(None, inputs)
+        return split_outputs([torch.from_numpy(out) for out in outputs], mode)
+
+    def get_info(self) -> Dict:
+        return {**super().get_info(), "graphs": {mode: str(path) for mode, path in self.paths.items()}}
+
+
+class QuantizedBackend(InferenceBackend):
+    """
+    INT8 CPU 백엔드
+
+    - 인코더/디코더는 calibration_dir 이미지로 캘리브레이션한 정적 양자화
+    - 분류 헤드 Linear는 동적 양자화
+    """
+
+    name = "int8"
+    staged = False
+    exact = False
+    precisions = ("int8",)
+
+    def __init__(
+        self,
+        model: nn.Module,
+        device: torch.device,
+        channels_last: bool = False,
+        calibration_dir: str = "",
+        calibration_images: int = 64,
+        **options,
+    ):
+        if device.type != "cpu":
+            raise RuntimeError("int8 backend is CPU-only")
+        from app.services.preprocessing import Preprocessor
+        from app.services.quantization import load_calibration_batches, model_size_bytes, quantize_model
+
+        batches = load_calibration_batches(calibration_dir, Preprocessor(size=INPUT_SIZE), calibration_images)
+        qmodel = quantize_model(model, batches)
+        super().__init__(qmodel, device, channels_last=False, precision="int8")
+        self.calibration_images = sum(batch.shape[0] for batch in batches)
+        self.size_bytes = model_size_bytes(qmodel)
+
+    def run(self, input_tensor: torch.Tensor, mode: str = "full") -> ModelOutput:
+        with torch.no_grad():
+            return split_outputs(self.graphs[mode](input_tensor.contiguous()), mode)
+
+    def get_info(self) -> Dict:
+        return {**super().get_info(), "calibration_images": self.calibration_images, "size_bytes": self.size_bytes}
+
+
+BACKENDS = {
+    "eager": InferenceBackend,
+    "torchscript": TorchScriptBackend,
+    "compile": CompileBackend,
+    "onnxruntime": OnnxRuntimeBackend,
+    "int8": QuantizedBackend,
+}
+
+
+def check_parity(
+    backend: InferenceBackend, reference: InferenceBackend, atol: float = 1e-2, batch_size: int = 2
+) -> Dict:
+    """
+    모든 모드에서 backend 출력이 eager와 허용 오차 안인지 확인
+
+    - 로짓 최대 절대 오차와 세그멘테이션 argmax 일치율을 함께 반환
+    - 첫 호출이 컴파일/세션 생성까지 하므로 워밍업도 겸함
+    """
+    x = reference.example_input(batch_size)
+    report = {"ok": True, "atol": atol, "modes": {}}
+    for mode in MODES:
+        ref_seg, ref_cls = reference.run(x, mode)
+        seg, cls = backend.run(x, mode)
+        entry = {}
+        if ref_cls is not None:
+            entry["cls_max_abs_diff"] = float((cls.float().cpu() - ref_cls.float().cpu()).abs().max())
+        if ref_seg is not None:
+            entry["seg_max_abs_diff"] = float((seg.float().cpu() - ref_seg.float().cpu()).abs().max())
+            entry["seg_argmax_agreement"] = float(
+                (seg.argmax(dim=1).cpu() == ref_seg.argmax(dim=1).cpu()).float().mean()
+            )
+        entry["ok"] = all(v <= atol for k, v in entry.items() if k.endswith("max_abs_diff"))
+        report["ok"] = report["ok"] and entry["ok"]
+        report["modes"][mode] = entry
+    return report
+
+
+def create_backend(
+    name: str,
+    model: nn.Module,
+    device: torch.device,
+    channels_last: bool = False,
+    verify: bool = True,
+    atol: float = 1e-2,
+    **options,
+) -> Tuple[InferenceBackend, Optional[Dict]]:
+    """
+    설정된 백엔드 생성 (실패하거나 eager와 출력이 다르면 fp32 eager로 되돌림)
+
+    반환: (백엔드, fp32 eager 대비 정합성 보고서 또는 None)
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown inference backend: {name} (choose from {', '.join(BACKENDS)})")
+    eager = InferenceBackend(model, device, channels_last)
+    if name == "eager" and options.get("precision", "fp32") == "fp32":
+        return eager, None
+
+    try:
+        backend = BACKENDS[name](model, device, channels_last, **options)
+        parity = check_parity(backend, eager, atol) if verify else None
+    except Exception as e:
+        logger.error(f"❌ Failed to build {name} backend, falling back to eager: {e}")
+        return eager, {"ok": False, "error": str(e)}
+    # 양자화/bf16처럼 근사인 경우는 차이를 보고만 함
+    exact = backend.exact and backend.precision == "fp32"
+    if parity is not None and not parity["ok"] and exact:
+        logger.error(f"❌ {name} backend outputs differ from eager, falling back to eager: {parity}")
+        return eager, parity
+    logger.info(f"✅ Inference backend: {name} ({backend.precision})")
+    return backend, parity
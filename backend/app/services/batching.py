@@ -0,0 +1,355 @@
+"""
+AI 추론 동적 마이크로 배칭
+동시에 들어온 /ai/predict, /clinical/diagnose 요청을 짧은 윈도우 동안 모아
+MTLAIService.predict_batch 한 번으로 처리하고 각 요청에 결과를 돌려줌
+
+스케줄링
+- 우선순위: urgent > routine > batch (높은 등급이 비어 있을 때만 아래 등급을 꺼냄)
+- 같은 등급 안에서는 사용자별 가중 공정 큐 (한 사용자가 대량으로 올려도 다른 사용자가 끼어듦)
+- urgent가 배치 맨 앞이면 배칭 윈도우를 기다리지 않고 이미 쌓인 것만 모아 바로 실행
+- 배치의 남는 자리는 아래 등급으로 채워서 대량 작업도 처리량을 유지
+"""
+
+import asyncio
+import contextvars
+import functools
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from typing import Dict, Hashable, List, NamedTuple, Optional, Set
+
+from app.core import tracing
+from app.core.config import settings
+from app.services.ingestion import ImageInput
+from app.services.model_state import model_state
+from app.services.profiling import should_profile, stage_profiler
+
+logger = logging.getLogger(__name__)
+
+
+PRIORITIES = ("urgent", "routine", "batch")
+
+
+class _Item(NamedTuple):
+    image_input: ImageInput
+    mode: str
+    tiled: bool
+    future: asyncio.Future
+    enqueued_at: float
+    priority: str = "routine"
+    user: Hashable = None
+    weight: float = 1.0
+    trace: tuple = ()  # 제출한 요청의 현재 스팬 (샘플링되지 않았으면 빈 튜플)
+    profile: bool = False  # 단계별 시간 요청 (X-Debug-Timings)
+
+
+class FairQueue:
+    """
+    우선순위 등급별 가중 공정 큐 (start-time fair queuing, 단일 이벤트 루프 전용)
+
+    - 항목 태그: start = max(등급 가상 시각, 사용자의 직전 finish), finish = start + 1 / weight
+    - 가장 높은 비어 있지 않은 등급에서 start 태그가 가장 작은 항목을 꺼냄
+    """
+
+    def __init__(self):
+        self._heaps: Dict[str, list] = {p: [] for p in PRIORITIES}
+        self._vtime: Dict[str, float] = {p: 0.0 for p in PRIORITIES}
+        self._last_finish: Dict[str, Dict[Hashable, float]] = {p: {} for p in PRIORITIES}
+        self._seq = itertools.count()
+        self._not_empty = asyncio.Event()
+        self._size = 0
+
+    def put(self, item: _Item):
+        p = item.priority
+        start = max(self._vtime[p], self._last_finish[p].get(item.user, 0.0))
+        self._last_finish[p][item.user] = start + 1.0 / max(item.weight, 1e-6)
+        heapq.heappush(self._heaps[p], (start, next(self._seq), item))
+        self._size += 1
+        self._not_empty.set()
+
+    def get_nowait(self) -> Optional[_Item]:
+        for p in PRIORITIES:
+            heap = self._heaps[p]
+            if heap:
+                start, _, item = heapq.heappop(heap)
+                self._vtime[p] = start
+                if not heap:
+                    # 등급이 비면 사용자별 태그를 정리 (다음 항목은 현재 가상 시각부터)
+                    self._last_finish[p].clear()
+                self._size -= 1
+                return item
+        return None
+
+    async def get(self) -> _Item:
+        while not self._size:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        return self.get_nowait()
+
+    def empty(self) -> bool:
+        return not self._size
+
+    def qsize(self) -> int:
+        return self._size
+
+    def qsize_by_priority(self) -> Dict[str, int]:
+        return {p: len(heap) for p, heap in self._heaps.items()}
+
+
+class _ClassStats:
+    """우선순위 등급별 대기 시간 통계"""
+
+    def __init__(self):
+        self.submitted = 0
+        self.dispatched = 0
+        self.total_wait = 0.0
+        self.waits = deque(maxlen=1024)
+
+    def record(self, wait: float):
+        self.dispatched += 1
+        self.total_wait += wait
+        self.waits.append(wait)
+
+    def percentile_ms(self, q: float) -> float:
+        if not self.waits:
+            return 0.0
+        waits = sorted(self.waits)
+        return waits[min(len(waits) - 1, int(q * len(waits)))] * 1000.0
+
+
+class InferenceBatcher:
+    """비동기 마이크로 배칭 큐"""
+
+    def __init__(
+        self,
+        service=None,
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10.0,
+        max_concurrent_batches: int = 1,
+        max_concurrent_tiled: int = 1,
+    ):
+        self.service = service
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.max_concurrent_batches = max(1, max_concurrent_batches)
+        self.max_concurrent_tiled = max(1, max_concurrent_tiled)
+        self._queue: Optional[FairQueue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+
+        # 튜닝용 카운터
+        self.submitted = 0
+        self.cancelled = 0
+        self.running_batches = 0
+        self.running_tiled = 0
+        self.batches = 0
+        self.batched_items = 0
+        self.max_queue_depth = 0
+        self.batch_size_counts: Dict[int, int] = {}
+        self.total_wait_time = 0.0
+        self.class_stats = {p: _ClassStats() for p in PRIORITIES}
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._queue = FairQueue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(
+        self,
+        image_input: ImageInput,
+        mode: str = "full",
+        tiled: bool = False,
+        priority: str = "routine",
+        user: Hashable = None,
+        weight: float = 1.0,
+        profile: bool = False,
+    ) -> Dict:
+        """
+        이미지 하나를 큐에 넣고 배치 처리 결과를 기다림
+
+        - tiled: 고해상도 타일 추론 (타일 자체가 배치이므로 배치 슬롯 밖에서 요청마다 따로 실행,
+          원본 전체를 디코딩하므로 동시 실행 수는 max_concurrent_tiled로 따로 제한)
+        - priority: urgent / routine / batch
+        - user: 공정 큐 단위 (같은 등급 안에서 사용자끼리 번갈아 처리), weight: 사용자 몫 가중치
+        - profile: 단계별 시간 측정 요청 (이 요청이 든 배치는 항상 측정, 나머지는 샘플링)
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority}")
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put(_Item(
+            image_input, mode, tiled, future, time.perf_counter(), priority, user, weight, tracing.current(), profile
+        ))
+        self.submitted += 1
+        self.class_stats[priority].submitted += 1
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        return await future
+
+    async def _collect(self) -> List[_Item]:
+        """첫 요청 이후 max_wait 동안 또는 max_batch_size까지 요청을 모음 (urgent는 기다리지 않음)"""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + (0.0 if batch[0].priority == "urgent" else self.max_wait)
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        slots = asyncio.Semaphore(self.max_concurrent_batches)
+        tiled_slots = asyncio.Semaphore(self.max_concurrent_tiled)
+        while True:
+            # 실행 슬롯이 빈 뒤에 배치를 고름 (실행 중에 들어온 urgent가 다음 배치 맨 앞에 오도록)
+            await slots.acquire()
+            try:
+                collected = await self._collect()
+            except BaseException:
+                slots.release()
+                raise
+            # 대기 중 연결이 끊긴 요청은 제외
+            batch = [item for item in collected if not item.future.done()]
+            self.cancelled += len(collected) - len(batch)
+            if not batch:
+                slots.release()
+                continue
+
+            now = time.perf_counter()
+            self.batches += 1
+            self.batched_items += len(batch)
+            self.batch_size_counts[len(batch)] = self.batch_size_counts.get(len(batch), 0) + 1
+            self.total_wait_time += sum(now - item.enqueued_at for item in batch)
+            for item in batch:
+                self.class_stats[item.priority].record(now - item.enqueued_at)
+
+            # 타일 추론은 요청 하나가 이미 타일 배치이므로 배치 슬롯 밖에서 요청마다 따로 실행
+            # (고해상도 한 장이 같은 배치의 다른 결과나 다음 배치를 붙잡지 않도록)
+            for item in batch:
+                if item.tiled:
+                    self._start(self._execute_tiled(item, tiled_slots))
+            batch = [item for item in batch if not item.tiled]
+            if not batch:
+                slots.release()
+                continue
+
+            # 워커 풀이 있으면 여러 배치를 동시에 흘려보냄
+            task = self._start(self._execute(batch))
+            task.add_done_callback(lambda _: slots.release())
+
+    def _start(self, coro) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+        return task
+
+    async def _execute(self, batch: List[_Item]):
+        self.running_batches += 1
+        try:
+            # 모드가 다르면 실행할 연산이 다르므로 모드별로 나눠 순전파
+            groups: Dict[str, List[_Item]] = {}
+            for item in batch:
+                groups.setdefault(item.mode, []).append(item)
+            for mode, items in groups.items():
+                await self._execute_group(mode, False, items)
+        finally:
+            self.running_batches -= 1
+
+    async def _execute_tiled(self, item: _Item, tiled_slots: asyncio.Semaphore):
+        # 타일 추론은 요청마다 원본 전체를 디코딩하므로 별도 슬롯으로 동시 실행 수를 제한
+        # (슬롯을 기다리는 동안에는 업로드 바이트만 들고 있음)
+        async with tiled_slots:
+            if item.future.done():
+                self.cancelled += 1
+                return
+            self.running_tiled += 1
+            try:
+                await self._execute_group(item.mode, True, [item])
+            finally:
+                self.running_tiled -= 1
+
+    async def _execute_group(self, mode: str, tiled: bool, items: List[_Item]):
+        started = time.perf_counter()
+        profile = should_profile(any(item.profile for item in items))
+        predict = functools.partial(self._predict_group, mode, tiled, [item.image_input for item in items], profile)
+        parents = tuple(span for item in items for span in item.trace)
+        if parents:
+            # 배치 안의 스팬은 샘플링된 요청마다 기록 (executor 스레드로 부모를 넘김)
+            now_ns, now = time.time_ns(), time.perf_counter()
+            for item in items:
+                tracing.record(
+                    "inference.queue", item.trace, now_ns - int((now - item.enqueued_at) * 1e9), now_ns,
+                    priority=item.priority,
+                )
+            context = contextvars.copy_context()
+            context.run(tracing.attach, parents)
+            predict = functools.partial(context.run, predict)
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(None, predict)
+        except Exception as e:
+            logger.error(f"Batch inference error: {e}")
+            results = [{"error": True, "message": str(e)} for _ in items]
+
+        for item, result in zip(items, results):
+            if "timings" in result:
+                # 배치 큐 + 실행 슬롯 대기
+                queue_ms = round((started - item.enqueued_at) * 1000.0, 3)
+                result["timings"]["queue"] = queue_ms
+                stage_profiler.record({"queue": queue_ms})
+            if not item.future.done():
+                item.future.set_result(result)
+
+    def _predict_group(self, mode: str, tiled: bool, image_inputs: List[ImageInput], profile: bool) -> List[Dict]:
+        # service가 없으면 백그라운드 로드된 서비스 사용 (준비 전이면 ModelNotReady → 에러 결과)
+        service = self.service if self.service is not None else model_state.get()
+        with tracing.span("inference.batch", mode=mode, tiled=tiled, batch_size=len(image_inputs)):
+            if tiled:
+                return [service.predict_tiled(image_input, mode, profile) for image_input in image_inputs]
+            return service.predict_batch(image_inputs, mode, profile)
+
+    def get_stats(self) -> Dict:
+        depths = self._queue.qsize_by_priority() if self._queue is not None else {}
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "max_concurrent_batches": self.max_concurrent_batches,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_concurrent_tiled": self.max_concurrent_tiled,
+            "running_batches": self.running_batches,
+            "running_tiled": self.running_tiled,
+            "max_queue_depth": self.max_queue_depth,
+            "submitted": self.submitted,
+            "cancelled": self.cancelled,
+            "batches": self.batches,
+            "batched_items": self.batched_items,
+            "avg_batch_size": self.batched_items / self.batches if self.batches else 0.0,
+            "avg_queue_wait_ms": self.total_wait_time / self.batched_items * 1000.0 if self.batched_items else 0.0,
+            "batch_size_counts": dict(sorted(self.batch_size_counts.items())),
+            "priorities": {
+                p: {
+                    "queue_depth": depths.get(p, 0),
+                    "submitted": stats.submitted,
+                    "dispatched": stats.dispatched,
+                    "avg_wait_ms": stats.total_wait / stats.dispatched * 1000.0 if stats.dispatched else 0.0,
+                    "wait_p50_ms": stats.percentile_ms(0.5),
+                    "wait_p99_ms": stats.percentile_ms(0.99),
+                }
+                for p, stats in self.class_stats.items()
+            },
+        }
+
+
+inference_batcher = InferenceBatcher(
+    max_batch_size=settings.AI_BATCH_MAX_SIZE,
+    max_wait_ms=settings.AI_BATCH_MAX_WAIT_MS,
+    max_concurrent_batches=max(1, settings.AI_WORKER_PROCESSES),
+    max_concurrent_tiled=settings.AI_TILE_MAX_CONCURRENT,
+)
@@ -0,0 +1,131 @@
+"""
+MTL 모델 체크포인트 로더
+- 모델 구조는 사전학습 가중치 없이 생성 (ImageNet 가중치 다운로드/초기화 생략, 어차피 체크포인트로 덮어씀)
+- .safetensors: 파일을 mmap으로 열고 텐서를 그대로 파라미터로 연결 (assign=True, 복사/언피클링 없음)
+- .pth: weights_only=True + mmap으로 로드 (임의 코드 언피클링 금지)
+- AI_MODEL_PATH가 .pth여도 옆에 같은 이름의 .safetensors가 있으면 그쪽을 사용
+
+변환: python convert_checkpoint.py unet_resnet50_best.pth
+"""
+
+import logging
+import pickle
+import time
+import zipfile
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+import torch
+import torch.nn as nn
+
+logger = logging.getLogger(__name__)
+
+SAFETENSORS_SUFFIX = ".safetensors"
+# 학습 스크립트가 state_dict를 감싸 저장한 경우의 키
+WRAPPER_KEYS = ("model_state_dict", "state_dict", "model")
+
+
+class LoadReport(NamedTuple):
+    """체크포인트 로드 결과 (누락/예상 밖 키는 구조화해서 보고)"""
+
+    path: str
+    format: str
+    tensors: int
+    missing_keys: List[str]
+    unexpected_keys: List[str]
+    load_seconds: float
+
+    @property
+    def clean(self) -> bool:
+        return not self.missing_keys and not self.unexpected_keys
+
+    def to_dict(self, max_keys: int = 20) -> Dict:
+        return {
+            "path": self.path,
+            "format": self.format,
+            "tensors": self.tensors,
+            "missing_keys": len(self.missing_keys),
+            "unexpected_keys": len(self.unexpected_keys),
+            "missing_keys_sample": self.missing_keys[:max_keys],
+            "unexpected_keys_sample": self.unexpected_keys[:max_keys],
+            "load_seconds": round(self.load_seconds, 3),
+        }
+
+
+def resolve_checkpoint(path: Path) -> Path:
+    """.pth 옆에 변환된 .safetensors가 있으면 그 경로를 반환"""
+    if path.suffix != SAFETENSORS_SUFFIX:
+        converted = path.with_suffix(SAFETENSORS_SUFFIX)
+        if converted.exists():
+            return converted
+    return path
+
+
+def unwrap_state_dict(checkpoint) -> Dict[str, torch.Tensor]:
+    """{"model_state_dict": ...} 같은 래퍼를 벗기고 텐서만 남김"""
+    if isinstance(checkpoint, dict):
+        for key in WRAPPER_KEYS:
+            if isinstance(checkpoint.get(key), dict):
+                checkpoint = checkpoint[key]
+                break
+    if not isinstance(checkpoint, dict):
+        raise ValueError(f"Checkpoint is not a state_dict: {type(checkpoint).__name__}")
+    return {k: v for k, v in checkpoint.items() if isinstance(v, torch.Tensor)}
+
+
+def read_state_dict(path: Path, allow_pickle: bool = False) -> Dict[str, torch.Tensor]:
+    """
+    체크포인트 파일을 CPU state_dict로 읽음
+
+    - safetensors는 mmap된 파일 페이지를 그대로 가리키는 텐서 반환
+    - allow_pickle은 신뢰하는 .pth를 변환할 때만 사용 (서빙 경로에서는 항상 False)
+    """
+    if path.suffix == SAFETENSORS_SUFFIX:
+        try:
+            from safetensors.torch import load_file
+        except ImportError as e:
+            raise RuntimeError("safetensors is required to load .safetensors checkpoints") from e
+        return load_file(str(path), device="cpu")
+
+    # 구 형식(zip 아님) 파일은 mmap 불가
+    mmap = zipfile.is_zipfile(path)
+    try:
+        checkpoint = torch.load(path, map_location="cpu", weights_only=True, mmap=mmap)
+    except pickle.UnpicklingError:
+        if not allow_pickle:
+            raise
+        checkpoint = torch.load(path, map_location="cpu", weights_only=False, mmap=mmap)
+    return unwrap_state_dict(checkpoint)
+
+
+def load_checkpoint(model: nn.Module, path: Path) -> LoadReport:
+    """state_dict를 모델에 주입 (텐서를 복사하지 않고 그대로 연결)"""
+    start = time.perf_counter()
+    state_dict = read_state_dict(path)
+    missing_keys, unexpected_keys = model.load_state_dict(state_dict, strict=False, assign=True)
+    report = LoadReport(
+        path=str(path),
+        format="safetensors" if path.suffix == SAFETENSORS_SUFFIX else "pth",
+        tensors=len(state_dict),
+        missing_keys=list(missing_keys),
+        unexpected_keys=list(unexpected_keys),
+        load_seconds=time.perf_counter() - start,
+    )
+    if not report.clean:
+        logger.warning(
+            "⚠️ Checkpoint key mismatch: %d missing %s, %d unexpected %s",
+            len(report.missing_keys), report.missing_keys[:5],
+            len(report.unexpected_keys), report.unexpected_keys[:5],
+        )
+    return report
+
+
+def convert_to_safetensors(src: Path, dst: Optional[Path] = None, allow_pickle: bool = False) -> Path:
+    """.pth 체크포인트를 .safetensors로 변환 (텐서만 저장, 공유 스토리지는 분리)"""
+    from safetensors.torch import save_file
+
+    dst = dst or src.with_suffix(SAFETENSORS_SUFFIX)
+    state_dict = read_state_dict(src, allow_pickle=allow_pickle)
+    tensors = {k: v.detach().contiguous().clone() for k, v in state_dict.items()}
+    save_file(tensors, str(dst), metadata={"format": "pt", "source": src.name})
+    return dst
@@ -0,0 +1,144 @@
+"""
+대시보드 통계 조회 / 일별 집계(진단, 진료) 재계산
+진단 통계는 diagnosis_daily_stats 롤업에서 읽으므로 진단 행 수와 무관하게 (일수 x 분류 x 의사 x 상태) 행만 읽음
+진료 상태별 건수는 GROUP BY 한 번 (ix_visits_status_visit_date 인덱스만 읽음)
+"""
+
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import and_, case, delete, func, insert, select, true
+from sqlalchemy.orm import Session
+
+from app.models.diagnosis import Diagnosis
+from app.models.diagnosis_stats import TUMOR_RATIO_BIN_COLUMNS, TUMOR_RATIO_BINS, DiagnosisDailyStats
+from app.models.visit import Visit
+from app.models.visit_stats import DEFAULT_STATUS, VisitDailyStats
+
+logger = logging.getLogger(__name__)
+
+
+def visit_status_counts(db: Session) -> Dict[str, int]:
+    """전체/완료/대기 진료 건수 (GROUP BY status 한 번)"""
+    counts = dict(db.query(Visit.status, func.count()).group_by(Visit.status).all())
+    return {
+        "total": sum(counts.values()),
+        "completed": counts.get("COMPLETED", 0),
+        "pending": counts.get("PENDING", 0),
+    }
+
+
+def diagnosis_summary(db: Session) -> Dict:
+    """전체/리뷰완료/미검토 진단 건수와 한국어 진단명별 분포 (롤업 GROUP BY 한 번)"""
+    rows = (
+        db.query(DiagnosisDailyStats.prediction_kr, DiagnosisDailyStats.is_reviewed,
+                 func.sum(DiagnosisDailyStats.count))
+        .group_by(DiagnosisDailyStats.prediction_kr, DiagnosisDailyStats.is_reviewed)
+        .all()
+    )
+    total = reviewed = unreviewed = 0
+    distribution: Dict[Optional[str], int] = {}
+    for prediction_kr, is_reviewed, count in rows:
+        count = int(count or 0)
+        if count <= 0:
+            continue
+        total += count
+        if is_reviewed == 1:
+            reviewed += count
+        elif is_reviewed == 0:
+            unreviewed += count
+        distribution[prediction_kr] = distribution.get(prediction_kr, 0) + count
+    return {"total": total, "reviewed": reviewed, "unreviewed": unreviewed, "distribution": distribution}
+
+
+def _date_range(db: Session, column) -> Optional[Tuple[date, date]]:
+    first, last = db.query(func.min(column), func.max(column)).one()
+    if first is None:
+        return None
+    return first.date(), last.date()
+
+
+def _diagnosis_aggregate(window):
+    day = func.date(Diagnosis.created_at)
+    is_reviewed = func.coalesce(Diagnosis.is_reviewed, 0)
+    tumor_ratio = Diagnosis.tumor_ratio
+    bins = []
+    for i, name in enumerate(TUMOR_RATIO_BIN_COLUMNS):
+        lower = tumor_ratio >= i / TUMOR_RATIO_BINS if i else tumor_ratio.isnot(None)
+        upper = tumor_ratio < (i + 1) / TUMOR_RATIO_BINS if i < TUMOR_RATIO_BINS - 1 else true()
+        bins.append(func.coalesce(func.sum(case((and_(lower, upper), 1), else_=0)), 0))
+    columns = ["day", "prediction", "doctor_id", "is_reviewed", "prediction_kr",
+               "count", "confidence_sum", "tumor_ratio_sum", "tumor_ratio_count", *TUMOR_RATIO_BIN_COLUMNS]
+    aggregate = (
+        select(
+            day, Diagnosis.prediction, Visit.doctor_id, is_reviewed,
+            func.max(Diagnosis.prediction_kr),
+            func.count(),
+            func.coalesce(func.sum(Diagnosis.confidence), 0.0),
+            func.coalesce(func.sum(tumor_ratio), 0.0),
+            func.count(tumor_ratio),
+            *bins,
+        )
+        .join(Visit, Visit.id == Diagnosis.visit_id)
+        .where(*window(Diagnosis.created_at))
+        .group_by(day, Diagnosis.prediction, Visit.doctor_id, is_reviewed)
+    )
+    return columns, aggregate
+
+
+def _visit_aggregate(window):
+    day = func.date(Visit.visit_date)
+    status = func.coalesce(Visit.status, DEFAULT_STATUS)
+    aggregate = (
+        select(day, Visit.doctor_id, status, func.count())
+        .where(*window(Visit.visit_date))
+        .group_by(day, Visit.doctor_id, status)
+    )
+    return ["day", "doctor_id", "status", "count"], aggregate
+
+
+# 롤업 이름: (롤업 모델, 원본 날짜 컬럼, 집계 SELECT)
+_ROLLUPS = {
+    "diagnoses": (DiagnosisDailyStats, Diagnosis.created_at, _diagnosis_aggregate),
+    "visits": (VisitDailyStats, Visit.visit_date, _visit_aggregate),
+}
+
+
+def _rebuild(db: Session, name: str, since: Optional[date], until: Optional[date], chunk_days: int) -> int:
+    model, source_date, aggregate_for = _ROLLUPS[name]
+    bounds = _date_range(db, source_date)
+    if bounds is None and (since is None or until is None):
+        return 0
+    since = since or bounds[0]
+    until = until or bounds[1]
+
+    table = model.__table__
+    total = 0
+    start = since
+    while start <= until:
+        end = min(start + timedelta(days=chunk_days), until + timedelta(days=1))
+
+        def window(column):
+            return (column >= datetime.combine(start, datetime.min.time()),
+                    column < datetime.combine(end, datetime.min.time()))
+
+        columns, aggregate = aggregate_for(window)
+        db.execute(delete(table).where(table.c.day >= start, table.c.day < end))
+        db.execute(insert(table).from_select(columns, aggregate))
+        count = db.query(func.coalesce(func.sum(model.count), 0)).filter(
+            model.day >= start, model.day < end).scalar()
+        db.commit()
+        total += count
+        logger.info(f"📊 Rebuilt daily {name} stats {start} ~ {end - timedelta(days=1)}: {count} {name}")
+        start = end
+    return total
+
+
+def backfill(db: Session, since: Optional[date] = None, until: Optional[date] = None,
+             chunk_days: int = 31) -> Dict[str, int]:
+    """
+    [since, until] 기간의 롤업 행(진단/진료)을 지우고 원본 GROUP BY로 다시 채움 (기간별로 나눠 커밋)
+    기본 기간은 원본 행이 있는 전체 기간, 반환값은 롤업별로 다시 계산한 행 수 ({"diagnoses": n, "visits": n})
+    """
+    return {name: _rebuild(db, name, since, until, chunk_days) for name in _ROLLUPS}
@@ -0,0 +1,77 @@
+"""
+/metrics용 추론 파이프라인 메트릭
+요청 경로에는 아무것도 추가하지 않고, 수집 시점에 승인 제어/배처/결과 캐시/단계 프로파일러의 get_stats()를 읽어 변환
+"""
+
+from app.core.metrics import MetricWriter, histogram_samples
+from app.services.admission import admission
+from app.services.batching import inference_batcher
+from app.services.model_state import model_state
+from app.services.profiling import stage_profiler
+from app.services.result_cache import result_cache
+
+
+def _summary(quantiles, total_seconds: float, count: int, **labels):
+    samples = [("", {**labels, "quantile": str(q)}, value) for q, value in quantiles]
+    samples.append(("_sum", labels, total_seconds))
+    samples.append(("_count", labels, count))
+    return samples
+
+
+def collect_inference_metrics(writer: MetricWriter):
+    model = model_state.get_stats()
+    writer.gauge("ai_model_ready", "1 if the AI model is loaded and serving", int(model["ready"]))
+
+    stats = admission.get_stats()
+    writer.gauge("ai_admission_in_flight", "AI requests holding an admission slot", stats["in_flight"])
+    writer.gauge("ai_admission_urgent_in_flight", "Urgent AI requests holding a reserved slot", stats["urgent_in_flight"])
+    writer.gauge("ai_admission_queued", "AI requests waiting for an admission slot", stats["queued"])
+    writer.gauge("ai_admission_max_concurrent", "Configured AI admission slots", stats["max_concurrent"])
+    writer.counter("ai_admission_admitted", "AI requests admitted", stats["admitted"])
+    writer.family("ai_admission_rejected", "counter", "AI requests rejected by admission control", [
+        ("_total", {"reason": "queue_full"}, stats["rejected_queue_full"]),
+        ("_total", {"reason": "timeout"}, stats["rejected_timeout"]),
+    ])
+    writer.counter("ai_admission_cancelled", "AI requests cancelled by client disconnect", stats["cancelled"])
+
+    stats = inference_batcher.get_stats()
+    priorities = stats["priorities"]
+    writer.family("ai_batch_queue_depth", "gauge", "Images waiting in the inference batch queue", [
+        ("", {"priority": name}, p["queue_depth"]) for name, p in priorities.items()
+    ])
+    writer.family("ai_batch_submitted", "counter", "Images submitted to the inference batcher", [
+        ("_total", {"priority": name}, p["submitted"]) for name, p in priorities.items()
+    ])
+    queue_wait = []
+    for name, p in priorities.items():
+        queue_wait.extend(_summary(
+            [(0.5, p["wait_p50_ms"] / 1000.0), (0.99, p["wait_p99_ms"] / 1000.0)],
+            p["avg_wait_ms"] * p["dispatched"] / 1000.0, p["dispatched"], priority=name,
+        ))
+    writer.family("ai_batch_queue_wait_seconds", "summary", "Batch queue wait by priority (recent window)", queue_wait)
+    writer.gauge("ai_batch_running", "Inference batches currently executing", stats["running_batches"])
+    writer.counter("ai_batch_cancelled", "Queued images skipped because the client went away", stats["cancelled"])
+    sizes = stats["batch_size_counts"]
+    buckets = list(range(1, stats["max_batch_size"] + 1))
+    counts = [sizes.get(size, 0) for size in buckets] + [sum(c for s, c in sizes.items() if s > buckets[-1])]
+    writer.family("ai_batch_size", "histogram", "Images per executed inference batch",
+                  histogram_samples({}, buckets, counts, stats["batched_items"]))
+
+    stage_samples = []
+    for name, s in stage_profiler.get_stats().items():
+        stage_samples.extend(_summary(
+            [(0.5, s["p50_ms"] / 1000.0), (0.95, s["p95_ms"] / 1000.0), (0.99, s["p99_ms"] / 1000.0)],
+            s["total_ms"] / 1000.0, s["count"], stage=name,
+        ))
+    writer.family("ai_stage_duration_seconds", "summary", "Inference stage latency (recent window)", stage_samples)
+
+    stats = result_cache.get_stats()
+    writer.family("ai_result_cache_lookups", "counter", "Result cache lookups by outcome", [
+        ("_total", {"result": result}, stats[key])
+        for result, key in (("memory", "memory_hits"), ("disk", "disk_hits"),
+                            ("coalesced", "coalesced"), ("miss", "misses"))
+    ])
+    writer.gauge("ai_result_cache_hit_ratio", "Result cache hit ratio since start", stats["hit_ratio"])
+    writer.gauge("ai_result_cache_entries", "Entries in the in-memory result cache", stats["entries"])
+    writer.gauge("ai_result_cache_bytes", "Bytes held by the in-memory result cache", stats["memory_bytes"])
+    writer.counter("ai_result_cache_evictions", "In-memory result cache evictions", stats["evictions"])
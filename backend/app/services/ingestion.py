@@ -0,0 +1,203 @@
+"""
+업로드 이미지 수집 (임시 파일 없이 메모리에서 바로 디코딩)
+
+- 크기 상한은 폼 파싱 전에 검사 (UploadLimitMiddleware: Content-Length, 없으면 받은 바이트 수로 413)
+- AI 업로드 폼은 엔드포인트의 upload_form 의존성에서 파싱
+  → 인증/모델 준비/승인 제어 의존성을 통과한 요청만 본문을 읽음 (동시 버퍼 수 = 승인 슬롯 수)
+  → 파일은 상한까지 메모리에 둠 (이 파서에서만, 다른 multipart 라우트는 Starlette 기본 1MB 스풀 그대로)
+- 헤더만 읽어 픽셀 수를 확인하고 디컴프레션 폭탄 차단 (PIL 전역 한도는 바꾸지 않고 직접 비교)
+- JPEG는 draft 모드로 목표 크기 근처(1/2, 1/4, 1/8 배율)에서 바로 디코딩
+"""
+
+import io
+import warnings
+from typing import AsyncIterator, Dict, List, Optional, Type, TypeVar, Union
+
+from fastapi import HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from PIL import Image
+from pydantic import BaseModel, ValidationError
+from starlette.datastructures import FormData, UploadFile
+from starlette.formparsers import MultiPartException, MultiPartParser
+from starlette.responses import JSONResponse
+
+from app.core import tracing
+from app.core.config import settings
+
+# 추론 입력: 파일 경로, 업로드 바이트, 디코딩된 이미지
+ImageInput = Union[str, bytes, Image.Image]
+
+M = TypeVar("M", bound=BaseModel)
+
+# multipart 경계/헤더/폼 필드 여유 (본문 상한 = 파일 상한 + 여유)
+FORM_OVERHEAD_BYTES = 64 * 1024
+# AI 업로드 폼의 파일 외 필드 수 상한
+MAX_FORM_FIELDS = 16
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"이미지 파일이 너무 큽니다. (최대 {max_bytes // (1024 * 1024)}MB)",
+    )
+
+
+class UploadLimitMiddleware:
+    """
+    multipart 요청 본문이 상한을 넘으면 폼 파싱(임시 파일 기록) 전에 413
+
+    - Content-Length가 있으면 본문을 읽기 전에 거부
+    - 없으면(chunked) 받은 바이트 수를 세다가 넘는 순간 중단
+    """
+
+    def __init__(self, app, max_bytes: Optional[int] = None):
+        self.app = app
+        self.max_bytes = max_bytes or settings.AI_MAX_UPLOAD_BYTES
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        if not headers.get(b"content-type", b"").startswith(b"multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.max_bytes + FORM_OVERHEAD_BYTES
+        try:
+            length = int(headers.get(b"content-length", b""))
+        except ValueError:
+            length = None
+        if length is not None and length > limit:
+            error = _too_large(self.max_bytes)
+            response = JSONResponse({"detail": error.detail}, status_code=error.status_code)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def receive_limited():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # FastAPI가 폼 파싱 중 HTTPException은 그대로 올려 413으로 응답
+                    raise _too_large(self.max_bytes)
+            return message
+
+        await self.app(scope, receive_limited, send)
+
+
+class InMemoryMultiPartParser(MultiPartParser):
+    """파일 파트를 본문 상한까지 메모리에 두는 파서 (upload_form 전용)"""
+
+    # Starlette 버전에 따라 속성 이름이 다름 (0.40 이전: max_file_size)
+    spool_max_size = max_file_size = settings.AI_MAX_UPLOAD_BYTES + FORM_OVERHEAD_BYTES
+
+
+async def upload_form(request: Request) -> AsyncIterator[FormData]:
+    """
+    AI 업로드 라우트 의존성: multipart 본문을 메모리로 파싱 (응답 후 파일 닫음)
+    다른 의존성(모델 준비, 승인 제어) 뒤에 선언해야 그 검사를 통과한 요청만 본문을 읽음
+    """
+    if not request.headers.get("content-type", "").startswith("multipart/form-data"):
+        raise HTTPException(status_code=415, detail="multipart/form-data 요청이어야 합니다.")
+    with tracing.span("upload.read") as scope:
+        parser = InMemoryMultiPartParser(
+            request.headers, request.stream(), max_files=1, max_fields=MAX_FORM_FIELDS
+        )
+        try:
+            form = await parser.parse()
+        except MultiPartException as e:
+            raise HTTPException(status_code=400, detail=e.message)
+        scope.set_attribute("upload.bytes", sum(
+            value.size or 0 for _, value in form.multi_items() if isinstance(value, UploadFile)
+        ))
+    try:
+        yield form
+    finally:
+        await form.close()
+
+
+def form_file(form: FormData, name: str) -> UploadFile:
+    """폼의 파일 필드 (없으면 422)"""
+    value = form.get(name)
+    if not isinstance(value, UploadFile):
+        raise RequestValidationError([
+            {"type": "missing", "loc": ("body", name), "msg": "Field required", "input": None}
+        ])
+    return value
+
+
+def form_fields(form: FormData, model: Type[M]) -> M:
+    """폼의 파일 외 필드를 model로 검증 (실패하면 FastAPI와 같은 422)"""
+    values = {key: value for key, value in form.multi_items() if not isinstance(value, UploadFile)}
+    try:
+        return model.model_validate(values)
+    except ValidationError as e:
+        raise RequestValidationError([{**error, "loc": ("body", *error["loc"])} for error in e.errors()])
+
+
+def multipart_body(properties: Dict[str, dict], required: List[str]) -> dict:
+    """upload_form을 쓰는 라우트의 OpenAPI 요청 본문 (openapi_extra)"""
+    schema = {"type": "object", "properties": properties, "required": required}
+    return {"requestBody": {"required": True, "content": {"multipart/form-data": {"schema": schema}}}}
+
+
+class ImageRejected(ValueError):
+    """디코딩 전에 거부된 이미지"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+async def read_upload(upload: UploadFile, max_bytes: Optional[int] = None) -> bytes:
+    """
+    업로드를 메모리 버퍼로 반환 (상한 초과 시 413)
+    본문은 UploadLimitMiddleware가 이미 제한했고 upload_form이 메모리에 두었으므로 한 번에 읽음
+    """
+    max_bytes = max_bytes or settings.AI_MAX_UPLOAD_BYTES
+    if upload.size is not None and upload.size > max_bytes:
+        raise _too_large(max_bytes)
+    data = await upload.read()
+    if len(data) > max_bytes:
+        raise _too_large(max_bytes)
+    if not data:
+        raise HTTPException(status_code=400, detail="빈 파일입니다.")
+    return data
+
+
+def probe_image(data: bytes, max_pixels: Optional[int] = None) -> Image.Image:
+    """헤더만 읽어 형식과 크기 검증 (픽셀 데이터는 디코딩하지 않음)"""
+    max_pixels = max_pixels or settings.AI_MAX_IMAGE_PIXELS
+    try:
+        # 한도는 아래에서 직접 비교 (PIL 기본 한도 경고는 이 호출에서만 끔, 2배 초과는 그대로 에러)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+            image = Image.open(io.BytesIO(data))
+    except Image.DecompressionBombError as e:
+        raise ImageRejected(str(e), status_code=413)
+    except Exception:
+        raise ImageRejected("이미지를 읽을 수 없습니다.")
+    width, height = image.size
+    if width * height > max_pixels:
+        raise ImageRejected(
+            f"이미지 해상도가 너무 큽니다. ({width}x{height}, 최대 {max_pixels:,} 픽셀)",
+            status_code=413,
+        )
+    return image
+
+
+def decode_image(data: bytes, target_size: Optional[int] = 512) -> Image.Image:
+    """
+    메모리 버퍼에서 RGB 이미지로 디코딩
+
+    - target_size: JPEG는 두 변 모두 target_size 이상인 가장 작은 DCT 배율로 디코딩
+      (None이면 원본 해상도, 타일 추론용)
+    """
+    image = probe_image(data)
+    if target_size and image.format == "JPEG":
+        image.draft("RGB", (target_size, target_size))
+    return image.convert("RGB")
@@ -0,0 +1,144 @@
+"""
+AI 모델 로딩 상태 관리
+torch / segmentation_models_pytorch 임포트와 체크포인트 로드를 임포트 시점이 아닌
+앱 시작 후 백그라운드에서 수행 → /health는 바로 응답하고, AI 라우트는 준비 전까지 503
+
+- 이 모듈은 torch를 임포트하지 않음 (환자/진료 CRUD만 쓰는 배포는 AI_ENABLED=false)
+- 상태: disabled / pending / loading / ready / failed
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DISABLED = "disabled"
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class ModelNotReady(RuntimeError):
+    """모델이 아직 로드되지 않았거나 로드에 실패함"""
+
+    def __init__(self, status: str, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class ModelState:
+    """MTLAIService 지연 로더"""
+
+    def __init__(self, enabled: bool = True):
+        self.status = PENDING if enabled else DISABLED
+        self.service = None
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.load_seconds: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status == READY
+
+    def start_loading(self):
+        """이벤트 루프에서 백그라운드 로드 시작 (중복 호출 무시)"""
+        if self.status != PENDING or self._task is not None:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._load())
+
+    async def _load(self):
+        self.status = LOADING
+        self.started_at = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        try:
+            service = await loop.run_in_executor(None, self._build_service)
+        except Exception as e:
+            self.status = FAILED
+            self.error = str(e)
+            logger.error(f"❌ Failed to initialize MTL AI Service: {e}")
+            return
+        self.load_seconds = time.perf_counter() - self.started_at
+        # 워커는 forkserver로 시작해서 백엔드를 다시 만들 때까지 기다리므로 이벤트 루프 밖에서
+        await loop.run_in_executor(None, self._start_worker_pool, service)
+        self.service = service
+        self.status = READY
+        logger.info(f"✅ MTL AI Service initialized ({self.load_seconds:.1f}s)")
+
+    @staticmethod
+    def _build_service():
+        from app.services.ai_service import MTLAIService
+
+        return MTLAIService()
+
+    @staticmethod
+    def _start_worker_pool(service):
+        """추론 워커 풀 시작 (AI_WORKER_PROCESSES > 0 이고 CPU 추론일 때)"""
+        if settings.AI_WORKER_PROCESSES <= 0:
+            return
+        if service.device.type != "cpu":
+            logger.warning("⚠️ Inference worker pool is CPU-only; running in-process on %s", service.device)
+            return
+        try:
+            service.start_worker_pool(settings.AI_WORKER_PROCESSES, settings.AI_WORKER_THREADS)
+        except Exception as e:
+            logger.error(f"❌ Failed to start inference worker pool: {e}")
+
+    def load_blocking(self):
+        """이벤트 루프 없이 바로 로드 (스크립트/벤치마크용)"""
+        if self.status == READY:
+            return self.service
+        self.started_at = time.perf_counter()
+        self.service = self._build_service()
+        self.load_seconds = time.perf_counter() - self.started_at
+        self.status = READY
+        return self.service
+
+    def get(self):
+        """로드된 서비스 반환, 준비 전이면 ModelNotReady"""
+        if self.status == READY:
+            return self.service
+        if self.status == DISABLED:
+            raise ModelNotReady(self.status, "AI 기능이 비활성화되어 있습니다.")
+        if self.status == FAILED:
+            raise ModelNotReady(self.status, f"AI 모델 로드에 실패했습니다: {self.error}")
+        raise ModelNotReady(self.status, "AI 모델을 불러오는 중입니다. 잠시 후 다시 시도하세요.")
+
+    def shutdown(self):
+        if self.service is not None:
+            self.service.shutdown_worker_pool()
+
+    def get_stats(self) -> Dict:
+        elapsed = None
+        if self.status == LOADING and self.started_at is not None:
+            elapsed = round(time.perf_counter() - self.started_at, 2)
+        return {
+            "status": self.status,
+            "ready": self.ready,
+            "error": self.error,
+            "load_seconds": round(self.load_seconds, 2) if self.load_seconds is not None else None,
+            "loading_seconds": elapsed,
+            "model_version": getattr(self.service, "model_version", None),
+        }
+
+
+model_state = ModelState(enabled=settings.AI_ENABLED)
+
+
+def require_model():
+    """
+    AI 라우트 의존성: 모델 준비 전이면 바로 503
+    라우트의 첫 의존성으로 두고 본문은 ingestion.upload_form 의존성에서 읽으므로 업로드를 읽기 전에 응답
+    """
+    try:
+        return model_state.get()
+    except ModelNotReady as e:
+        headers = {"Retry-After": "5"} if e.status in (PENDING, LOADING) else None
+        raise HTTPException(status_code=503, detail=str(e), headers=headers)
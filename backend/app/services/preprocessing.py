@@ -0,0 +1,79 @@
+"""
+MTL 모델 입력 전처리
+uint8 HWC 이미지 → 정규화된 float NCHW 텐서를 한 번의 융합 연산으로 생성
+
+- (x / 255 - mean) / std 를 x * scale + bias 로 미리 접어 addcmul 한 번으로 계산
+- 출력은 스레드별로 미리 할당해 둔 버퍼에 바로 기록 (호출마다 새 텐서를 만들지 않음)
+- PIL → np.asarray 결과는 읽기 전용이라 스레드별 uint8 버퍼에 복사한 뒤 텐서로 읽음
+  (torch.from_numpy 경고를 전역으로 끄지 않고, 이미지마다 새로 할당하지도 않음)
+- channels_last 버퍼면 HWC 입력이 그대로 메모리 순서와 일치
+- 출력 쪽 softmax는 NumPy로 옮긴 로짓에 바로 적용 (텐서 → NumPy 변환 한 번)
+"""
+
+import threading
+from typing import Sequence
+
+import numpy as np
+import torch
+
+IMAGENET_MEAN = (0.485, 0.456, 0.406)
+IMAGENET_STD = (0.229, 0.224, 0.225)
+
+
+class Preprocessor:
+    """재사용 버퍼 기반 배치 전처리기"""
+
+    def __init__(
+        self,
+        size: int = 512,
+        mean: Sequence[float] = IMAGENET_MEAN,
+        std: Sequence[float] = IMAGENET_STD,
+        channels_last: bool = False,
+    ):
+        self.size = size
+        self.channels_last = channels_last
+        mean_t = torch.tensor(mean, dtype=torch.float32).view(3, 1, 1)
+        std_t = torch.tensor(std, dtype=torch.float32).view(3, 1, 1)
+        self.scale = 1.0 / (255.0 * std_t)
+        self.bias = -mean_t / std_t
+        self._local = threading.local()
+
+    def _buffer(self, batch_size: int) -> torch.Tensor:
+        """현재 스레드의 출력 버퍼 (부족할 때만 키워서 재할당)"""
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None or buffer.shape[0] < batch_size:
+            memory_format = torch.channels_last if self.channels_last else torch.contiguous_format
+            buffer = torch.empty(batch_size, 3, self.size, self.size).to(memory_format=memory_format)
+            self._local.buffer = buffer
+        return buffer[:batch_size]
+
+    def _staging(self) -> torch.Tensor:
+        """현재 스레드의 uint8 HWC 입력 버퍼 (읽기 전용 배열을 복사해 둘 곳)"""
+        staging = getattr(self._local, "staging", None)
+        if staging is None:
+            staging = torch.empty(self.size, self.size, 3, dtype=torch.uint8)
+            self._local.staging = staging
+        return staging
+
+    def __call__(self, images: Sequence[np.ndarray]) -> torch.Tensor:
+        """
+        (size, size, 3) uint8 배열 목록 → (N, 3, size, size) float32
+
+        - 반환 텐서는 같은 스레드의 다음 호출에서 덮어써지므로 순전파가 끝날 때까지만 사용
+        """
+        out = self._buffer(len(images))
+        staging = self._staging()
+        staging_np = staging.numpy()
+        chw = staging.permute(2, 0, 1)
+        for i, image in enumerate(images):
+            np.copyto(staging_np, image)
+            torch.addcmul(self.bias, chw, self.scale, out=out[i])
+        return out
+
+    def single(self, image: np.ndarray) -> torch.Tensor:
+        return self([image])
+
+
+def softmax(logits: np.ndarray, axis: int = -1) -> np.ndarray:
+    shifted = np.exp(logits - logits.max(axis=axis, keepdims=True))
+    return shifted / shifted.sum(axis=axis, keepdims=True)
@@ -0,0 +1,176 @@
+"""
+추론 단계별 프로파일링
+processing_time 하나로는 느린 노드에서 CPU 시간이 어디에 쓰이는지 알 수 없어서 단계별로 시간을 잼
+
+단계
+- decode: 이미지 디코딩 + 512 리사이즈 (이미지별)
+- preprocess: 정규화 + 텐서 변환 (배치)
+- encoder / decoder / classifier: eager 계열 백엔드의 모델 구간 (배치)
+- forward: 구간을 나눌 수 없는 백엔드(torchscript, compile, onnxruntime, int8, 워커 풀, 타일 추론)의 순전파 전체
+- postprocess: 출력 → NumPy, 세그멘테이션 통계 (이미지별)
+- overlay: 세그멘테이션 이미지 렌더링 + base64 인코딩 (이미지별)
+- persist: 진료 기록 DB 저장 (/clinical/diagnose)
+- queue: 배치 큐 대기
+
+- 측정 대상: X-Debug-Timings 헤더가 있는 요청이 든 배치, AI_PROFILE_SAMPLE_RATE 비율로 샘플링한 배치
+  (AI_PROFILE_STAGES=true면 모든 배치, CUDA는 단계마다 동기화하므로 운영에서는 끔)
+- 응답: 요청 헤더 X-Debug-Timings가 있으면 timings(ms)를 포함 (캐시 적중이면 원래 추론의 값)
+- 통계: 측정한 배치의 단계별 최근 AI_PROFILE_WINDOW개 값의 p50/p95/p99 (/ai/stats의 stages)
+- 트레이스: AI_PROFILE_TRACE_DIR을 지정하면 AI_PROFILE_TRACE_SAMPLE_RATE 비율의 배치를
+  torch.profiler로 기록해 Chrome 트레이스(JSON)로 저장 (단계 이름이 record_function 구간으로 보임)
+"""
+
+import contextlib
+import logging
+import random
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, Optional
+
+from app.core import tracing
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    import torch
+
+# torch는 실제로 측정/트레이스할 때만 import (AI_ENABLED=false인 CRUD 전용 서버는 torch 없이 동작)
+
+logger = logging.getLogger(__name__)
+
+STAGES = (
+    "queue", "decode", "preprocess", "encoder", "decoder", "classifier",
+    "forward", "postprocess", "overlay", "persist",
+)
+DEBUG_HEADER = "x-debug-timings"
+
+
+class StageTimer:
+    """
+    한 배치(또는 요청)의 단계별 시간 누적
+
+    - 같은 단계를 여러 번 재면 합산 (이미지별 단계를 배치 합계로)
+    - CUDA 장치면 단계 경계마다 동기화해야 실제 GPU 시간이 잡힘
+    """
+
+    def __init__(self, device: Optional["torch.device"] = None, enabled: bool = True):
+        self.enabled = enabled
+        self.sync_cuda = enabled and device is not None and device.type == "cuda"
+        self.seconds: Dict[str, float] = {}
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        import torch
+
+        if self.sync_cuda:
+            torch.cuda.synchronize()
+        start = time.perf_counter()
+        with tracing.span(f"inference.{name}"), torch.profiler.record_function(f"stage/{name}"):
+            yield
+        if self.sync_cuda:
+            torch.cuda.synchronize()
+        self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float):
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+
+    def merge(self, other: "StageTimer"):
+        for name, seconds in other.seconds.items():
+            self.add(name, seconds)
+
+    def to_ms(self) -> Dict[str, float]:
+        return {name: round(seconds * 1000.0, 3) for name, seconds in self.seconds.items()}
+
+
+class StageProfiler:
+    """단계별 최근 지연(ms) 윈도우와 누적 합계 (스레드 안전, 워커 스레드에서 기록)"""
+
+    def __init__(self, window: int = 1024):
+        self._lock = threading.Lock()
+        self._samples: Dict[str, deque] = {}
+        self._totals: Dict[str, float] = {}
+        self._counts: Dict[str, int] = {}
+        self.window = max(1, window)
+
+    def record(self, timings_ms: Dict[str, float]):
+        with self._lock:
+            for name, ms in timings_ms.items():
+                self._samples.setdefault(name, deque(maxlen=self.window)).append(ms)
+                self._totals[name] = self._totals.get(name, 0.0) + ms
+                self._counts[name] = self._counts.get(name, 0) + 1
+
+    @staticmethod
+    def _percentile(values, q: float) -> float:
+        return values[min(len(values) - 1, int(q * len(values)))]
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            samples = {name: sorted(values) for name, values in self._samples.items()}
+            totals = dict(self._totals)
+            counts = dict(self._counts)
+        order = {name: i for i, name in enumerate(STAGES)}
+        stats = {}
+        for name in sorted(samples, key=lambda n: order.get(n, len(order))):
+            values = samples[name]
+            stats[name] = {
+                "count": counts[name],
+                "total_ms": round(totals[name], 1),
+                "p50_ms": round(self._percentile(values, 0.5), 3),
+                "p95_ms": round(self._percentile(values, 0.95), 3),
+                "p99_ms": round(self._percentile(values, 0.99), 3),
+            }
+        return stats
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._totals.clear()
+            self._counts.clear()
+
+
+stage_profiler = StageProfiler(window=settings.AI_PROFILE_WINDOW)
+
+
+@contextlib.contextmanager
+def sampled_trace(tag: str, device: Optional["torch.device"] = None) -> Iterator[None]:
+    """AI_PROFILE_TRACE_DIR이 있고 샘플에 걸리면 torch.profiler 트레이스를 저장"""
+    trace_dir = settings.AI_PROFILE_TRACE_DIR
+    if not trace_dir or random.random() >= settings.AI_PROFILE_TRACE_SAMPLE_RATE:
+        yield
+        return
+    import torch
+
+    activities = [torch.profiler.ProfilerActivity.CPU]
+    if device is not None and device.type == "cuda":
+        activities.append(torch.profiler.ProfilerActivity.CUDA)
+    with torch.profiler.profile(activities=activities, record_shapes=True) as prof:
+        yield
+    try:
+        path = Path(trace_dir)
+        path.mkdir(parents=True, exist_ok=True)
+        trace_path = path / f"trace-{time.strftime('%Y%m%d-%H%M%S')}-{threading.get_ident()}-{tag}.json"
+        prof.export_chrome_trace(str(trace_path))
+        logger.info(f"📈 Saved inference trace: {trace_path}")
+    except OSError as e:
+        logger.warning(f"Failed to write inference trace: {e}")
+
+
+def should_profile(requested: bool = False) -> bool:
+    """이 배치의 단계별 시간을 잴지 (AI_PROFILE_STAGES, X-Debug-Timings 요청, AI_PROFILE_SAMPLE_RATE 샘플)"""
+    return settings.AI_PROFILE_STAGES or requested or random.random() < settings.AI_PROFILE_SAMPLE_RATE
+
+
+def wants_timings(headers) -> bool:
+    """X-Debug-Timings 헤더가 있고 AI_PROFILE_RESPONSE가 켜져 있는지"""
+    return settings.AI_PROFILE_RESPONSE and headers.get(DEBUG_HEADER, "").lower() in ("1", "true", "yes")
+
+
+def present_timings(result: Dict, include: bool) -> Dict:
+    """응답용 결과: 헤더가 없으면 timings를 뺀 얕은 복사본 (캐시 원본은 건드리지 않음)"""
+    if include or "timings" not in result:
+        return result
+    return {key: value for key, value in result.items() if key != "timings"}
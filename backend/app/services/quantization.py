@@ -0,0 +1,137 @@
+"""
+INT8 CPU 추론용 MTL 모델 양자화
+- 인코더, 디코더 + 세그멘테이션 헤드: FX 그래프 모드 정적 양자화 (로컬 이미지 폴더로 캘리브레이션)
+- 분류 헤드 Linear: 동적 양자화 (가중치 int8, 활성값은 호출 때마다 스케일 계산)
+- avgpool과 출력 로짓은 fp32 (softmax/argmax는 기존 경로 그대로)
+
+정확도/지연 비교: python benchmarks/bench_quantization.py --images <폴더>
+"""
+
+import copy
+import io
+import logging
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import torch
+import torch.nn as nn
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff", ".webp"}
+
+
+class EncoderStages(nn.Module):
+    """
+    smp ResNetEncoder.forward와 같은 계산을 FX로 추적 가능한 형태로 풀어쓴 래퍼
+
+    (원본은 forward 안에서 등록되지 않은 nn.Identity를 만들어 추적이 안 됨)
+    """
+
+    def __init__(self, encoder: nn.Module):
+        super().__init__()
+        self.encoder = encoder
+
+    def forward(self, x: torch.Tensor):
+        e = self.encoder
+        f1 = e.relu(e.bn1(e.conv1(x)))
+        f2 = e.layer1(e.maxpool(f1))
+        f3 = e.layer2(f2)
+        f4 = e.layer3(f3)
+        f5 = e.layer4(f4)
+        return [x, f1, f2, f3, f4, f5]
+
+
+class SegmentationBranch(nn.Module):
+    """UNet 디코더 + 세그멘테이션 헤드 (인코더 특징 → 세그멘테이션 로짓)"""
+
+    def __init__(self, decoder: nn.Module, head: nn.Module):
+        super().__init__()
+        self.decoder = decoder
+        self.head = head
+
+    def forward(self, *features):
+        return self.head(self.decoder(*features))
+
+
+def list_images(folder: Path, limit: int) -> List[Path]:
+    return sorted(p for p in folder.rglob("*") if p.suffix.lower() in IMAGE_SUFFIXES)[:limit]
+
+
+def load_calibration_batches(
+    folder: str, preprocess, limit: int = 64, batch_size: int = 8, size: int = 512
+) -> List[torch.Tensor]:
+    """폴더의 이미지를 서빙과 같은 전처리(512 리사이즈 + 정규화)로 배치화"""
+    from app.services.ingestion import decode_image
+
+    folder_path = Path(folder)
+    if not folder or not folder_path.is_dir():
+        raise RuntimeError(f"Calibration image folder not found: {folder or '(AI_QUANT_CALIBRATION_DIR unset)'}")
+
+    batches, arrays = [], []
+    for path in list_images(folder_path, limit):
+        try:
+            image = decode_image(path.read_bytes(), size)
+        except Exception as e:
+            logger.warning(f"Skipping calibration image {path}: {e}")
+            continue
+        arrays.append(np.asarray(image.resize((size, size), Image.BILINEAR)))
+        if len(arrays) == batch_size:
+            batches.append(preprocess(arrays).clone())
+            arrays = []
+    if arrays:
+        batches.append(preprocess(arrays).clone())
+    if not batches:
+        raise RuntimeError(f"No calibration images in {folder}")
+    return batches
+
+
+def quantize_model(model: nn.Module, calibration_batches: List[torch.Tensor], engine: str = "x86") -> nn.Module:
+    """
+    양자화된 모델 사본 반환 (원본은 그대로)
+
+    반환 모델은 unet.encoder / unet.decoder / classifier 속성 구조가 같아서
+    ModeGraph로 모드별 순전파를 그대로 쓸 수 있음
+    """
+    from torch.ao.quantization import get_default_qconfig_mapping
+    from torch.ao.quantization.quantize_fx import convert_fx, prepare_fx
+
+    if engine not in torch.backends.quantized.supported_engines:
+        engine = "fbgemm"
+    torch.backends.quantized.engine = engine
+
+    qmodel = copy.deepcopy(model).cpu().eval()
+    calibration_batches = [batch.contiguous() for batch in calibration_batches]
+    qconfig_mapping = get_default_qconfig_mapping(engine)
+    example = calibration_batches[0]
+
+    with torch.no_grad():
+        example_features = tuple(qmodel.unet.encoder(example))
+    encoder = prepare_fx(EncoderStages(qmodel.unet.encoder).eval(), qconfig_mapping, (example,))
+    branch = prepare_fx(
+        SegmentationBranch(qmodel.unet.decoder, qmodel.unet.segmentation_head).eval(),
+        qconfig_mapping,
+        example_features,
+    )
+
+    # 인코더 특징을 바로 디코더 관찰에 넘겨 배치마다 특징 맵을 쌓아두지 않음
+    with torch.no_grad():
+        for batch in calibration_batches:
+            branch(*encoder(batch))
+
+    qmodel.unet.encoder = convert_fx(encoder)
+    qmodel.unet.decoder = convert_fx(branch)
+    qmodel.unet.segmentation_head = nn.Identity()
+    qmodel.classifier = torch.ao.quantization.quantize_dynamic(
+        qmodel.classifier, {nn.Linear}, dtype=torch.qint8
+    )
+    return qmodel.eval()
+
+
+def model_size_bytes(model: nn.Module) -> int:
+    """직렬화한 state_dict 크기 (fp32 대비 용량 비교용)"""
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell()
@@ -0,0 +1,85 @@
+"""
+세그멘테이션 결과 렌더링
+argmax 마스크를 팔레트 룩업 한 번으로 색칠하고 uint8 고정소수점으로 블렌딩
+오버레이 PNG 대신 8-bit 팔레트 PNG / 무손실 WebP 마스크만 보낼 수도 있음
+(클라이언트가 class_colors로 원본 위에 합성)
+"""
+
+import base64
+import io
+from typing import Dict, List, Tuple
+
+import numpy as np
+from PIL import Image
+
+# 출력 형식
+OVERLAY_PNG = "overlay_png"  # 원본 + 색상 마스크 합성 RGB PNG (기존 방식)
+MASK_PNG = "mask_png"  # 클래스 인덱스 마스크 8-bit 팔레트 PNG
+MASK_WEBP = "mask_webp"  # 클래스 인덱스 마스크 무손실 WebP
+OUTPUT_FORMATS = (OVERLAY_PNG, MASK_PNG, MASK_WEBP)
+
+
+def build_palette(colors: Dict[int, List[int]]) -> np.ndarray:
+    """{클래스 ID: [R, G, B]} → (256, 3) uint8 룩업 테이블"""
+    palette = np.zeros((256, 3), dtype=np.uint8)
+    for cls_id, color in colors.items():
+        palette[cls_id] = color
+    return palette
+
+
+def colorize(seg_mask: np.ndarray, palette: np.ndarray) -> np.ndarray:
+    """클래스 마스크 (H, W) → 색상 마스크 (H, W, 3), 룩업 한 번"""
+    return palette[seg_mask]
+
+
+def render_overlay(image: np.ndarray, seg_mask: np.ndarray, palette: np.ndarray, alpha: float = 0.5) -> np.ndarray:
+    """
+    원본 (H, W, 3) uint8 위에 색상 마스크를 alpha 비율로 합성
+
+    - alpha를 1/256 단위 고정소수점으로 바꿔 uint16 누산 후 >> 8 (float64 변환 없음)
+    """
+    color_mask = colorize(seg_mask, palette)
+    a = int(round(alpha * 256))
+    blended = image.astype(np.uint16) * (256 - a)
+    blended += color_mask.astype(np.uint16) * a
+    blended >>= 8
+    return blended.astype(np.uint8)
+
+
+def encode_image(array: np.ndarray, fmt: str = "PNG", **save_kwargs) -> bytes:
+    buffered = io.BytesIO()
+    Image.fromarray(array).save(buffered, format=fmt, **save_kwargs)
+    return buffered.getvalue()
+
+
+def encode_mask(seg_mask: np.ndarray, palette: np.ndarray, output_format: str = MASK_PNG) -> bytes:
+    """클래스 인덱스 마스크만 인코딩 (픽셀당 1바이트 팔레트 이미지)"""
+    mask_img = Image.fromarray(seg_mask.astype(np.uint8, copy=False))
+    mask_img.putpalette(palette.tobytes())  # L → P
+    buffered = io.BytesIO()
+    if output_format == MASK_WEBP:
+        mask_img.convert("RGB").save(buffered, format="WEBP", lossless=True, method=0)
+    else:
+        mask_img.save(buffered, format="PNG", optimize=False)
+    return buffered.getvalue()
+
+
+def render_segmentation(
+    image: np.ndarray,
+    seg_mask: np.ndarray,
+    palette: np.ndarray,
+    output_format: str = OVERLAY_PNG,
+    alpha: float = 0.5,
+) -> Tuple[bytes, str]:
+    """output_format에 맞게 인코딩한 바이트와 MIME 타입 반환"""
+    if output_format == OVERLAY_PNG:
+        return encode_image(render_overlay(image, seg_mask, palette, alpha)), "image/png"
+    if output_format == MASK_WEBP:
+        return encode_mask(seg_mask, palette, MASK_WEBP), "image/webp"
+    if output_format == MASK_PNG:
+        return encode_mask(seg_mask, palette, MASK_PNG), "image/png"
+    raise ValueError(f"Unknown segmentation output format: {output_format}")
+
+
+def to_base64(data: bytes) -> str:
+    return base64.b64encode(data).decode()
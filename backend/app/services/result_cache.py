@@ -0,0 +1,284 @@
+"""
+AI 추론 결과 캐시 (이미지 내용 기반)
+같은 슬라이드를 다시 올리면 (새로고침, 진료 화면 재전송, 재판독) 모델을 다시 돌리지 않음
+
+- 키: 이미지 바이트 SHA-256 + 모델 버전 + 모드 + 타일 여부 + 세그멘테이션 출력 형식
+- 1차: 메모리 LRU (항목 수 / 직렬화 크기 상한)
+- 2차: 선택적 디스크 캐시 (AI_RESULT_CACHE_DIR, JSON 파일, 오래된 파일부터 정리)
+- 같은 키로 동시에 들어온 요청은 하나의 추론 결과를 함께 기다림
+- 에러 결과는 캐시하지 않음
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core import tracing
+from app.core.config import settings
+from app.services.model_state import model_state
+
+logger = logging.getLogger(__name__)
+
+
+class _DiskTier:
+    """키별 JSON 파일 저장소 (크기 상한 초과 시 수정 시각이 오래된 파일부터 삭제)"""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.total_bytes: Optional[int] = None
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _files(self):
+        return [path for path in self.directory.glob("*/*.json") if path.is_file()]
+
+    def get(self, key: str) -> Optional[Dict]:
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)  # LRU 순서 갱신
+        except FileNotFoundError:
+            return None
+        try:
+            return json.loads(data)
+        except ValueError:
+            logger.warning(f"Corrupted result cache file removed: {path}")
+            path.unlink(missing_ok=True)
+            return None
+
+    def put(self, key: str, payload: bytes):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, path)  # 다른 프로세스가 반쯤 쓴 파일을 읽지 않도록
+        with self._lock:
+            if self.total_bytes is None:
+                self.total_bytes = sum(p.stat().st_size for p in self._files())
+            else:
+                self.total_bytes += len(payload)
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """상한의 90%까지 오래된 파일 삭제 (여러 워커가 같은 디렉터리를 써도 실제 크기로 다시 계산)"""
+        entries = []
+        for path in self._files():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self.evictions += 1
+        self.total_bytes = total
+
+
+class ResultCache:
+    """메모리 LRU + 디스크 2단계 결과 캐시, 동일 요청 병합"""
+
+    def __init__(
+        self,
+        service=None,
+        max_entries: int = 256,
+        max_bytes: int = 256 * 1024 * 1024,
+        disk_dir: str = "",
+        disk_max_bytes: int = 2048 * 1024 * 1024,
+    ):
+        self.service = service
+        self.max_entries = max(0, max_entries)
+        self.max_bytes = max_bytes
+        self.disk = _DiskTier(disk_dir, disk_max_bytes) if disk_dir else None
+        self._entries: "OrderedDict[str, Tuple[Dict, int]]" = OrderedDict()
+        self._bytes = 0
+        self._pending: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[str, int] = {}
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.cancelled = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def make_key(self, digest: str, mode: str, tiled: bool) -> str:
+        service = self.service if self.service is not None else model_state.service
+        version = getattr(service, "output_version", None) or "unloaded"
+        output_format = getattr(service, "seg_output_format", "")
+        # 세그멘테이션 없는 classify는 출력 형식과 무관
+        if mode == "classify":
+            output_format = ""
+        raw = f"{digest}|{version}|{mode}|{int(tiled)}|{output_format}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    async def get_or_compute(
+        self,
+        data: bytes,
+        mode: str,
+        tiled: bool,
+        compute: Callable[[], Awaitable[Dict]],
+    ) -> Dict:
+        """
+        캐시된 결과를 반환하거나 compute()로 추론 후 저장
+
+        - 반환 결과의 model_info.cache: "memory" / "disk" / "coalesced" / "miss"
+        - 트레이스: cache.lookup 스팬 (miss면 추론 스팬이 그 아래에 붙음)
+        """
+        with tracing.span("cache.lookup", mode=mode, tiled=tiled) as scope:
+            result = await self._get_or_compute(data, mode, tiled, compute)
+            scope.set_attribute("cache.result", result.get("model_info", {}).get("cache", "error"))
+        return result
+
+    async def _get_or_compute(
+        self,
+        data: bytes,
+        mode: str,
+        tiled: bool,
+        compute: Callable[[], Awaitable[Dict]],
+    ) -> Dict:
+        if not self.enabled:
+            return await compute()
+
+        loop = asyncio.get_running_loop()
+        digest = await loop.run_in_executor(None, lambda: hashlib.sha256(data).hexdigest())
+        key = self.make_key(digest, mode, tiled)
+
+        cached = self._get_memory(key)
+        if cached is not None:
+            self.memory_hits += 1
+            return self._tag(cached, "memory")
+
+        task = self._pending.get(key)
+        if task is not None:
+            self.coalesced += 1
+            result, source = await self._wait(key, task)
+            return self._tag(result, "coalesced" if source == "miss" else source)
+
+        # 추론은 별도 태스크로 실행 → 먼저 온 요청이 끊겨도 기다리던 요청은 결과를 받음
+        task = loop.create_task(self._load_or_compute(key, compute))
+        self._pending[key] = task
+        task.add_done_callback(lambda _: self._pending.pop(key, None))
+        result, source = await self._wait(key, task)
+        return self._tag(result, source)
+
+    async def _wait(self, key: str, task: asyncio.Task) -> Tuple[Dict, str]:
+        """공유 추론 태스크를 기다림 (기다리던 요청이 모두 취소되면 추론도 취소)"""
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[key] == 1 and not task.done():
+                task.cancel()
+                self.cancelled += 1
+            raise
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+
+    async def _load_or_compute(self, key: str, compute: Callable[[], Awaitable[Dict]]) -> Tuple[Dict, str]:
+        loop = asyncio.get_running_loop()
+        if self.disk is not None:
+            result = await loop.run_in_executor(None, self.disk.get, key)
+            if result is not None:
+                self.disk_hits += 1
+                self._put_memory(key, result, len(json.dumps(result)))
+                return result, "disk"
+
+        self.misses += 1
+        result = await compute()
+        if "error" not in result:
+            payload = json.dumps(result).encode()
+            self._put_memory(key, result, len(payload))
+            if self.disk is not None:
+                loop.run_in_executor(None, self._put_disk, key, payload)
+        return result, "miss"
+
+    def _put_disk(self, key: str, payload: bytes):
+        try:
+            self.disk.put(key, payload)
+        except OSError as e:
+            logger.warning(f"Failed to write result cache file: {e}")
+
+    def _get_memory(self, key: str) -> Optional[Dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def _put_memory(self, key: str, result: Dict, size: int):
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)[1]
+        self._entries[key] = (result, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    @staticmethod
+    def _tag(result: Dict, source: str) -> Dict:
+        """캐시 원본은 그대로 두고 model_info에 출처만 표시한 얕은 복사본"""
+        if "error" in result:
+            return result
+        return {**result, "model_info": {**result.get("model_info", {}), "cache": source}}
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def get_stats(self) -> Dict:
+        lookups = self.memory_hits + self.disk_hits + self.coalesced + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "memory_bytes": self._bytes,
+            "max_memory_bytes": self.max_bytes,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "hit_ratio": (lookups - self.misses) / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "pending": len(self._pending),
+            "cancelled": self.cancelled,
+            "disk": {
+                "directory": str(self.disk.directory),
+                "bytes": self.disk.total_bytes,
+                "max_bytes": self.disk.max_bytes,
+                "evictions": self.disk.evictions,
+            } if self.disk is not None else None,
+        }
+
+
+result_cache = ResultCache(
+    max_entries=settings.AI_RESULT_CACHE_SIZE,
+    max_bytes=settings.AI_RESULT_CACHE_MAX_MB * 1024 * 1024,
+    disk_dir=settings.AI_RESULT_CACHE_DIR,
+    disk_max_bytes=settings.AI_RESULT_CACHE_DISK_MAX_MB * 1024 * 1024,
+)
@@ -0,0 +1,89 @@
+"""
+세그멘테이션 분석
+클래스별 픽셀 수를 bincount 한 번으로 집계하고,
+종양 영역을 연결 요소로 나눠 면적/중심/바운딩 박스를 계산
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+
+def class_histogram(seg_mask: np.ndarray, num_classes: int) -> np.ndarray:
+    """클래스별 픽셀 수 (마스크 전체를 한 번만 스캔)"""
+    return np.bincount(seg_mask.ravel(), minlength=num_classes)[:num_classes]
+
+
+def find_regions(
+    binary_mask: np.ndarray,
+    min_area: int = 0,
+    max_regions: int = 50,
+) -> Tuple[List[Dict], int]:
+    """
+    8-연결 요소별 면적, 중심, 바운딩 박스 (면적 내림차순)
+    min_area 이상인 전체 영역 수와 함께 최대 max_regions개 반환
+
+    - bbox: [x, y, width, height] (마스크 좌표)
+    - centroid: [x, y]
+    """
+    if binary_mask.dtype == np.bool_:
+        binary_mask = binary_mask.view(np.uint8)
+    _, _, stats, centroids = cv2.connectedComponentsWithStats(binary_mask, connectivity=8)
+    # 0번 라벨은 배경
+    areas = stats[1:, cv2.CC_STAT_AREA]
+    order = np.argsort(-areas, kind="stable")
+    regions = []
+    for idx in order:
+        area = int(areas[idx])
+        if area < min_area or len(regions) >= max_regions:
+            break
+        label = idx + 1
+        regions.append({
+            "area": area,
+            "centroid": [round(float(centroids[label, 0]), 1), round(float(centroids[label, 1]), 1)],
+            "bbox": [
+                int(stats[label, cv2.CC_STAT_LEFT]),
+                int(stats[label, cv2.CC_STAT_TOP]),
+                int(stats[label, cv2.CC_STAT_WIDTH]),
+                int(stats[label, cv2.CC_STAT_HEIGHT]),
+            ],
+        })
+    return regions, int(np.count_nonzero(areas >= min_area))
+
+
+def analyze_segmentation(
+    seg_mask: np.ndarray,
+    class_names: Sequence[str],
+    tumor_class: int = 1,
+    min_region_area: int = 0,
+    max_regions: int = 50,
+) -> Dict:
+    """
+    예측 결과에 넣을 세그멘테이션 통계
+
+    - ratios / pixel_counts: 클래스별 비율, 픽셀 수 (기존 키 유지)
+    - tumor_regions: 종양 연결 요소 목록 (면적 내림차순, 최대 max_regions개)
+    - tumor_region_count: min_region_area 이상인 종양 영역 수
+    - largest_tumor_area / largest_tumor_ratio: 가장 큰 병변 크기
+    """
+    total_pixels = seg_mask.size
+    counts = class_histogram(seg_mask, len(class_names))
+    stats = {"ratios": {}, "pixel_counts": {}}
+    for cls_name, count in zip(class_names, counts):
+        stats["ratios"][cls_name.lower()] = float(count / total_pixels)
+        stats["pixel_counts"][cls_name.lower()] = int(count)
+
+    regions, region_count = [], 0
+    if counts[tumor_class] > 0:
+        regions, region_count = find_regions(seg_mask == tumor_class, min_region_area, max_regions)
+    largest = regions[0]["area"] if regions else 0
+
+    stats.update({
+        "mask_size": [int(seg_mask.shape[1]), int(seg_mask.shape[0])],
+        "tumor_region_count": region_count,
+        "largest_tumor_area": largest,
+        "largest_tumor_ratio": float(largest / total_pixels),
+        "tumor_regions": regions,
+    })
+    return stats
@@ -0,0 +1,192 @@
+"""
+고해상도 슬라이드 이미지 타일 추론
+전체 이미지를 512로 줄이지 않고 겹치는 타일로 나눠 추론한 뒤
+세그멘테이션 로짓을 가중 블렌딩으로 이어 붙임
+
+- 썸네일 채도로 만든 조직 마스크로 배경 타일은 건너뜀
+- 타일 한 줄 높이의 누산 버퍼만 유지하고, 더 이상 겹치는 타일이 없는 행은
+  바로 argmax해서 uint8 마스크로 확정 → 로짓 메모리는 이미지 높이와 무관
+- 그 밖의 메모리는 이미지 크기에 비례: 디코딩한 원본(PIL RGB, 픽셀당 4바이트)과
+  그 RGB 배열(3바이트), 전체 크기 uint8 마스크(1바이트) → 요청 하나에 픽셀당 약 8바이트
+  (AI_MAX_IMAGE_PIXELS 상한에서 ~1GB, 동시 실행 수는 AI_TILE_MAX_CONCURRENT로 제한)
+- 분류는 타일별 확률을 조직 비율로 가중 평균한 슬라이드 단위 결과
+"""
+
+import logging
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from app.services.preprocessing import softmax
+from app.services.profiling import StageTimer
+
+logger = logging.getLogger(__name__)
+
+
+class TiledInference:
+    """MTLAIService용 슬라이딩 윈도우 추론기"""
+
+    def __init__(
+        self,
+        service,
+        tile_size: int = 512,
+        overlap: int = 64,
+        batch_size: int = 4,
+        min_tissue: float = 0.05,
+        tissue_saturation: int = 20,
+        thumbnail_size: int = 1024,
+        preview_size: int = 1024,
+    ):
+        if not 0 <= overlap < tile_size:
+            raise ValueError("Tile overlap must be in [0, tile_size)")
+        self.service = service
+        self.tile_size = tile_size
+        self.overlap = overlap
+        self.batch_size = max(1, batch_size)
+        self.min_tissue = min_tissue
+        self.tissue_saturation = tissue_saturation
+        self.thumbnail_size = thumbnail_size
+        self.preview_size = preview_size
+        self.window = self._blend_window()
+
+    def _blend_window(self) -> np.ndarray:
+        """겹침 구간에서 선형으로 줄어드는 2D 가중치 (가장자리도 0은 아님)"""
+        ramp = np.ones(self.tile_size, dtype=np.float32)
+        if self.overlap > 0:
+            edge = (np.arange(self.overlap, dtype=np.float32) + 1) / (self.overlap + 1)
+            ramp[:self.overlap] = edge
+            ramp[-self.overlap:] = edge[::-1]
+        return np.outer(ramp, ramp)
+
+    def _positions(self, length: int) -> List[int]:
+        stride = self.tile_size - self.overlap
+        positions = list(range(0, length - self.tile_size, stride))
+        positions.append(length - self.tile_size)
+        return positions
+
+    def tissue_map(self, image: Image.Image) -> Tuple[np.ndarray, int]:
+        """썸네일 조직 마스크와 축소 배율 (채도가 낮은 유리/여백은 배경)"""
+        factor = max(1, math.ceil(max(image.size) / self.thumbnail_size))
+        thumb = image.reduce(factor) if factor > 1 else image
+        saturation = np.asarray(thumb.convert("HSV"))[:, :, 1]
+        return saturation > self.tissue_saturation, factor
+
+    def _tile_fractions(self, tissue: np.ndarray, factor: int, xs: List[int], ys: List[int]) -> np.ndarray:
+        """타일별 조직 비율 (len(ys), len(xs))"""
+        fractions = np.zeros((len(ys), len(xs)), dtype=np.float32)
+        span = max(1, self.tile_size // factor)
+        for i, y in enumerate(ys):
+            for j, x in enumerate(xs):
+                region = tissue[y // factor:y // factor + span, x // factor:x // factor + span]
+                fractions[i, j] = region.mean() if region.size else 0.0
+        return fractions
+
+    def predict(self, image: Image.Image, mode: str = "full", timer: Optional[StageTimer] = None) -> Dict:
+        start_time = time.time()
+        timer = timer or StageTimer(enabled=False)
+        service = self.service
+        rgb = np.asarray(image)
+        height, width = rgb.shape[:2]
+        tile = self.tile_size
+        need_seg = mode != "classify"
+        need_cls = mode != "segment"
+
+        xs, ys = self._positions(width), self._positions(height)
+        tissue, factor = self.tissue_map(image)
+        fractions = self._tile_fractions(tissue, factor, xs, ys)
+        selected = fractions >= self.min_tissue
+        if not selected.any():
+            # 조직이 거의 없어도 분류 결과는 필요하므로 가장 조직이 많은 타일 하나는 추론
+            selected[np.unravel_index(np.argmax(fractions), fractions.shape)] = True
+
+        n_seg = len(service.SEG_CLASS_NAMES)
+        mask = np.zeros((height, width), dtype=np.uint8) if need_seg else None
+        band = np.zeros((n_seg, tile, width), dtype=np.float32) if need_seg else None
+        band_weight = np.zeros((tile, width), dtype=np.float32) if need_seg else None
+        band_top = 0
+
+        cls_prob_sum = np.zeros(len(service.CLASS_NAMES), dtype=np.float64)
+        cls_logit_sum = np.zeros(len(service.CLASS_NAMES), dtype=np.float64)
+        cls_weight = 0.0
+
+        for i, y in enumerate(ys):
+            if need_seg and y > band_top:
+                # band_top ~ y 행은 이후 타일과 겹치지 않으므로 확정 후 버퍼를 위로 밀어냄
+                shift = y - band_top
+                self._flush(band, band_weight, mask, band_top, shift)
+                band[:, :tile - shift] = band[:, shift:]
+                band[:, tile - shift:] = 0
+                band_weight[:tile - shift] = band_weight[shift:]
+                band_weight[tile - shift:] = 0
+                band_top = y
+
+            row = [(x, float(fractions[i, j])) for j, x in enumerate(xs) if selected[i, j]]
+            for start in range(0, len(row), self.batch_size):
+                chunk = row[start:start + self.batch_size]
+                with timer.stage("preprocess"):
+                    batch = service.preprocess([rgb[y:y + tile, x:x + tile] for x, _ in chunk])
+                seg_out, cls_out = service._forward(batch.to(service.device), mode, timer)
+
+                if seg_out is not None:
+                    seg_logits = seg_out.float().cpu().numpy()
+                    for (x, _), logits in zip(chunk, seg_logits):
+                        band[:, :, x:x + tile] += logits * self.window
+                        band_weight[:, x:x + tile] += self.window
+                if cls_out is not None:
+                    logits = cls_out.float().cpu().numpy()
+                    probs = softmax(logits)
+                    weights = np.array([max(frac, 1e-3) for _, frac in chunk])
+                    cls_prob_sum += (probs * weights[:, None]).sum(axis=0)
+                    cls_logit_sum += (logits * weights[:, None]).sum(axis=0)
+                    cls_weight += weights.sum()
+
+        if need_seg:
+            self._flush(band, band_weight, mask, band_top, height - band_top)
+            del band, band_weight
+
+        cls_probs = cls_logits = None
+        if need_cls:
+            cls_probs = (cls_prob_sum / cls_weight).astype(np.float32)
+            cls_logits = (cls_logit_sum / cls_weight).astype(np.float32)
+
+        preview = self._preview(image, mask) if need_seg else None
+        processed = int(selected.sum())
+        return service._build_result(
+            image.size,
+            mask,
+            preview,
+            cls_probs,
+            cls_logits,
+            time.time() - start_time,
+            mode=mode,
+            timer=timer,
+            model_info={
+                "tiling": {
+                    "tile_size": tile,
+                    "overlap": self.overlap,
+                    "total_tiles": len(xs) * len(ys),
+                    "processed_tiles": processed,
+                    "skipped_tiles": len(xs) * len(ys) - processed,
+                },
+            },
+        )
+
+    @staticmethod
+    def _flush(band: np.ndarray, band_weight: np.ndarray, mask: np.ndarray, top: int, rows: int):
+        """누산 버퍼 앞쪽 rows 행을 argmax로 확정 (어느 타일도 덮지 않은 픽셀은 배경)"""
+        if rows <= 0:
+            return
+        final = band[:, :rows].argmax(axis=0).astype(np.uint8)
+        final[band_weight[:rows] == 0] = 0
+        mask[top:top + rows] = final
+
+    def _preview(self, image: Image.Image, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """응답 이미지용 축소본 (원본은 BOX, 마스크는 NEAREST)"""
+        scale = min(1.0, self.preview_size / max(image.size))
+        size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+        preview_image = np.asarray(image.resize(size, Image.BOX))
+        preview_mask = np.asarray(Image.fromarray(mask).resize(size, Image.NEAREST))
+        return preview_image, preview_mask
@@ -0,0 +1,256 @@
+"""
+프로세스 기반 추론 워커 풀
+모델 가중치를 공유 메모리에 한 번만 올려두고 워커들이 같은 페이지를 사용
+입력/출력 텐서는 워커별 공유 메모리 버퍼로 주고받아 직렬화 복사를 하지 않음
+세그멘테이션은 워커 안에서 argmax해서 uint8 마스크만 돌려줌 (로짓은 타일 추론처럼 필요할 때만)
+워커가 죽거나 AI_WORKER_TIMEOUT 안에 응답하지 않으면 그 배치는 실패로 돌려주고 워커를 새로 띄움
+
+워커는 forkserver(없으면 spawn)로 시작: 부모는 이미 순전파(정합성 검사, 전처리)로 OpenMP 스레드 풀을
+만든 상태라 그대로 fork하면 자식의 OpenMP가 멈출 수 있음
+"""
+
+import logging
+import os
+import queue
+import threading
+from typing import List, Optional
+
+import torch
+import torch.multiprocessing as mp
+
+from app.core import tracing
+from app.core.config import settings
+from app.services.ai_service import ModelOutput
+from app.services.profiling import StageTimer
+
+logger = logging.getLogger(__name__)
+
+
+def _worker_main(service, conn, input_buf, mask_buf, seg_buf, cls_buf, num_threads: int):
+    """워커 프로세스 루프: (배치 크기, 모드, 마스크 여부, traceparent 목록)을 받아 공유 버퍼의 입력을 추론"""
+    torch.set_num_threads(num_threads)
+    # 백엔드 재생성(service 역직렬화)까지 끝났음을 알림
+    conn.send(None)
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        n, mode, masks, traceparents = job
+        parents = tracing.remote(traceparents)
+        tracing.attach(parents)
+        try:
+            with tracing.span("inference.worker", pid=os.getpid(), batch_size=n):
+                timer = StageTimer(enabled=bool(parents))
+                seg_out, cls_out = service._run_model(input_buf[:n], mode, timer, masks)
+            if seg_out is not None:
+                (mask_buf if masks else seg_buf)[:n].copy_(seg_out)
+            if cls_out is not None:
+                cls_buf[:n].copy_(cls_out)
+            conn.send(None)
+        except Exception as e:
+            conn.send(str(e))
+        finally:
+            if parents:
+                tracing.attach(())
+                tracing.exporter.flush()
+
+
+def _concat(chunks: List[Optional[torch.Tensor]]) -> Optional[torch.Tensor]:
+    if chunks[0] is None:
+        return None
+    return chunks[0] if len(chunks) == 1 else torch.cat(chunks)
+
+
+class _Worker:
+    def __init__(self, process, conn, input_buf, mask_buf, seg_buf, cls_buf):
+        self.process = process
+        self.conn = conn
+        self.input_buf = input_buf
+        self.mask_buf = mask_buf
+        self.seg_buf = seg_buf
+        self.cls_buf = cls_buf
+
+
+class WorkerLost(RuntimeError):
+    """워커 프로세스가 죽었거나 제한 시간 안에 응답하지 않음"""
+
+
+class InferenceWorkerPool:
+    """공유 가중치 추론 워커 풀"""
+
+    def __init__(
+        self,
+        service,
+        num_workers: int,
+        max_batch_size: int,
+        num_threads: int = 0,
+        timeout: Optional[float] = None,
+    ):
+        self.service = service
+        self.num_workers = num_workers
+        self.max_batch_size = max(1, max_batch_size)
+        self.num_threads = num_threads or max(1, (os.cpu_count() or 1) // num_workers)
+        self.timeout = timeout or settings.AI_WORKER_TIMEOUT
+        self.respawned = 0
+        self._ctx = None
+        self._workers: List[_Worker] = []
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._lock = threading.Lock()
+
+    @property
+    def started(self) -> bool:
+        return bool(self._workers)
+
+    def start(self):
+        """가중치를 공유 메모리로 옮긴 뒤 워커 시작 (forkserver는 torch를 미리 import해서 워커 시작을 빠르게)"""
+        if "forkserver" in mp.get_all_start_methods():
+            self._ctx = mp.get_context("forkserver")
+            self._ctx.set_forkserver_preload(["app.services.ai_service"])
+        else:
+            self._ctx = mp.get_context("spawn")
+        self.service.model.share_memory()
+        for _ in range(self.num_workers):
+            worker = self._spawn()
+            self._workers.append(worker)
+            self._idle.put(worker)
+        logger.info(
+            f"✅ Inference worker pool started: {self.num_workers} workers x {self.num_threads} threads"
+        )
+
+    def _spawn(self) -> _Worker:
+        """공유 버퍼와 파이프를 만들고 워커 하나를 시작 (백엔드 준비가 끝날 때까지 기다림)"""
+        size = 512
+        n_seg = len(self.service.SEG_CLASS_NAMES)
+        n_cls = len(self.service.CLASS_NAMES)
+        input_buf = torch.empty(self.max_batch_size, 3, size, size).share_memory_()
+        mask_buf = torch.empty(self.max_batch_size, size, size, dtype=torch.uint8).share_memory_()
+        seg_buf = torch.empty(self.max_batch_size, n_seg, size, size).share_memory_()
+        cls_buf = torch.empty(self.max_batch_size, n_cls).share_memory_()
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(self.service, child_conn, input_buf, mask_buf, seg_buf, cls_buf, self.num_threads),
+            daemon=True,
+        )
+        process.start()
+        # 부모가 자식 쪽 끝을 닫아야 워커가 죽었을 때 recv/poll이 EOF를 봄
+        child_conn.close()
+        try:
+            if not parent_conn.poll(self.timeout):
+                raise WorkerLost(f"not ready within {self.timeout:.0f}s")
+            parent_conn.recv()
+        except (EOFError, WorkerLost) as e:
+            if process.is_alive():
+                process.terminate()
+            process.join(timeout=5)
+            parent_conn.close()
+            raise RuntimeError(
+                f"Inference worker failed to start (exitcode={process.exitcode}): {str(e) or type(e).__name__}"
+            ) from e
+        return _Worker(process, parent_conn, input_buf, mask_buf, seg_buf, cls_buf)
+
+    def _replace(self, worker: _Worker) -> Optional[_Worker]:
+        """죽었거나 응답 없는 워커를 정리하고 새로 띄움 (실패하거나 종료 중이면 None: 풀에서 제외)"""
+        with self._lock:
+            if worker.process.is_alive():
+                worker.process.terminate()
+            worker.process.join(timeout=5)
+            worker.conn.close()
+            if worker not in self._workers:
+                return None
+            index = self._workers.index(worker)
+            try:
+                replacement = self._spawn()
+            except Exception as e:
+                logger.error(f"❌ Failed to respawn inference worker, pool shrinks to {len(self._workers) - 1}: {e}")
+                self._workers.pop(index)
+                return None
+            self._workers[index] = replacement
+            self.respawned += 1
+            logger.warning(
+                f"⚠️ Inference worker {worker.process.pid} lost (exitcode={worker.process.exitcode}), "
+                f"respawned as {replacement.process.pid}"
+            )
+            return replacement
+
+    def _acquire(self) -> _Worker:
+        """살아 있는 유휴 워커 (유휴 상태에서 죽은 워커는 교체)"""
+        while True:
+            if not self._workers:
+                raise RuntimeError("Inference worker pool has no workers")
+            try:
+                worker = self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                raise RuntimeError(f"No idle inference worker within {self.timeout:.0f}s") from None
+            if worker.process.is_alive():
+                return worker
+            replacement = self._replace(worker)
+            if replacement is not None:
+                return replacement
+
+    def run(self, input_tensor: torch.Tensor, mode: str = "full", masks: bool = False) -> ModelOutput:
+        """
+        유휴 워커에 배치를 맡기고 결과를 기다림 (호출 스레드 블로킹)
+
+        - masks: 세그멘테이션을 워커에서 argmax한 uint8 마스크 (N, H, W)로 받음 (False면 fp32 로짓)
+        """
+        seg_chunks, cls_chunks = [], []
+        for start in range(0, input_tensor.shape[0], self.max_batch_size):
+            chunk = input_tensor[start:start + self.max_batch_size]
+            seg_out, cls_out = self._run_chunk(chunk, mode, masks)
+            seg_chunks.append(seg_out)
+            cls_chunks.append(cls_out)
+        return _concat(seg_chunks), _concat(cls_chunks)
+
+    def _run_chunk(self, chunk: torch.Tensor, mode: str, masks: bool) -> ModelOutput:
+        n = chunk.shape[0]
+        worker = self._acquire()
+        try:
+            worker.input_buf[:n].copy_(chunk)
+            try:
+                worker.conn.send((n, mode, masks, tracing.traceparents()))
+                # 죽은 워커는 EOF로 바로 깨어나고, 멈춘 워커는 timeout 뒤 교체
+                if not worker.conn.poll(self.timeout):
+                    raise WorkerLost(f"no response within {self.timeout:.0f}s")
+                error = worker.conn.recv()
+            except (EOFError, BrokenPipeError, ConnectionResetError, WorkerLost) as e:
+                pid = worker.process.pid
+                worker = self._replace(worker)
+                raise RuntimeError(f"Inference worker {pid} lost: {str(e) or type(e).__name__}") from e
+            if error is not None:
+                raise RuntimeError(f"Inference worker error: {error}")
+            # 워커 반환 전에 결과를 복사해야 다음 배치가 버퍼를 덮어써도 안전
+            seg_buf = worker.mask_buf if masks else worker.seg_buf
+            seg_out = seg_buf[:n].clone() if mode != "classify" else None
+            cls_out = worker.cls_buf[:n].clone() if mode != "segment" else None
+            return seg_out, cls_out
+        finally:
+            if worker is not None:
+                self._idle.put(worker)
+
+    def shutdown(self):
+        with self._lock:
+            for worker in self._workers:
+                try:
+                    worker.conn.send(None)
+                except (BrokenPipeError, OSError):
+                    pass
+            for worker in self._workers:
+                worker.process.join(timeout=5)
+                if worker.process.is_alive():
+                    worker.process.terminate()
+            self._workers = []
+            self._idle = queue.Queue()
+
+    def get_stats(self) -> dict:
+        return {
+            "num_workers": self.num_workers,
+            "start_method": self._ctx.get_start_method() if self._ctx is not None else None,
+            "threads_per_worker": self.num_threads,
+            "alive_workers": sum(1 for w in self._workers if w.process.is_alive()),
+            "idle_workers": self._idle.qsize(),
+            "respawned_workers": self.respawned,
+        }
@@ -0,0 +1,42 @@
+"""
+대시보드/통계 API 일별 집계(diagnosis_daily_stats, visit_daily_stats) 재계산
+실행: python backfill_stats.py [--since 2024-01-01 --until 2024-12-31]
+
+마이그레이션 0003/0004 적용 직후 기존 진단/진료를 채우거나, ORM 밖에서 고친 뒤 해당 기간만 다시 계산할 때 사용
+기간을 지정하지 않으면 데이터가 있는 전체 기간 (한 달 단위로 나눠 커밋)
+진단/진료가 계속 들어오는 중에 오늘 날짜를 다시 계산하면 그 사이 건이 빠질 수 있으므로 한가한 시간에 실행
+"""
+
+import argparse
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+BASE_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BASE_DIR))
+
+from app.core.database import SessionLocal
+from app.services.dashboard_stats import backfill
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--since", type=date.fromisoformat, help="시작 날짜 (YYYY-MM-DD, UTC)")
+    parser.add_argument("--until", type=date.fromisoformat, help="종료 날짜 (포함)")
+    parser.add_argument("--chunk-days", type=int, default=31, help="한 트랜잭션에서 다시 계산할 일수")
+    args = parser.parse_args()
+
+    print("📊 진단/진료 일별 집계 재계산 중...")
+    start = time.perf_counter()
+    db = SessionLocal()
+    try:
+        totals = backfill(db, args.since, args.until, args.chunk_days)
+    finally:
+        db.close()
+    print(f"✅ 진단 {totals['diagnoses']}건, 진료 {totals['visits']}건 집계 완료 ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+추론 백엔드 정합성/지연 벤치마크
+실행: python benchmarks/bench_backends.py [--checkpoint unet_resnet50_best.pth --batch-size 4]
+
+각 백엔드를 eager와 모드별로 비교 (로짓 최대 절대 오차, 세그멘테이션 argmax 일치율)하고
+배치당 지연(ms)을 측정. 허용 오차를 넘는 백엔드가 있으면 종료 코드 1
+체크포인트를 주지 않으면 같은 구조의 임의 가중치로 측정 (정합성 확인용)
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import torch
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from app.services.ai_service import GastricMTLModel  # noqa: E402
+from app.services.backends import BACKENDS, MODES, InferenceBackend, check_parity  # noqa: E402
+from app.services.checkpoint import load_checkpoint  # noqa: E402
+
+
+def time_backend(backend: InferenceBackend, x: torch.Tensor, mode: str, iterations: int) -> float:
+    backend.run(x, mode)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        backend.run(x, mode)
+    return (time.perf_counter() - start) / iterations * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--checkpoint", default=None)
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument("--batch-size", type=int, default=4)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--atol", type=float, default=1e-2)
+    parser.add_argument("--channels-last", action="store_true")
+    parser.add_argument("--precision", default="fp32", choices=("fp32", "bf16"))
+    parser.add_argument("--onnx-dir", default="onnx_cache/bench")
+    args = parser.parse_args()
+
+    device = torch.device("cpu")
+    model = GastricMTLModel(n_seg_classes=5, n_cls_classes=4, encoder_weights=None)
+    if args.checkpoint:
+        print(json.dumps(load_checkpoint(model, Path(args.checkpoint)).to_dict(), ensure_ascii=False))
+    model.eval()
+    if args.channels_last:
+        model.to(memory_format=torch.channels_last)
+
+    eager = InferenceBackend(model, device, args.channels_last)
+    x = eager.example_input(args.batch_size)
+    failed = []
+    print(f"{'backend':12s} " + " ".join(f"{mode:>10s}" for mode in MODES) + "   parity")
+    for name in args.backends:
+        kwargs = {"onnx_dir": args.onnx_dir, "model_version": "bench", "precision": args.precision}
+        try:
+            backend = BACKENDS[name](model, device, args.channels_last, **kwargs)
+        except Exception as e:
+            print(f"{name:12s} unavailable: {e}")
+            continue
+        # bf16/int8처럼 근사 정밀도면 차이는 보고만 함
+        parity = check_parity(backend, eager, args.atol)
+        exact = backend.exact and backend.precision == "fp32"
+        timings = [time_backend(backend, x, mode, args.iterations) for mode in MODES]
+        label = f"{name}/{backend.precision}"
+        print(f"{label:12s} " + " ".join(f"{ms:8.1f}ms" for ms in timings) + f"   {'ok' if parity['ok'] else 'FAIL'}")
+        if not parity["ok"]:
+            if exact:
+                failed.append(name)
+            print(json.dumps(parity, indent=2))
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
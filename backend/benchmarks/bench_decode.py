@@ -0,0 +1,100 @@
+"""
+업로드 이미지 디코딩 벤치마크
+실행: python benchmarks/bench_decode.py [--width 4000 --height 3000]
+
+기존 경로(임시 파일 기록 → 원본 해상도 디코딩 → 512 리사이즈)와
+메모리 버퍼 + JPEG draft 디코딩 경로의 시간과 피크 RSS 비교
+(피크 RSS는 변형마다 새 프로세스에서 측정)
+"""
+
+import argparse
+import io
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+
+def make_jpeg(width: int, height: int) -> bytes:
+    import numpy as np
+    from PIL import Image
+
+    rng = np.random.default_rng(0)
+    coarse = rng.integers(0, 255, size=(height // 50, width // 50, 3), dtype=np.uint8)
+    image = Image.fromarray(coarse).resize((width, height), Image.BICUBIC)
+    buffered = io.BytesIO()
+    image.save(buffered, format="JPEG", quality=90)
+    return buffered.getvalue()
+
+
+def legacy(data: bytes):
+    from PIL import Image
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as tmp:
+        tmp.write(data)
+        tmp_path = tmp.name
+    try:
+        image = Image.open(tmp_path).convert("RGB")
+        return image.resize((512, 512), Image.BILINEAR)
+    finally:
+        os.unlink(tmp_path)
+
+
+def in_memory(data: bytes):
+    from PIL import Image
+    from app.services.ingestion import decode_image
+
+    return decode_image(data, 512).resize((512, 512), Image.BILINEAR)
+
+
+VARIANTS = {"legacy": legacy, "in_memory": in_memory}
+
+
+def run_variant(name: str, path: str, iterations: int):
+    data = Path(path).read_bytes()
+    fn = VARIANTS[name]
+    fn(data)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(data)
+    ms = (time.perf_counter() - start) / iterations * 1000.0
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    print(f"{name:12s} {ms:10.1f} ms {peak_mb:10.1f} MB peak RSS")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--width", type=int, default=4000)
+    parser.add_argument("--height", type=int, default=3000)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--variant", choices=VARIANTS)
+    parser.add_argument("--path")
+    args = parser.parse_args()
+
+    if args.variant:
+        run_variant(args.variant, args.path, args.iterations)
+        return
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as tmp:
+        tmp.write(make_jpeg(args.width, args.height))
+        sample_path = tmp.name
+    try:
+        print(f"JPEG {args.width}x{args.height}, {os.path.getsize(sample_path) / 1024:.0f} KB")
+        for name in VARIANTS:
+            subprocess.run(
+                [sys.executable, __file__, "--variant", name, "--path", sample_path,
+                 "--iterations", str(args.iterations)],
+                check=True,
+            )
+    finally:
+        os.unlink(sample_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+모델 로드(콜드 스타트) 벤치마크
+실행: python benchmarks/bench_model_load.py [--checkpoint unet_resnet50_best.pth]
+
+- legacy: ImageNet 가중치로 모델 생성 → torch.load(weights_only=False) → load_state_dict 복사
+- pth: 사전학습 가중치 없이 생성 → weights_only + mmap 로드 → assign
+- safetensors: 사전학습 가중치 없이 생성 → mmap된 safetensors를 그대로 연결
+변형마다 새 프로세스에서 시간과 피크 RSS 측정 (legacy는 첫 실행 시 ImageNet 가중치 다운로드 필요)
+체크포인트를 주지 않으면 같은 구조의 임의 가중치로 만들어 측정
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+
+def legacy(path: Path):
+    import torch
+    from app.services.ai_service import GastricMTLModel
+
+    model = GastricMTLModel(n_seg_classes=5, n_cls_classes=4)
+    state_dict = torch.load(path, map_location="cpu", weights_only=False)
+    model.load_state_dict(state_dict, strict=False)
+    return model.eval()
+
+
+def fast(path: Path):
+    from app.services.ai_service import GastricMTLModel
+    from app.services.checkpoint import load_checkpoint
+
+    model = GastricMTLModel(n_seg_classes=5, n_cls_classes=4, encoder_weights=None)
+    load_checkpoint(model, path)
+    return model.eval()
+
+
+VARIANTS = {"legacy": (legacy, ".pth"), "pth": (fast, ".pth"), "safetensors": (fast, ".safetensors")}
+
+
+def run_variant(name: str, path: str):
+    fn, _ = VARIANTS[name]
+    start = time.perf_counter()
+    model = fn(Path(path))
+    # 첫 추론이 실제로 읽는 페이지까지 포함하려면 가중치를 한 번 훑음
+    checksum = sum(float(p.detach().float().sum()) for p in model.parameters())
+    seconds = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    print(f"{name:12s} {seconds:8.2f} s {peak_mb:10.1f} MB peak RSS  (checksum {checksum:.3e})")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--checkpoint", default=None)
+    parser.add_argument("--variant", choices=VARIANTS)
+    parser.add_argument("--path")
+    args = parser.parse_args()
+
+    if args.variant:
+        run_variant(args.variant, args.path)
+        return
+
+    from app.services.checkpoint import convert_to_safetensors
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.checkpoint:
+            pth_path = Path(args.checkpoint)
+        else:
+            import torch
+            from app.services.ai_service import GastricMTLModel
+
+            pth_path = Path(tmp_dir) / "random.pth"
+            model = GastricMTLModel(n_seg_classes=5, n_cls_classes=4, encoder_weights=None)
+            torch.save(model.state_dict(), pth_path)
+        st_path = convert_to_safetensors(pth_path, Path(tmp_dir) / "model.safetensors", allow_pickle=True)
+        print(f"checkpoint {pth_path} ({os.path.getsize(pth_path) / 1024 / 1024:.0f} MB)")
+
+        paths = {".pth": pth_path, ".safetensors": st_path}
+        for name, (_, suffix) in VARIANTS.items():
+            result = subprocess.run([sys.executable, __file__, "--variant", name, "--path", str(paths[suffix])])
+            if result.returncode != 0:
+                print(f"{name:12s} failed (exit {result.returncode})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+세그멘테이션 오버레이 렌더링 마이크로 벤치마크
+실행: python benchmarks/bench_overlay.py [--iterations 50]
+
+기존 방식(클래스별 불리언 마스크 + float64 블렌딩 + RGB PNG)과
+app.services.rendering의 각 출력 형식을 이미지당 ms / 응답 바이트로 비교
+"""
+
+import argparse
+import base64
+import io
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from app.services.rendering import (  # noqa: E402
+    MASK_PNG, MASK_WEBP, OVERLAY_PNG, build_palette, render_segmentation, to_base64,
+)
+
+SEG_COLORS = {
+    0: [0, 0, 0], 1: [255, 0, 0], 2: [0, 255, 0],
+    3: [0, 0, 255], 4: [255, 255, 0],
+}
+
+
+def legacy_overlay(original_image: Image.Image, seg_mask: np.ndarray) -> str:
+    """기존 MTLAIService._create_segmentation_overlay 구현"""
+    img_resized = original_image.resize((512, 512))
+    img_np = np.array(img_resized)
+    color_mask = np.zeros((512, 512, 3), dtype=np.uint8)
+    for cls_id, color in SEG_COLORS.items():
+        color_mask[seg_mask == cls_id] = color
+    alpha = 0.5
+    overlay = (img_np * (1 - alpha) + color_mask * alpha).astype(np.uint8)
+    overlay_img = Image.fromarray(overlay)
+    buffered = io.BytesIO()
+    overlay_img.save(buffered, format="PNG")
+    return base64.b64encode(buffered.getvalue()).decode()
+
+
+def synthetic_inputs(seed: int = 0):
+    """조직 이미지처럼 부드러운 노이즈 + 덩어리진 클래스 마스크"""
+    rng = np.random.default_rng(seed)
+    coarse = rng.integers(0, 255, size=(64, 64, 3), dtype=np.uint8)
+    original = Image.fromarray(coarse).resize((2048, 1536), Image.BICUBIC)
+    blobs = rng.integers(0, 5, size=(16, 16), dtype=np.uint8)
+    seg_mask = np.kron(blobs, np.ones((32, 32), dtype=np.uint8))
+    return original, seg_mask
+
+
+def bench(fn, iterations: int):
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        out = fn()
+    return (time.perf_counter() - start) / iterations * 1000.0, out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    original, seg_mask = synthetic_inputs()
+    resized = np.asarray(original.resize((512, 512), Image.BILINEAR))
+    palette = build_palette(SEG_COLORS)
+
+    rows = []
+    ms, b64 = bench(lambda: legacy_overlay(original, seg_mask), args.iterations)
+    rows.append(("legacy overlay (resize + loop + float64)", ms, len(b64)))
+    for output_format in (OVERLAY_PNG, MASK_PNG, MASK_WEBP):
+        ms, b64 = bench(
+            lambda: to_base64(render_segmentation(resized, seg_mask, palette, output_format)[0]),
+            args.iterations,
+        )
+        rows.append((output_format, ms, len(b64)))
+
+    print(f"{'renderer':45s} {'ms/image':>10s} {'base64 bytes':>14s}")
+    print("-" * 71)
+    for name, ms, size in rows:
+        print(f"{name:45s} {ms:10.2f} {size:14,d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+AI 엔드포인트 과부하 벤치마크
+실행: python benchmarks/bench_overload.py [--url http://127.0.0.1:8000 --clients 64 --requests 256]
+
+실행 중인 서버의 /api/v1/ai/predict에 동시 클라이언트 수만큼 요청을 몰아서
+상태 코드별 개수와 성공 요청 지연 p50/p99, 거절 응답 지연을 출력
+(AI_MAX_CONCURRENT_REQUESTS / AI_MAX_QUEUED_REQUESTS를 바꿔가며 비교,
+결과 캐시에 걸리지 않도록 요청마다 다른 이미지를 보냄)
+--priority batch로 대량 부하를 걸어두고 다른 셸에서 routine 요청 지연을 보면 등급 분리를 확인할 수 있음
+"""
+
+import argparse
+import io
+import statistics
+import sys
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+
+def make_jpeg(seed: int, size: int) -> bytes:
+    rng = np.random.default_rng(seed)
+    image = Image.fromarray(rng.integers(0, 255, size=(size, size, 3), dtype=np.uint8))
+    buffered = io.BytesIO()
+    image.save(buffered, format="JPEG", quality=85)
+    return buffered.getvalue()
+
+
+def post_image(url: str, data: bytes, timeout: float) -> tuple:
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"x.jpg\"\r\n"
+        f"Content-Type: image/jpeg\r\n\r\n"
+    ).encode() + data + f"\r\n--{boundary}--\r\n".encode()
+    request = urllib.request.Request(
+        url, data=body, headers={"Content-Type": f"multipart/form-data; boundary={boundary}"}
+    )
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except (urllib.error.URLError, TimeoutError, OSError):
+        status = "timeout"
+    return status, time.perf_counter() - start
+
+
+def percentile(values, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] * 1000.0 if values else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--mode", default="classify")
+    parser.add_argument("--priority", default="routine", choices=("routine", "batch"))
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=256)
+    parser.add_argument("--size", type=int, default=512)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    url = f"{args.url}/api/v1/ai/predict?mode={args.mode}&priority={args.priority}"
+    images = [make_jpeg(i, args.size) for i in range(args.requests)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        results = list(pool.map(lambda data: post_image(url, data, args.timeout), images))
+    elapsed = time.perf_counter() - start
+
+    statuses = Counter(status for status, _ in results)
+    ok = [latency for status, latency in results if status == 200]
+    rejected = [latency for status, latency in results if status in (429, 503)]
+    print(f"{args.requests} requests, {args.clients} clients, {elapsed:.1f}s ({len(ok) / elapsed:.1f} ok/s)")
+    print("status: " + ", ".join(f"{k}={v}" for k, v in sorted(statuses.items(), key=str)))
+    if ok:
+        print(f"ok       p50 {percentile(ok, 0.5):8.0f} ms  p99 {percentile(ok, 0.99):8.0f} ms  "
+              f"mean {statistics.mean(ok) * 1000:8.0f} ms")
+    if rejected:
+        print(f"rejected p50 {percentile(rejected, 0.5):8.0f} ms  p99 {percentile(rejected, 0.99):8.0f} ms")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+MTL 모델 입력 전처리 벤치마크
+실행: python benchmarks/bench_preprocess.py [--batch-size 8 --iterations 30]
+
+기존 경로(torchvision Resize → ToTensor → Normalize → torch.stack)와
+PIL 리사이즈 + Preprocessor(addcmul 융합, 재사용 버퍼) 경로를 단계별로 비교
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+from PIL import Image
+from torchvision import transforms
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from app.services.preprocessing import IMAGENET_MEAN, IMAGENET_STD, Preprocessor  # noqa: E402
+
+
+def synthetic_images(count: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    images = []
+    for _ in range(count):
+        coarse = rng.integers(0, 255, size=(48, 64, 3), dtype=np.uint8)
+        images.append(Image.fromarray(coarse).resize((1024, 768), Image.BICUBIC))
+    return images
+
+
+def timed(fn, iterations: int):
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        out = fn()
+    return (time.perf_counter() - start) / iterations * 1000.0, out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=30)
+    args = parser.parse_args()
+
+    images = synthetic_images(args.batch_size)
+    legacy_transform = transforms.Compose([
+        transforms.Resize((512, 512)),
+        transforms.ToTensor(),
+        transforms.Normalize(mean=IMAGENET_MEAN, std=IMAGENET_STD),
+    ])
+    to_tensor = transforms.Compose([
+        transforms.ToTensor(),
+        transforms.Normalize(mean=IMAGENET_MEAN, std=IMAGENET_STD),
+    ])
+    resized = [np.asarray(image.resize((512, 512), Image.BILINEAR)) for image in images]
+    preprocessors = {
+        "fused (NCHW)": Preprocessor(512),
+        "fused (channels_last)": Preprocessor(512, channels_last=True),
+    }
+
+    rows = []
+    ms, _ = timed(
+        lambda: torch.stack([legacy_transform(image) for image in images]), args.iterations
+    )
+    rows.append(("legacy end-to-end (Resize+ToTensor+Normalize)", ms, 0.0))
+    ms, _ = timed(
+        lambda: [np.asarray(image.resize((512, 512), Image.BILINEAR)) for image in images],
+        args.iterations,
+    )
+    rows.append(("  resize only (PIL BILINEAR)", ms, 0.0))
+    ms, legacy_tensor = timed(
+        lambda: torch.stack([to_tensor(Image.fromarray(array)) for array in resized]), args.iterations
+    )
+    rows.append(("  legacy tensor stage (ToTensor+Normalize+stack)", ms, 0.0))
+    for name, preprocessor in preprocessors.items():
+        ms, tensor = timed(lambda: preprocessor(resized), args.iterations)
+        error = float((tensor - legacy_tensor).abs().max())
+        rows.append((f"  {name} tensor stage", ms, error))
+
+    print(f"batch={args.batch_size}, source=1024x768 → 512x512")
+    print(f"{'stage':50s} {'ms/batch':>10s} {'max abs err':>12s}")
+    print("-" * 74)
+    for name, ms, error in rows:
+        print(f"{name:50s} {ms:10.2f} {error:12.2e}")
+
+
+if __name__ == "__main__":
+    main()
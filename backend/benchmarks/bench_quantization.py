@@ -0,0 +1,107 @@
+"""
+INT8 양자화 정확도/지연 비교
+실행: python benchmarks/bench_quantization.py --images <평가 이미지 폴더> [--calibration <폴더>] [--checkpoint unet_resnet50_best.pth]
+
+fp32(eager)와 int8 백엔드를 같은 이미지로 돌려서
+- 모드별 배치 지연 (ms/이미지)
+- 모델 크기 (직렬화한 state_dict)
+- 분류 라벨 일치율
+- 세그멘테이션 픽셀 일치율, 클래스별 비율 차이 (평균/최대, %p)
+를 출력. 캘리브레이션 폴더를 주지 않으면 평가 폴더를 그대로 사용 (가능하면 분리할 것)
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from app.services.ai_service import GastricMTLModel, MTLAIService  # noqa: E402
+from app.services.backends import InferenceBackend, QuantizedBackend  # noqa: E402
+from app.services.checkpoint import load_checkpoint  # noqa: E402
+from app.services.preprocessing import Preprocessor  # noqa: E402
+from app.services.quantization import load_calibration_batches, model_size_bytes  # noqa: E402
+
+N_SEG = len(MTLAIService.SEG_CLASS_NAMES)
+
+
+def run_all(backend: InferenceBackend, batches, mode: str):
+    """전체 배치 추론 → (분류 라벨, 세그멘테이션 마스크, ms/이미지)"""
+    backend.run(batches[0], mode)
+    labels, masks = [], []
+    images = 0
+    start = time.perf_counter()
+    for batch in batches:
+        seg_out, cls_out = backend.run(batch, mode)
+        if cls_out is not None:
+            labels.append(cls_out.argmax(dim=1).numpy())
+        if seg_out is not None:
+            masks.append(seg_out.argmax(dim=1).to(torch.uint8).numpy())
+        images += batch.shape[0]
+    ms = (time.perf_counter() - start) / images * 1000.0
+    return (
+        np.concatenate(labels) if labels else None,
+        np.concatenate(masks) if masks else None,
+        ms,
+    )
+
+
+def class_ratios(masks: np.ndarray) -> np.ndarray:
+    """(N, H, W) 마스크 → (N, 클래스 수) 픽셀 비율"""
+    flat = masks.reshape(masks.shape[0], -1)
+    counts = np.stack([np.bincount(row, minlength=N_SEG)[:N_SEG] for row in flat])
+    return counts / flat.shape[1]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--images", required=True)
+    parser.add_argument("--calibration", default=None)
+    parser.add_argument("--checkpoint", default=None)
+    parser.add_argument("--limit", type=int, default=200)
+    parser.add_argument("--calibration-images", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=8)
+    args = parser.parse_args()
+
+    device = torch.device("cpu")
+    model = GastricMTLModel(n_seg_classes=N_SEG, n_cls_classes=len(MTLAIService.CLASS_NAMES), encoder_weights=None)
+    if args.checkpoint:
+        load_checkpoint(model, Path(args.checkpoint))
+    model.eval()
+
+    batches = load_calibration_batches(args.images, Preprocessor(size=512), args.limit, args.batch_size)
+    fp32 = InferenceBackend(model, device)
+    start = time.perf_counter()
+    int8 = QuantizedBackend(
+        model, device,
+        calibration_dir=args.calibration or args.images,
+        calibration_images=args.calibration_images,
+    )
+    print(f"images: {sum(b.shape[0] for b in batches)}, calibration: {int8.calibration_images} "
+          f"({time.perf_counter() - start:.1f}s)")
+    print(f"model size: fp32 {model_size_bytes(model) / 1e6:.1f} MB, int8 {int8.size_bytes / 1e6:.1f} MB")
+
+    print(f"{'mode':10s} {'fp32 ms':>10s} {'int8 ms':>10s} {'speedup':>8s}")
+    outputs = {}
+    for mode in ("classify", "segment", "full"):
+        ref = run_all(fp32, batches, mode)
+        quant = run_all(int8, batches, mode)
+        outputs[mode] = (ref, quant)
+        print(f"{mode:10s} {ref[2]:10.1f} {quant[2]:10.1f} {ref[2] / quant[2]:7.2f}x")
+
+    (ref_labels, ref_masks, _), (q_labels, q_masks, _) = outputs["full"]
+    print(f"\nclass label agreement: {np.mean(ref_labels == q_labels) * 100:.2f}%")
+    print(f"seg pixel agreement:   {np.mean(ref_masks == q_masks) * 100:.2f}%")
+    diff = np.abs(class_ratios(ref_masks) - class_ratios(q_masks)) * 100
+    print(f"{'seg class':12s} {'mean |Δ| %p':>12s} {'max |Δ| %p':>12s}")
+    for i, name in enumerate(MTLAIService.SEG_CLASS_NAMES):
+        print(f"{name:12s} {diff[:, i].mean():12.2f} {diff[:, i].max():12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+진료/진단 조회 API 쿼리 수 / 커서 순회 측정
+실행: python benchmarks/bench_queries.py [--rows 100 --database-url sqlite://]
+
+임시 DB(기본: 메모리 sqlite)를 alembic upgrade head로 만들고 의사/환자/진료/진단 데이터를 넣은 뒤
+1. visits/diagnoses 목록·상세, analytics 엔드포인트 함수를 직접 호출해 실행된 SQL 문장 수와 시간을 출력
+   쿼리 수가 페이지 크기와 무관한 상한(QUERY_BUDGETS)을 넘으면 실패
+2. 진료 목록을 X-Next-Cursor로 끝까지 넘겨 보며 누락/중복이 없는지, 첫/마지막 페이지 시간을 출력
+   (--page-size를 작게 주면 깊은 페이지 비용 비교용)
+실패가 있으면 실행한 문장과 함께 종료 코드 1
+(원격 MySQL에서는 --database-url로 빈 테스트 DB를 지정하면 왕복 지연까지 확인 가능)
+인덱스 사용(EXPLAIN) 검사는 pytest: tests/test_query_plans.py (TEST_DATABASE_URL로 MySQL 지정 가능)
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100, help="진료 기록 수 (= 목록 페이지 크기)")
+    parser.add_argument("--page-size", type=int, default=20, help="커서 순회 페이지 크기")
+    parser.add_argument("--database-url", default="sqlite://")
+    return parser.parse_args()
+
+
+args = parse_args()
+# 앱 설정보다 먼저 지정해야 app.core.database가 이 DB로 엔진을 만듦
+os.environ["DATABASE_URL"] = args.database_url
+os.environ["DB_QUERY_PROFILING"] = "true"  # 엔진에 프로파일러 리스너 등록
+os.environ.setdefault("DEBUG", "false")
+
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from starlette.requests import Request  # noqa: E402
+from starlette.responses import Response  # noqa: E402
+
+from app.api.api_v1.endpoints import analytics, diagnoses, visits  # noqa: E402
+from app.core import query_profiler  # noqa: E402
+from app.core.pagination import NEXT_CURSOR_HEADER, PageParams  # noqa: E402
+from app.core.database import SessionLocal, engine  # noqa: E402
+from app.models import Diagnosis, Patient, User, Visit  # noqa: E402
+from app.models.patient import Gender  # noqa: E402
+from app.models.user import UserRole  # noqa: E402
+from app.schemas.analytics import Bucket  # noqa: E402
+
+# 엔드포인트별 허용 쿼리 수 (페이지 크기와 무관해야 함)
+QUERY_BUDGETS = {
+    "GET /visits/": 1,
+    "GET /visits/{id}": 2,
+    "GET /diagnoses/": 1,
+    "GET /diagnoses/{id}": 1,
+    "GET /analytics/visits": 1,
+    "GET /analytics/visits/by-doctor": 2,  # 롤업 GROUP BY + 의사 이름
+    "GET /analytics/diagnoses": 1,
+    "GET /analytics/diagnoses/tumor-ratio": 1,
+    "GET /analytics/review-backlog": 2,
+}
+
+
+def seed(db, rows: int):
+    doctors = [
+        User(email=f"doctor{i}@example.com", username=f"doctor{i}", hashed_password="x",
+             full_name=f"Doctor {i}", role=UserRole.DOCTOR)
+        for i in range(5)
+    ]
+    db.add_all(doctors)
+    db.flush()
+    patients = [
+        Patient(name=f"Patient {i}", birth_date=date(1960, 1, 1) + timedelta(days=i * 97),
+                gender=Gender.MALE if i % 2 else Gender.FEMALE, patient_number=f"P{i:06d}")
+        for i in range(rows)
+    ]
+    db.add_all(patients)
+    db.flush()
+    now = datetime.utcnow().replace(microsecond=0)  # 같은 진료 시각이 섞이도록 (커서 동률 처리 확인)
+    for i, patient in enumerate(patients):
+        visit = Visit(patient_id=patient.id, doctor_id=doctors[i % len(doctors)].id,
+                      visit_date=now - timedelta(hours=i // 3), chief_complaint="복통", status="COMPLETED")
+        db.add(visit)
+        db.flush()
+        db.add(Diagnosis(
+            visit_id=visit.id, prediction="STDI", prediction_kr="미만형선암", confidence=0.9,
+            probabilities={"STDI": 0.9}, probabilities_kr={"미만형선암": 0.9},
+            tumor_ratio=0.3, stroma_ratio=0.3, normal_ratio=0.4,
+            is_reviewed=i % 2, reviewed_by=doctors[0].id if i % 2 else None,
+        ))
+    db.commit()
+
+
+def make_request(path: str) -> Request:
+    return Request({"type": "http", "method": "GET", "path": path, "query_string": b"",
+                    "headers": [(b"host", b"testserver")], "scheme": "http", "server": ("testserver", 80)})
+
+
+def page(limit: int, cursor=None) -> PageParams:
+    return PageParams(limit=limit, cursor=cursor, skip=0, include_total=False)
+
+
+def list_visits(db, user, limit: int, cursor=None, **filters) -> tuple:
+    """진료 목록 호출 → (행 목록, 응답 객체)"""
+    response = Response()
+    params = dict(patient_id=None, doctor_id=None, status=None, date_from=None, date_to=None)
+    params.update(filters)
+    rows = visits.get_visits(request=make_request("/api/v1/visits/"), response=response,
+                             page=page(limit, cursor), db=db, current_user=user, **params)
+    return rows, response
+
+
+def list_diagnoses(db, user, limit: int, cursor=None, **filters) -> tuple:
+    response = Response()
+    params = dict(is_reviewed=None, prediction=None)
+    params.update(filters)
+    rows = diagnoses.get_diagnoses(request=make_request("/api/v1/diagnoses/"), response=response,
+                                   page=page(limit, cursor), db=db, current_user=user, **params)
+    return rows, response
+
+
+def walk_visits(db, user, page_size: int) -> tuple:
+    """커서로 진료 목록 전체 순회 → (읽은 id 목록, 페이지별 ms)"""
+    ids, timings, cursor = [], [], None
+    while True:
+        db.expunge_all()
+        start = time.perf_counter()
+        rows, response = list_visits(db, user, page_size, cursor)
+        timings.append((time.perf_counter() - start) * 1000.0)
+        ids.extend(row["id"] for row in rows)
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            return ids, timings
+
+
+def measure(name: str, call) -> tuple:
+    """(쿼리 수, 소요 ms, 예산 초과 메시지 또는 None)"""
+    start = time.perf_counter()
+    try:
+        with query_profiler.assert_max_queries(QUERY_BUDGETS[name]) as stats:
+            call()
+    except AssertionError as e:
+        return stats.count, (time.perf_counter() - start) * 1000.0, str(e)
+    return stats.count, (time.perf_counter() - start) * 1000.0, None
+
+
+def main():
+    # 스키마/인덱스는 실제 배포와 같이 마이그레이션으로
+    config = Config(str(Path(__file__).resolve().parent.parent / "alembic.ini"))
+    config.attributes["configure_logger"] = False
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+
+    db = SessionLocal()
+    try:
+        seed(db, args.rows)
+        user = db.query(User).first()
+        visit_id = db.query(Visit.id).first()[0]
+        diagnosis_id = db.query(Diagnosis.id).filter(Diagnosis.is_reviewed == 1).first()[0]
+        period = analytics.DateRange(since=None, until=None)
+        # Query(...) 기본값은 객체라서 엔드포인트를 직접 부를 때는 모든 인자를 넘김
+        calls = {
+            "GET /visits/": lambda: list_visits(db, user, args.rows),
+            "GET /visits/{id}": lambda: visits.get_visit(visit_id=visit_id, db=db, current_user=user),
+            "GET /diagnoses/": lambda: list_diagnoses(db, user, args.rows),
+            "GET /diagnoses/{id}": lambda: diagnoses.get_diagnosis(
+                diagnosis_id=diagnosis_id, db=db, current_user=user),
+            "GET /analytics/visits": lambda: analytics.get_visit_trend(
+                period=period, bucket=Bucket.WEEK, doctor_id=None, db=db, current_user=user),
+            "GET /analytics/visits/by-doctor": lambda: analytics.get_visits_by_doctor(
+                period=period, db=db, current_user=user),
+            "GET /analytics/diagnoses": lambda: analytics.get_diagnosis_trend(
+                period=period, bucket=Bucket.DAY, doctor_id=user.id, prediction=None, db=db, current_user=user),
+            "GET /analytics/diagnoses/tumor-ratio": lambda: analytics.get_tumor_ratio_distribution(
+                period=period, doctor_id=None, prediction="STDI", db=db, current_user=user),
+            "GET /analytics/review-backlog": lambda: analytics.get_review_backlog(
+                since=None, until=None, db=db, current_user=user),
+        }
+
+        failures = []
+        print(f"{'endpoint':<38}{'queries':>8}{'budget':>8}{'ms':>10}")
+        for name, call in calls.items():
+            db.expunge_all()  # identity map에 남은 객체로 쿼리가 생략되지 않도록
+            count, elapsed_ms, error = measure(name, call)
+            print(f"{name:<38}{count:>8}{QUERY_BUDGETS[name]:>8}{elapsed_ms:>10.1f}")
+            if error:
+                failures.append(f"{name}: {error}")
+
+        ids, timings = walk_visits(db, user, args.page_size)
+        print(f"\ncursor walk: {len(timings)} pages x {args.page_size}, "
+              f"first {timings[0]:.1f} ms, last {timings[-1]:.1f} ms")
+        if len(ids) != args.rows or len(set(ids)) != len(ids):
+            failures.append(f"cursor walk: read {len(ids)} rows ({len(set(ids))} unique), expected {args.rows}")
+
+    finally:
+        db.close()
+
+    if failures:
+        print("\n" + "\n\n".join(failures), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+세그멘테이션 분석 단계 벤치마크
+실행: python benchmarks/bench_seg_analytics.py [--iterations 200]
+
+기존 클래스별 np.sum(mask == cls) 반복과
+app.services.seg_analytics.analyze_segmentation (bincount + 종양 연결 요소)의 ms 비교
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from app.services.seg_analytics import analyze_segmentation  # noqa: E402
+
+SEG_CLASS_NAMES = ["Background", "Tumor", "Stroma", "Normal", "Immune"]
+
+
+def legacy_stats(seg_mask: np.ndarray) -> dict:
+    """기존 MTLAIService._calculate_segmentation_stats 구현"""
+    total_pixels = seg_mask.size
+    stats = {"ratios": {}, "pixel_counts": {}}
+    for cls_id, cls_name in enumerate(SEG_CLASS_NAMES):
+        count = np.sum(seg_mask == cls_id)
+        stats["ratios"][cls_name.lower()] = float(count / total_pixels)
+        stats["pixel_counts"][cls_name.lower()] = int(count)
+    return stats
+
+
+def bench(fn, iterations: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--size", type=int, default=512)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    blobs = rng.integers(0, 5, size=(args.size // 16, args.size // 16), dtype=np.uint8)
+    seg_mask = np.kron(blobs, np.ones((16, 16), dtype=np.uint8))
+
+    legacy_ms = bench(lambda: legacy_stats(seg_mask), args.iterations)
+    new_ms = bench(lambda: analyze_segmentation(seg_mask, SEG_CLASS_NAMES, min_region_area=16), args.iterations)
+    stats = analyze_segmentation(seg_mask, SEG_CLASS_NAMES, min_region_area=16)
+
+    print(f"mask {args.size}x{args.size}, tumor regions: {stats['tumor_region_count']}")
+    print(f"legacy per-class scan        {legacy_ms:8.3f} ms")
+    print(f"bincount + tumor components  {new_ms:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
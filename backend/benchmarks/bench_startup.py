@@ -0,0 +1,82 @@
+"""
+서버 시작 시간 벤치마크
+실행: python benchmarks/bench_startup.py [--runs 3 --port 8765]
+
+uvicorn을 새 프로세스로 띄우고
+- 첫 응답: /health가 처음 200을 돌려줄 때까지 걸린 시간
+- 준비 완료: /health/ready가 200이 될 때까지 (모델 로드 완료, 없는 라우트면 생략)
+을 측정. 모델을 임포트 시점에 로드하던 이전 코드에서 실행하면 두 값이 같게 나옴
+(환경 변수는 그대로 전달되므로 AI_MODEL_PATH, AI_DEVICE 등을 맞춰서 실행)
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def wait_for(url: str, deadline: float) -> tuple:
+    """200이 올 때까지 폴링, (상태 코드, 응답 시각) 반환 (404면 바로 반환)"""
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                return response.status, time.perf_counter()
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                return 404, time.perf_counter()
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.02)
+    raise TimeoutError(f"No response from {url}")
+
+
+def run_once(port: int, timeout: float) -> tuple:
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BASE_DIR,
+        env=os.environ.copy(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = start + timeout
+        _, first = wait_for(f"http://127.0.0.1:{port}/health", deadline)
+        status, ready = wait_for(f"http://127.0.0.1:{port}/health/ready", deadline)
+        return first - start, (ready - start) if status == 200 else None
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=300.0)
+    args = parser.parse_args()
+
+    firsts, readies = [], []
+    for run in range(args.runs):
+        first, ready = run_once(args.port, args.timeout)
+        firsts.append(first)
+        if ready is not None:
+            readies.append(ready)
+        ready_text = f"{ready:.2f}s" if ready is not None else "n/a"
+        print(f"run {run + 1}: first response {first:.2f}s, ready {ready_text}")
+
+    print("-" * 48)
+    print(f"median time to first response: {statistics.median(firsts):.2f}s")
+    if readies:
+        print(f"median time to model ready:    {statistics.median(readies):.2f}s")
+
+
+if __name__ == "__main__":
+    main()
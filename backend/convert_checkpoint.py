@@ -0,0 +1,44 @@
+"""
+.pth 체크포인트 → .safetensors 변환 스크립트
+실행: python convert_checkpoint.py [unet_resnet50_best.pth] [-o out.safetensors] [--allow-pickle]
+
+- 변환 결과는 서버가 mmap으로 바로 열 수 있어 콜드 스타트가 빨라지고 언피클링이 없음
+- 변환 후 모델 구조와 대조해 누락/예상 밖 키를 JSON으로 출력 (하나라도 있으면 종료 코드 1)
+- --allow-pickle: weights_only 로드가 안 되는 구 체크포인트용 (신뢰하는 파일에만 사용)
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from app.core.config import settings
+from app.services.ai_service import GastricMTLModel
+from app.services.checkpoint import convert_to_safetensors, load_checkpoint
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("src", nargs="?", default=settings.AI_MODEL_PATH)
+    parser.add_argument("-o", "--output", default=None)
+    parser.add_argument("--allow-pickle", action="store_true")
+    args = parser.parse_args()
+
+    src = Path(args.src)
+    if not src.exists():
+        print(f"❌ 파일을 찾을 수 없습니다: {src}")
+        sys.exit(1)
+
+    dst = convert_to_safetensors(src, Path(args.output) if args.output else None, args.allow_pickle)
+    print(f"✅ 변환 완료: {src} ({src.stat().st_size / 1024 / 1024:.1f} MB) → {dst}")
+
+    model = GastricMTLModel(n_seg_classes=5, n_cls_classes=4, encoder_weights=None)
+    report = load_checkpoint(model, dst)
+    print(json.dumps(report.to_dict(max_keys=50), indent=2, ensure_ascii=False))
+    if not report.clean:
+        print("⚠️ 모델 구조와 맞지 않는 키가 있습니다.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
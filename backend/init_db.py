@@ -10,6 +10,9 @@ from pathlib import Path
 BASE_DIR = Path(__file__).resolve().parent
 sys.path.insert(0, str(BASE_DIR))
 
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
 from sqlalchemy.orm import Session
 from passlib.context import CryptContext
 from datetime import datetime, date
@@ -30,9 +33,15 @@ except Exception as e:
 
 
 def create_tables():
-    """테이블 생성"""
-    print("📊 테이블 생성 중...")
-    Base.metadata.create_all(bind=engine)
+    """테이블 생성 (Alembic 마이그레이션을 head까지 적용)"""
+    print("📊 마이그레이션 적용 중...")
+    config = Config(str(BASE_DIR / "alembic.ini"))
+    inspector = inspect(engine)
+    if inspector.has_table("users") and not inspector.has_table("alembic_version"):
+        # 예전 create_all로 만든 DB: 초기 스키마 리비전으로 표시한 뒤 이후 마이그레이션만 적용
+        print("   ⚠️  기존 스키마 발견: 0001 (initial schema)로 stamp")
+        command.stamp(config, "0001")
+    command.upgrade(config, "head")
     print("✅ 테이블 생성 완료")
 
 
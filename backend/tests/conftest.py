@@ -0,0 +1,105 @@
+"""
+테스트 공통 설정
+app 설정은 import 시점에 읽히므로 app을 import하기 전에 환경 변수를 지정
+(DB는 임시 sqlite 파일: TestClient가 엔드포인트를 다른 스레드에서 실행해도 같은 DB를 보도록)
+"""
+
+import os
+import sys
+import tempfile
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+os.environ["DATABASE_URL"] = os.environ.get(
+    "TEST_DATABASE_URL", f"sqlite:///{Path(tempfile.mkdtemp()) / 'test.db'}"
+)
+os.environ["DB_QUERY_PROFILING"] = "true"
+os.environ["DEBUG"] = "false"
+os.environ["AI_ENABLED"] = "false"
+os.environ["METRICS_ENABLED"] = "false"
+os.environ["TRACING_SAMPLE_RATE"] = "0"
+
+# 시드 데이터 진료 기록 수 (기본 페이지 크기보다 크게)
+SEED_ROWS = 30
+
+
+@pytest.fixture(scope="session")
+def db_engine():
+    """실제 배포와 같이 alembic upgrade head로 스키마/인덱스를 만든 엔진"""
+    from alembic import command
+    from alembic.config import Config
+
+    from app.core.database import engine
+
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.attributes["configure_logger"] = False
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+    return engine
+
+
+@pytest.fixture(scope="session")
+def seeded(db_engine):
+    """의사 5명, 환자/진료/진단 SEED_ROWS건 → {"doctor": User, "visit_id", "diagnosis_id"}"""
+    from app.core.database import SessionLocal
+    from app.models import Diagnosis, Patient, User, Visit
+    from app.models.patient import Gender
+    from app.models.user import UserRole
+
+    db = SessionLocal()
+    try:
+        doctors = [
+            User(email=f"doctor{i}@example.com", username=f"doctor{i}", hashed_password="x",
+                 full_name=f"Doctor {i}", role=UserRole.DOCTOR)
+            for i in range(5)
+        ]
+        db.add_all(doctors)
+        db.flush()
+        now = datetime.utcnow().replace(microsecond=0)  # 같은 진료 시각이 섞이도록
+        for i in range(SEED_ROWS):
+            patient = Patient(name=f"Patient {i}", birth_date=date(1960, 1, 1) + timedelta(days=i * 97),
+                              gender=Gender.MALE if i % 2 else Gender.FEMALE, patient_number=f"P{i:06d}")
+            db.add(patient)
+            db.flush()
+            visit = Visit(patient_id=patient.id, doctor_id=doctors[i % len(doctors)].id,
+                          visit_date=now - timedelta(hours=i // 3), chief_complaint="복통", status="COMPLETED")
+            db.add(visit)
+            db.flush()
+            db.add(Diagnosis(
+                visit_id=visit.id, prediction="STDI", prediction_kr="미만형선암", confidence=0.9,
+                probabilities={"STDI": 0.9}, probabilities_kr={"미만형선암": 0.9},
+                tumor_ratio=0.3, stroma_ratio=0.3, normal_ratio=0.4,
+                is_reviewed=i % 2, reviewed_by=doctors[0].id if i % 2 else None,
+            ))
+        db.commit()
+        doctor = db.query(User).first()
+        data = {
+            "doctor": doctor,
+            "visit_id": db.query(Visit.id).first()[0],
+            "diagnosis_id": db.query(Diagnosis.id).filter(Diagnosis.is_reviewed == 1).first()[0],
+        }
+        db.expunge(doctor)
+        return data
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def client(seeded):
+    """시드 데이터의 첫 의사로 로그인한 TestClient (토큰 검증 쿼리가 세어지지 않도록 의존성 교체)"""
+    from fastapi.testclient import TestClient
+
+    from app.core.security import get_current_active_user
+    from app.main import app
+
+    app.dependency_overrides[get_current_active_user] = lambda: seeded["doctor"]
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_current_active_user, None)
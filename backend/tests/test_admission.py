@@ -0,0 +1,45 @@
+"""
+승인 제어 의존성: 엔드포인트가 에러로 끝나도 의존성 종료 시점에 슬롯을 바로 반환
+"""
+
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.services.admission import admission, admit_by_priority, admit_inference
+
+
+def make_client():
+    app = FastAPI()
+    seen = []
+
+    @app.post("/fail", dependencies=[Depends(admit_inference)])
+    async def fail():
+        seen.append(admission.in_flight)
+        raise HTTPException(status_code=400, detail="bad image")
+
+    @app.post("/fail-priority")
+    async def fail_priority(priority=Depends(admit_by_priority)):
+        seen.append((admission.in_flight, admission.urgent_in_flight, priority.value))
+        raise HTTPException(status_code=500, detail="inference failed")
+
+    return TestClient(app), seen
+
+
+def test_slot_is_released_when_endpoint_raises():
+    client, seen = make_client()
+    before = admission.in_flight
+    for _ in range(3):
+        response = client.post("/fail")
+        assert response.status_code == 400
+        assert admission.in_flight == before
+    assert seen == [before + 1] * 3
+
+
+def test_priority_slot_is_released_when_endpoint_raises():
+    client, seen = make_client()
+    before = admission.in_flight
+    response = client.post("/fail-priority", params={"priority": "urgent"})
+    assert response.status_code == 500
+    assert seen == [(before + 1, 0, "urgent")]
+    assert admission.in_flight == before
+    assert not admission._slots().locked()
@@ -0,0 +1,155 @@
+"""
+AI 업로드 라우트: 폼은 의존성(모델 준비/승인 제어) 뒤에 파싱하고 파일은 메모리에서 처리
+모델/배처는 가짜로 바꿔 요청 경로만 확인
+"""
+
+import io
+
+import pytest
+from PIL import Image
+
+from app.services import model_state as model_state_module
+from app.services.batching import inference_batcher
+from app.services.result_cache import result_cache
+
+RESULT = {
+    "prediction": "STDI",
+    "prediction_kr": "미만형선암",
+    "confidence": 0.9,
+    "probabilities": {"STDI": 0.9},
+    "probabilities_kr": {"미만형선암": 0.9},
+    "raw_logits": [1.0],
+    "processing_time": 0.01,
+    "model_info": {"model_type": "MTL", "device": "cpu", "precision": "fp32", "model_version": "test"},
+}
+
+
+class FakeService:
+    model_version = "test"
+
+
+def png_bytes(size=(8, 8)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, "red").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def ready_model(monkeypatch):
+    """모델 준비 완료 + 배처는 입력 바이트를 기록하고 고정 결과 반환"""
+    state = model_state_module.model_state
+    monkeypatch.setattr(state, "status", model_state_module.READY)
+    monkeypatch.setattr(state, "service", FakeService())
+    submitted = []
+
+    async def submit(content, mode, tiled, priority, user=None, profile=False):
+        submitted.append({"bytes": len(content), "mode": mode, "tiled": tiled, "priority": priority})
+        return dict(RESULT)
+
+    async def get_or_compute(data, mode, tiled, compute):
+        return await compute()
+
+    monkeypatch.setattr(inference_batcher, "submit", submit)
+    monkeypatch.setattr(result_cache, "get_or_compute", get_or_compute)
+    return submitted
+
+
+def test_predict_reads_file_from_form(client, ready_model):
+    data = png_bytes()
+    response = client.post("/api/v1/ai/predict", params={"mode": "classify"},
+                           files={"file": ("a.png", data, "image/png")})
+    assert response.status_code == 200, response.text
+    assert response.json()["prediction"] == "STDI"
+    assert ready_model == [{"bytes": len(data), "mode": "classify", "tiled": False, "priority": "routine"}]
+
+
+def test_predict_rejects_non_image(client, ready_model):
+    response = client.post("/api/v1/ai/predict", files={"file": ("a.txt", b"hello", "text/plain")})
+    assert response.status_code == 400
+    assert not ready_model
+
+
+def test_clinical_parses_form_fields(client, ready_model, seeded):
+    response = client.post(
+        "/api/v1/clinical/diagnose",
+        params={"priority": "urgent"},
+        data={"patient_id": "1", "chief_complaint": "복통", "mode": "classify", "tiled": "false"},
+        files={"image": ("a.png", png_bytes(), "image/png")},
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["diagnosis"]["prediction"] == "STDI"
+    assert ready_model[0]["mode"] == "classify"
+    assert ready_model[0]["priority"] == "urgent"
+
+
+def test_clinical_invalid_form_is_422(client, ready_model):
+    response = client.post(
+        "/api/v1/clinical/diagnose",
+        data={"patient_id": "abc", "chief_complaint": "복통"},
+        files={"image": ("a.png", png_bytes(), "image/png")},
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "patient_id"]
+    assert not ready_model
+
+
+@pytest.fixture
+def parsed(monkeypatch):
+    """업로드 본문 파싱 호출 기록"""
+    from app.services.ingestion import InMemoryMultiPartParser
+
+    calls = []
+    parse = InMemoryMultiPartParser.parse
+
+    async def spy(self):
+        calls.append(self)
+        return await parse(self)
+
+    monkeypatch.setattr(InMemoryMultiPartParser, "parse", spy)
+    return calls
+
+
+def test_rejected_request_does_not_read_upload(client, ready_model, parsed, monkeypatch):
+    from app.services.admission import Overloaded, admission
+
+    async def overloaded(request=None, priority="routine"):
+        raise Overloaded(429, "busy", 3)
+
+    monkeypatch.setattr(admission, "acquire", overloaded)
+    for path, files in (("/api/v1/ai/predict", {"file": ("a.png", png_bytes(), "image/png")}),
+                        ("/api/v1/clinical/diagnose", {"image": ("a.png", png_bytes(), "image/png")})):
+        response = client.post(path, files=files, data={"patient_id": "1", "chief_complaint": "복통"})
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "3"
+    assert not parsed
+    assert not ready_model
+
+
+def test_admitted_request_reads_upload(client, ready_model, parsed):
+    response = client.post("/api/v1/ai/predict", files={"file": ("a.png", png_bytes(), "image/png")})
+    assert response.status_code == 200
+    assert len(parsed) == 1
+
+
+def test_model_not_ready_is_503_before_reading_upload(client, parsed, monkeypatch):
+    state = model_state_module.model_state
+    monkeypatch.setattr(state, "status", model_state_module.LOADING)
+    response = client.post("/api/v1/ai/predict", files={"file": ("a.png", png_bytes(), "image/png")})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
+    assert not parsed
+
+
+def test_lifespan_starts_and_stops_model_state(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    calls = []
+    state = model_state_module.model_state
+    monkeypatch.setattr(state, "start_loading", lambda: calls.append("start"))
+    monkeypatch.setattr(state, "shutdown", lambda: calls.append("shutdown"))
+    with TestClient(app) as test_client:
+        assert test_client.get("/health/live").status_code == 200
+        assert calls == ["start"]
+    assert calls == ["start", "shutdown"]
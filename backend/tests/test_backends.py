@@ -0,0 +1,59 @@
+"""
+추론 백엔드 정합성: TorchScript / ONNX Runtime 출력이 모든 모드에서 eager와 허용 오차 안인지
+torch, segmentation_models_pytorch(ONNX는 onnxruntime도)가 없으면 건너뜀
+"""
+
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("segmentation_models_pytorch")
+
+from app.services.ai_service import GastricMTLModel  # noqa: E402
+from app.services.backends import (  # noqa: E402
+    InferenceBackend,
+    ModeGraph,
+    OnnxRuntimeBackend,
+    TorchScriptBackend,
+    check_parity,
+    fold_batchnorm,
+)
+
+ATOL = 1e-2
+CPU = torch.device("cpu")
+
+
+@pytest.fixture(scope="module")
+def model():
+    torch.manual_seed(0)
+    return GastricMTLModel(n_seg_classes=5, n_cls_classes=4, encoder_weights=None).eval()
+
+
+@pytest.fixture(scope="module")
+def eager(model):
+    return InferenceBackend(model, CPU)
+
+
+def assert_parity(backend, reference):
+    report = check_parity(backend, reference, ATOL)
+    assert report["ok"], report
+    assert set(report["modes"]) == {"classify", "segment", "full"}
+
+
+def test_fold_batchnorm_keeps_outputs(model):
+    x = torch.randn(2, 3, 128, 128)
+    with torch.no_grad():
+        expected = ModeGraph(model, "full")(x)
+        folded = ModeGraph(fold_batchnorm(model), "full")(x)
+    for out, ref in zip(folded, expected):
+        assert (out - ref).abs().max() <= ATOL
+
+
+def test_torchscript_matches_eager(model, eager):
+    assert_parity(TorchScriptBackend(model, CPU), eager)
+
+
+def test_onnxruntime_matches_eager(model, eager, tmp_path):
+    pytest.importorskip("onnxruntime")
+    backend = OnnxRuntimeBackend(model, CPU, onnx_dir=str(tmp_path), model_version="test")
+    assert_parity(backend, eager)
+    assert all(path.exists() for path in backend.paths.values())
@@ -0,0 +1,111 @@
+"""
+InferenceBatcher 스케줄링 (가짜 서비스로 실행 순서만 확인)
+"""
+
+import asyncio
+import threading
+import time
+
+from app.services.batching import InferenceBatcher
+
+
+class FakeService:
+    """predict_batch / predict_tiled 호출을 기록하고 delay만큼 잡아둠"""
+
+    def __init__(self, delay: float = 0.2, tiled_delay: float = 0.5):
+        self.delay = delay
+        self.tiled_delay = tiled_delay
+        self.batches = []
+        self._lock = threading.Lock()
+
+    def predict_batch(self, image_inputs, mode="full", profile=None):
+        with self._lock:
+            self.batches.append(list(image_inputs))
+        time.sleep(self.delay)
+        return [{"input": image_input} for image_input in image_inputs]
+
+    def predict_tiled(self, image_input, mode="full", profile=None):
+        time.sleep(self.tiled_delay)
+        return {"input": image_input, "tiled": True}
+
+
+def test_urgent_arriving_during_a_batch_runs_in_the_next_batch():
+    service = FakeService()
+    batcher = InferenceBatcher(service, max_batch_size=2, max_wait_ms=50, max_concurrent_batches=1)
+
+    async def scenario():
+        first = [asyncio.create_task(batcher.submit(name)) for name in ("r1", "r2")]
+        await asyncio.sleep(0.02)  # 첫 배치 실행 중
+        routine = [asyncio.create_task(batcher.submit(name)) for name in ("r3", "r4")]
+        await asyncio.sleep(0.05)
+        urgent = asyncio.create_task(batcher.submit("u", priority="urgent"))
+        await asyncio.gather(*first, *routine, urgent)
+
+    asyncio.run(scenario())
+    assert service.batches[0] == ["r1", "r2"]
+    assert service.batches[1][0] == "u"
+
+
+
+def test_tiled_request_does_not_hold_up_its_batch():
+    service = FakeService(delay=0.01, tiled_delay=0.5)
+    batcher = InferenceBatcher(service, max_batch_size=4, max_wait_ms=20, max_concurrent_batches=1)
+    done_at = {}
+
+    async def submit(name, tiled=False):
+        result = await batcher.submit(name, tiled=tiled)
+        done_at[name] = time.perf_counter()
+        return result
+
+    async def scenario():
+        start = time.perf_counter()
+        results = await asyncio.gather(submit("slide", tiled=True), submit("a"), submit("b"))
+        return start, results
+
+    start, results = asyncio.run(scenario())
+    assert results[0]["tiled"] and results[1] == {"input": "a"}
+    assert done_at["a"] - start < 0.3
+    assert done_at["b"] - start < 0.3
+
+
+def test_tiled_requests_are_capped_by_their_own_slots():
+    class Counting(FakeService):
+        def __init__(self):
+            super().__init__(tiled_delay=0.1)
+            self.running = self.peak = 0
+
+        def predict_tiled(self, image_input, mode="full", profile=None):
+            with self._lock:
+                self.running += 1
+                self.peak = max(self.peak, self.running)
+            try:
+                return super().predict_tiled(image_input, mode, profile)
+            finally:
+                with self._lock:
+                    self.running -= 1
+
+    service = Counting()
+    batcher = InferenceBatcher(service, max_batch_size=8, max_wait_ms=20, max_concurrent_tiled=2)
+
+    async def scenario():
+        return await asyncio.gather(*(batcher.submit(f"slide{i}", tiled=True) for i in range(6)))
+
+    results = asyncio.run(scenario())
+    assert all(result["tiled"] for result in results)
+    assert service.peak == 2
+    assert batcher.get_stats()["running_tiled"] == 0
+
+
+def test_failed_group_gives_each_item_its_own_error_result():
+    class Failing(FakeService):
+        def predict_batch(self, image_inputs, mode="full", profile=None):
+            raise RuntimeError("boom")
+
+    batcher = InferenceBatcher(Failing(), max_batch_size=2, max_wait_ms=20)
+
+    async def scenario():
+        return await asyncio.gather(batcher.submit("a"), batcher.submit("b"))
+
+    first, second = asyncio.run(scenario())
+    assert first == {"error": True, "message": "boom"}
+    assert first == second and first is not second
@@ -0,0 +1,22 @@
+"""
+/metrics 스모크 테스트 (모든 수집기의 get_stats 키가 맞는지)
+"""
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+
+
+def test_metrics_endpoint(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_ENABLED", True)
+    response = TestClient(app).get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    for name in ("ai_model_ready", "ai_admission_in_flight", "ai_batch_size_count",
+                 "ai_result_cache_hit_ratio", "db_pool"):
+        assert name in response.text
+
+
+def test_metrics_disabled_is_404():
+    assert TestClient(app).get("/metrics").status_code == 404
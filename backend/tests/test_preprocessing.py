@@ -0,0 +1,29 @@
+"""
+입력 전처리: 읽기 전용 PIL 배열도 경고 없이 정규화
+torch가 없으면 건너뜀
+"""
+
+import warnings
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from app.services.preprocessing import IMAGENET_MEAN, IMAGENET_STD, Preprocessor  # noqa: E402
+
+
+def test_read_only_images_are_normalized_without_warnings():
+    rng = np.random.default_rng(0)
+    images = [rng.integers(0, 256, (32, 32, 3), dtype=np.uint8) for _ in range(2)]
+    for image in images:
+        image.flags.writeable = False
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        out = Preprocessor(size=32)(images)
+
+    mean = np.array(IMAGENET_MEAN, dtype=np.float32)
+    std = np.array(IMAGENET_STD, dtype=np.float32)
+    expected = np.stack([((image / 255.0 - mean) / std).transpose(2, 0, 1) for image in images])
+    np.testing.assert_allclose(out.numpy(), expected, atol=1e-5)
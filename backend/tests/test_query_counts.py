@@ -0,0 +1,41 @@
+"""
+진료/진단 조회 API 쿼리 수 회귀 검사 (페이지 크기와 무관한 상한)
+"""
+
+import pytest
+
+from app.core.query_profiler import assert_max_queries
+from conftest import SEED_ROWS
+
+
+@pytest.mark.parametrize("path", ["/api/v1/visits/", "/api/v1/diagnoses/"])
+@pytest.mark.parametrize("limit", [5, SEED_ROWS])
+def test_list_is_one_query(client, path, limit):
+    with assert_max_queries(1):
+        response = client.get(path, params={"limit": limit})
+    assert response.status_code == 200
+    assert len(response.json()) == limit
+
+
+@pytest.mark.parametrize("path", ["/api/v1/visits/", "/api/v1/diagnoses/"])
+def test_list_with_cursor_is_one_query(client, path):
+    cursor = client.get(path, params={"limit": 5}).headers["X-Next-Cursor"]
+    with assert_max_queries(1):
+        response = client.get(path, params={"limit": 5, "cursor": cursor})
+    assert response.status_code == 200
+    assert len(response.json()) == 5
+
+
+def test_visit_detail_queries(client, seeded):
+    # 환자/의사 JOIN + 진단 IN 쿼리
+    with assert_max_queries(2):
+        response = client.get(f"/api/v1/visits/{seeded['visit_id']}")
+    assert response.status_code == 200
+    assert response.json()["diagnosis"] is not None
+
+
+def test_diagnosis_detail_queries(client, seeded):
+    with assert_max_queries(1):
+        response = client.get(f"/api/v1/diagnoses/{seeded['diagnosis_id']}")
+    assert response.status_code == 200
+    assert response.json()["reviewed_by"] is not None
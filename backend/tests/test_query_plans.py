@@ -0,0 +1,107 @@
+"""
+목록 API 실행 계획 회귀 검사
+alembic upgrade head로 만든 DB에서 엔드포인트가 실행한 SELECT를 EXPLAIN해서
+필터/커서 조합마다 의도한 인덱스를 타는지, 정렬을 따로 하지 않는지 확인 (sqlite, MySQL)
+"""
+
+import re
+
+import pytest
+from sqlalchemy import event
+
+_SQLITE_INDEX = re.compile(r"^(?:SCAN|SEARCH) (\w+) USING (?:COVERING )?INDEX (\w+)")
+
+
+def explain(conn, statement: str, parameters, table: str) -> tuple:
+    """(table에 쓰인 인덱스 이름 또는 None, 별도 정렬 여부, 계획 텍스트)"""
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        details = [row[-1] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)]
+        index = None
+        for detail in details:
+            match = _SQLITE_INDEX.match(detail)
+            if match and match.group(1) == table:
+                index = match.group(2)
+        sorts = any("TEMP B-TREE FOR ORDER BY" in detail for detail in details)
+        return index, sorts, "\n".join(details)
+    if dialect == "mysql":
+        rows = conn.exec_driver_sql("EXPLAIN " + statement, parameters).mappings().fetchall()
+        index = next((row["key"] for row in rows if row["table"] == table), None)
+        sorts = any("filesort" in (row["Extra"] or "") for row in rows)
+        return index, sorts, "\n".join(f"{row['table']}: key={row['key']} extra={row['Extra']}" for row in rows)
+    pytest.skip(f"EXPLAIN check not supported on {dialect}")
+
+
+def captured_selects(engine, call) -> list:
+    """call이 실행한 SELECT 문장과 파라미터"""
+    statements = []
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        call()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return statements
+
+
+@pytest.mark.parametrize("use_cursor", [False, True], ids=["first", "cursor"])
+@pytest.mark.parametrize("path, table, params, index", [
+    ("/api/v1/visits/", "visits", {}, "ix_visits_visit_date_id"),
+    ("/api/v1/visits/", "visits", {"date_from": "2000-01-01"}, "ix_visits_visit_date_id"),
+    ("/api/v1/visits/", "visits", {"doctor_id": 1}, "ix_visits_doctor_id_visit_date"),
+    ("/api/v1/visits/", "visits", {"status": "COMPLETED"}, "ix_visits_status_visit_date"),
+    ("/api/v1/diagnoses/", "diagnoses", {}, "ix_diagnoses_created_at_id"),
+    ("/api/v1/diagnoses/", "diagnoses", {"is_reviewed": 0}, "ix_diagnoses_is_reviewed_created_at"),
+    ("/api/v1/diagnoses/", "diagnoses", {"prediction": "STDI"}, "ix_diagnoses_prediction_created_at"),
+])
+def test_list_uses_index(client, db_engine, path, table, params, index, use_cursor):
+    params = {**params, "limit": 5}
+    if use_cursor:
+        params["cursor"] = client.get(path, params=params).headers["X-Next-Cursor"]
+
+    statements = captured_selects(db_engine, lambda: client.get(path, params=params))
+    assert len(statements) == 1
+    with db_engine.connect() as conn:
+        used, sorts, plan = explain(conn, *statements[0], table)
+    assert used == index, plan
+    assert not sorts, plan
+
+
+def test_patient_visits_use_index(client, db_engine):
+    path = "/api/v1/visits/"
+    statements = captured_selects(db_engine, lambda: client.get(path, params={"patient_id": 1}))
+    with db_engine.connect() as conn:
+        used, sorts, plan = explain(conn, *statements[0], "visits")
+    assert used == "ix_visits_patient_id_visit_date", plan
+    assert not sorts, plan
+
+
+def test_visit_detail_diagnoses_use_index(client, db_engine, seeded):
+    path = f"/api/v1/visits/{seeded['visit_id']}"
+    statements = captured_selects(db_engine, lambda: client.get(path))
+    assert len(statements) == 2
+    with db_engine.connect() as conn:
+        used, _, plan = explain(conn, *statements[1], "diagnoses")
+    assert used == "ix_diagnoses_visit_id", plan
+
+
+# analytics는 원본 테이블을 읽지 않아야 함 (롤업 테이블 이름은 visit_daily_stats 등이라 걸리지 않음)
+_SOURCE_TABLE = re.compile(r"\b(?:visits|diagnoses)\b")
+
+
+@pytest.mark.parametrize("path, params", [
+    ("/api/v1/analytics/visits", {"bucket": "week"}),
+    ("/api/v1/analytics/visits/by-doctor", {}),
+    ("/api/v1/analytics/diagnoses", {"doctor_id": 1}),
+    ("/api/v1/analytics/diagnoses/tumor-ratio", {"prediction": "STDI"}),
+    ("/api/v1/analytics/review-backlog", {}),
+])
+def test_analytics_reads_rollups_only(client, db_engine, path, params):
+    statements = captured_selects(db_engine, lambda: client.get(path, params=params))
+    assert statements
+    for statement, _ in statements:
+        assert not _SOURCE_TABLE.search(statement), statement
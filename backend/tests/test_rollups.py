@@ -0,0 +1,84 @@
+"""
+일별 롤업(diagnosis_daily_stats, visit_daily_stats) 증분 반영
+ORM으로 추가/리뷰/담당 의사 변경/cascade 삭제를 한 뒤 롤업이 backfill 재계산 결과와 같은지 확인
+(매 단계 backfill로 기준을 다시 맞추므로 각 단계의 매퍼 이벤트를 따로 검증)
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+
+@pytest.fixture
+def db(seeded):
+    from app.core.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+
+
+def _snapshot(db):
+    """count가 0이 아닌 롤업 행 (실수 합계는 반올림해서 비교)"""
+    from app.models.diagnosis_stats import DiagnosisDailyStats
+    from app.models.visit_stats import VisitDailyStats
+
+    snapshot = {}
+    for model in (DiagnosisDailyStats, VisitDailyStats):
+        table = model.__table__
+        rows = db.execute(select(table).where(table.c.count != 0)).mappings()
+        snapshot[table.name] = sorted(
+            tuple((name, round(value, 6) if isinstance(value, float) else value) for name, value in row.items())
+            for row in rows
+        )
+    return snapshot
+
+
+def assert_matches_backfill(db):
+    from app.services.dashboard_stats import backfill
+
+    db.commit()
+    incremental = _snapshot(db)
+    backfill(db)
+    assert incremental == _snapshot(db)
+
+
+def test_rollups_follow_orm_changes(db, seeded):
+    from app.models import Diagnosis, Patient, User, Visit
+    from app.models.patient import Gender
+
+    assert_matches_backfill(db)
+    first, second = [doctor.id for doctor in db.query(User).order_by(User.id).limit(2)]
+    day = datetime.utcnow().replace(microsecond=0) - timedelta(days=3)
+
+    # 추가: 다른 날짜의 진료 1건, 진단 2건 (tumor_ratio 없는 classify 결과 포함)
+    patient = Patient(name="Rollup", birth_date=day.date(), gender=Gender.FEMALE, patient_number="R000001")
+    visit = Visit(patient=patient, doctor_id=first, visit_date=day, status="PENDING")
+    segmented = Diagnosis(visit=visit, prediction="STNT", prediction_kr="관상선암", confidence=0.8,
+                          tumor_ratio=0.95, created_at=day)
+    classified = Diagnosis(visit=visit, prediction="STDI", prediction_kr="미만형선암", confidence=0.6,
+                           created_at=day)
+    db.add(patient)
+    assert_matches_backfill(db)
+
+    # 리뷰와 AI 결과 수정
+    segmented.is_reviewed = 1
+    segmented.reviewed_by = second
+    classified.prediction = "STMX"
+    classified.prediction_kr = "혼합형선암"
+    assert_matches_backfill(db)
+
+    # 진료 상태 변경, 담당 의사 변경 (진단 집계도 새 의사 키로 옮겨짐)
+    visit.status = "COMPLETED"
+    assert_matches_backfill(db)
+    visit.doctor_id = second
+    assert_matches_backfill(db)
+
+    # 환자 삭제 → 진료/진단 cascade 삭제
+    db.delete(patient)
+    assert_matches_backfill(db)
+    assert db.query(Diagnosis).filter(Diagnosis.visit_id == visit.id).count() == 0
@@ -0,0 +1,76 @@
+"""
+업로드 크기 상한 (폼 파싱 전 413) / 상한 이하 업로드는 메모리에서 처리
+"""
+
+from fastapi import Depends, FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+from starlette.datastructures import FormData
+
+from app.services.ingestion import FORM_OVERHEAD_BYTES, UploadLimitMiddleware, form_file, read_upload, upload_form
+
+MAX_BYTES = 1024 * 1024
+
+
+def make_client(max_bytes=None):
+    app = FastAPI()
+    app.add_middleware(UploadLimitMiddleware, max_bytes=max_bytes)
+    calls = []
+
+    @app.post("/upload")
+    async def upload(form: FormData = Depends(upload_form)):
+        file = form_file(form, "file")
+        calls.append(file)
+        data = await read_upload(file)
+        return {"bytes": len(data), "rolled_to_disk": file.file._rolled}
+
+    @app.post("/other")
+    async def other(file: UploadFile = File(...)):
+        return {"rolled_to_disk": file.file._rolled}
+
+    return TestClient(app), calls
+
+
+def test_rejects_on_content_length_before_parsing():
+    client, calls = make_client(MAX_BYTES)
+    response = client.post("/upload", files={"file": ("a.png", b"x" * (MAX_BYTES + FORM_OVERHEAD_BYTES + 1))})
+    assert response.status_code == 413
+    assert not calls
+
+
+def test_rejects_chunked_body_once_limit_is_passed():
+    client, calls = make_client(MAX_BYTES)
+    boundary = "testboundary"
+    head = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"a.png\"\r\n"
+            "Content-Type: image/png\r\n\r\n").encode()
+
+    def body():
+        yield head
+        for _ in range(4):
+            yield b"x" * (MAX_BYTES // 2)
+        yield f"\r\n--{boundary}--\r\n".encode()
+
+    response = client.post("/upload", content=body(),
+                           headers={"Content-Type": f"multipart/form-data; boundary={boundary}"})
+    assert response.status_code == 413
+    assert not calls
+
+
+def test_upload_under_limit_stays_in_memory():
+    client, _ = make_client()
+    size = 3 * 1024 * 1024  # Starlette 기본 스풀 한도(1MB)보다 큼
+    response = client.post("/upload", files={"file": ("a.png", b"x" * size)})
+    assert response.status_code == 200
+    assert response.json() == {"bytes": size, "rolled_to_disk": False}
+
+
+def test_other_multipart_routes_keep_default_spool():
+    client, _ = make_client()
+    response = client.post("/other", files={"file": ("a.bin", b"x" * (3 * 1024 * 1024))})
+    assert response.json() == {"rolled_to_disk": True}
+
+
+def test_missing_file_is_422():
+    client, calls = make_client()
+    response = client.post("/upload", files={"other": ("a.png", b"x")})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "file"]
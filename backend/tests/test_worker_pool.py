@@ -0,0 +1,83 @@
+"""
+추론 워커 풀: 죽거나 멈춘 워커는 그 배치만 실패시키고 새로 띄움
+torch(와 ai_service 의존성)가 없으면 건너뜀
+"""
+
+import os
+import signal
+import time
+
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("segmentation_models_pytorch")
+
+from app.services.worker_pool import InferenceWorkerPool  # noqa: E402
+
+
+class FakeService:
+    """워커에서 실행될 _run_model만 흉내 (mode로 크래시/멈춤 재현, 워커로 넘어가도록 모듈 최상위에 정의)"""
+
+    SEG_CLASS_NAMES = ["a", "b"]
+    CLASS_NAMES = ["x", "y"]
+
+    def __init__(self):
+        self.model = torch.nn.Linear(1, 1)
+
+    def _run_model(self, input_tensor, mode, timer, masks=False):
+        if mode == "crash":
+            os._exit(1)
+        if mode == "hang":
+            time.sleep(60)
+        n = input_tensor.shape[0]
+        seg = torch.ones(n, 2, 512, 512)
+        return (seg.argmax(dim=1).to(torch.uint8) if masks else seg), torch.ones(n, 2)
+
+
+@pytest.fixture
+def pool():
+    pool = InferenceWorkerPool(FakeService(), num_workers=1, max_batch_size=2, num_threads=1, timeout=2)
+    pool.start()
+    yield pool
+    pool.shutdown()
+
+
+def batch():
+    return torch.zeros(1, 3, 512, 512)
+
+
+def assert_recovered(pool):
+    seg, cls = pool.run(batch(), "full")
+    assert seg.shape == (1, 2, 512, 512) and cls.shape == (1, 2)
+    stats = pool.get_stats()
+    assert stats["alive_workers"] == 1
+    assert stats["idle_workers"] == 1
+    assert stats["respawned_workers"] == 1
+
+
+def test_masks_come_back_as_uint8(pool):
+    seg, cls = pool.run(torch.zeros(3, 3, 512, 512), "full", masks=True)
+    assert seg.dtype == torch.uint8 and seg.shape == (3, 512, 512)
+    assert cls.shape == (3, 2)
+    assert pool.get_stats()["respawned_workers"] == 0
+
+
+def test_worker_crash_fails_batch_and_respawns(pool):
+    with pytest.raises(RuntimeError, match="lost"):
+        pool.run(batch(), "crash")
+    assert_recovered(pool)
+
+
+def test_hung_worker_times_out_and_respawns(pool):
+    start = time.perf_counter()
+    with pytest.raises(RuntimeError, match="no response"):
+        pool.run(batch(), "hang")
+    assert time.perf_counter() - start < 10
+    assert_recovered(pool)
+
+
+def test_worker_killed_while_idle_is_replaced(pool):
+    process = pool._workers[0].process
+    os.kill(process.pid, signal.SIGKILL)
+    process.join(timeout=5)
+    assert_recovered(pool)
@@ -27,6 +27,7 @@ interface DiagnosisResult {
   confidence: number;
   probabilities_kr: { [key: string]: number };
   segmentation_image?: string;
+  segmentation_media_type?: string;  // image/png, image/webp, image/jpeg
   processing_time: number;
 }
 
@@ -296,7 +297,7 @@ export default function ClinicalPage() {
                     세그멘테이션 결과
                   </h3>
                   <img
-                    src={`data:image/png;base64,${result.segmentation_image}`}
+                    src={`data:${result.segmentation_media_type || 'image/png'};base64,${result.segmentation_image}`}
                     alt="Segmentation"
                     className="w-full rounded-lg border border-gray-300"
                   />
@@ -86,6 +86,8 @@ export interface ClinicalDiagnosisResult {
   }
   segmentation: {
     image_base64: string
+    image_format: string
+    media_type: string
     ratios: {
       tumor: number
       stroma: number